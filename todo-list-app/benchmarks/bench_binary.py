@@ -0,0 +1,64 @@
+"""
+Бенчмарк: JSON и двоичный снимок - размер, открытие, загрузка всех задач
+"""
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from bench_utils import make_records, write_json, print_table
+
+from models.task import Task
+from storage.json_storage import read_json_snapshot
+from storage.binary_storage import BinarySnapshot, encode_snapshot, read_binary_tasks
+
+SIZE = 1_000_000
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def load_json(path: Path):
+    """Разбор tasks.json и создание объектов Task"""
+    records, _ = read_json_snapshot(path)
+    return [Task.from_dict(record) for record in records]
+
+
+def open_binary(path: Path):
+    """Открытие снимка и чтение одной записи из середины"""
+    with BinarySnapshot(path) as snapshot:
+        return snapshot.record(len(snapshot) // 2)
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else SIZE
+    with tempfile.TemporaryDirectory() as temp_dir:
+        json_path = Path(temp_dir) / 'tasks.json'
+        binary_path = Path(temp_dir) / 'tasks.tdb'
+        records = make_records(size)
+        write_json(str(json_path), records)
+        binary_path.write_bytes(encode_snapshot([Task.from_dict(r) for r in records], {}))
+        del records
+
+        _, json_ms = timed(lambda: load_json(json_path))
+        _, binary_ms = timed(lambda: read_binary_tasks(binary_path))
+        _, open_ms = timed(lambda: open_binary(binary_path))
+        json_size = os.path.getsize(json_path) / 2**20
+        binary_size = os.path.getsize(binary_path) / 2**20
+
+    print_table(
+        f"СНИМОК, {size} задач: JSON (indent=2) vs двоичный",
+        ["формат", "размер, МБ", "загрузка всех задач, мс", "открытие + 1 запись, мс"],
+        [
+            ["JSON", f"{json_size:.0f}", f"{json_ms:.0f}", f"{json_ms:.0f}"],
+            ["двоичный", f"{binary_size:.0f}", f"{binary_ms:.0f}", f"{open_ms:.2f}"],
+        ]
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Бенчмарк: пакетные операции и транзакция против цикла одиночных вызовов
+"""
+import os
+import sys
+import tempfile
+import time
+
+from bench_utils import quiet_logging, print_table
+
+from controllers.task_controller import TaskController
+from models.task import TaskStatus
+
+SIZES = [500, 2_000]
+
+
+def items(count: int):
+    categories = ["Работа", "Личное", "Дом", None]
+    return [
+        {'title': f"Импорт {i}", 'description': "Описание", 'category': categories[i % 4]}
+        for i in range(count)
+    ]
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def bench(count: int, mode: str):
+    """Время импорта и смены статуса count задач, мс (mode: loop/transaction/bulk)"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        controller = TaskController(storage_path=os.path.join(temp_dir, 'tasks.json'))
+        data = items(count)
+
+        def create_loop():
+            for task_data in data:
+                controller.create_task(task_data)
+
+        def status_loop():
+            for task_id in controller.tasks.ids():
+                controller.change_task_status(task_id, TaskStatus.COMPLETED)
+
+        def in_transaction(func):
+            def run():
+                with controller.transaction():
+                    func()
+            return run
+
+        if mode == 'bulk':
+            create_ms = timed(lambda: controller.create_tasks(data))
+            status_ms = timed(lambda: controller.change_status_many(controller.tasks.ids(), TaskStatus.COMPLETED))
+        elif mode == 'transaction':
+            create_ms = timed(in_transaction(create_loop))
+            status_ms = timed(in_transaction(status_loop))
+        else:
+            create_ms = timed(create_loop)
+            status_ms = timed(status_loop)
+        controller.final_save()
+    return create_ms, status_ms
+
+
+def main():
+    quiet_logging()
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    rows = []
+    for size in sizes:
+        loop = bench(size, 'loop')
+        for mode in ('loop', 'transaction', 'bulk'):
+            create_ms, status_ms = loop if mode == 'loop' else bench(size, mode)
+            rows.append([
+                size, mode,
+                f"{create_ms:.1f}", f"{loop[0] / create_ms:.0f}x",
+                f"{status_ms:.1f}", f"{loop[1] / status_ms:.0f}x",
+            ])
+
+    print_table(
+        "ПАКЕТНЫЕ ОПЕРАЦИИ (мс): цикл одиночных вызовов vs транзакция vs пакет, JSON",
+        ["задач", "способ", "создание", "ускорение", "смена статуса", "ускорение"],
+        rows
+    )
+
+
+if __name__ == '__main__':
+    main()
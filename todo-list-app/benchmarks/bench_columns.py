@@ -0,0 +1,42 @@
+"""
+Бенчмарк: проходы по объектам Task и маски колоночного хранилища
+"""
+import sys
+
+from bench_utils import make_records, measure, print_table
+
+from models.task import Task
+from indexes.column_store import TaskColumns
+
+SIZE = 200_000
+REPEAT = 10
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else SIZE
+    tasks = [Task.from_dict(record) for record in make_records(size)]
+    columns = TaskColumns(tasks)
+
+    cases = [
+        ("просроченные (is_overdue)",
+         lambda: [t.id for t in tasks if t.is_overdue()], columns.overdue_ids),
+        ("скоро срок (is_due_soon)",
+         lambda: [t.id for t in tasks if t.is_due_soon()], columns.due_soon_ids),
+        ("без срока",
+         lambda: [t.id for t in tasks if t.due_date is None], columns.no_deadline_ids),
+    ]
+    rows = []
+    for label, scan, vector in cases:
+        scan_ms = measure(scan, REPEAT)
+        vector_ms = measure(vector, REPEAT)
+        rows.append([label, f"{scan_ms:.2f}", f"{vector_ms:.2f}", f"{scan_ms / vector_ms:.1f}x"])
+
+    print_table(
+        f"ЗАПРОСЫ (мс), {size} задач: проход по объектам vs колонки",
+        ["запрос", "объекты", "колонки", "ускорение"],
+        rows
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Бенчмарк: стоимость политик fsync для снимков JSON, журнала и SQLite
+"""
+import os
+import sys
+import tempfile
+
+from bench_utils import quiet_logging, make_records, write_json, measure, print_table
+
+from controllers.task_controller import TaskController
+from models.task import TaskStatus
+
+SIZE = 1_000
+MUTATIONS = 30
+POLICIES = ['always', 'batched', 'never']
+MODES = [('json', 'tasks.json'), ('journal', 'tasks.json'), ('sqlite', 'tasks.db')]
+
+
+def bench(mode: str, filename: str, policy: str, records) -> float:
+    """Средняя задержка мутации с сохранением (мс)"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        json_path = os.path.join(temp_dir, 'source.json')
+        write_json(json_path, records)
+        options = {'import_from': json_path} if mode == 'sqlite' else {}
+        path = os.path.join(temp_dir, filename)
+        if mode != 'sqlite':
+            os.replace(json_path, path)
+
+        controller = TaskController(storage_path=path, storage_mode=mode, fsync=policy, **options)
+        task_ids = [task.id for task in controller.tasks[:MUTATIONS]]
+        statuses = [TaskStatus.IN_PROGRESS, TaskStatus.COMPLETED]
+        counter = iter(range(MUTATIONS * 2))
+
+        def mutate():
+            i = next(counter)
+            controller.change_task_status(task_ids[i % len(task_ids)], statuses[i % 2])
+
+        latency = measure(mutate, MUTATIONS)
+        controller.final_save()
+        return latency
+
+
+def main():
+    quiet_logging()
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else SIZE
+    records = make_records(size)
+    rows = []
+    for mode, filename in MODES:
+        rows.append([mode] + [f"{bench(mode, filename, policy, records):.2f}" for policy in POLICIES])
+
+    print_table(
+        f"ЗАДЕРЖКА МУТАЦИИ С СОХРАНЕНИЕМ (мс), {size} задач",
+        ["хранилище"] + POLICIES,
+        rows
+    )
+
+
+if __name__ == '__main__':
+    main()
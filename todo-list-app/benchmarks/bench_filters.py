@@ -0,0 +1,62 @@
+"""
+Бенчмарк: фильтрация проходом по списку и по вторичным индексам
+"""
+import os
+import sys
+import tempfile
+
+from bench_utils import quiet_logging, make_records, write_json, measure, print_table
+
+from controllers.task_controller import TaskController
+from models.task import TaskStatus
+
+SIZE = 100_000
+REPEAT = 10
+
+QUERIES = [
+    ("status", {'status': TaskStatus.COMPLETED}),
+    ("category", {'category': 'Дом'}),
+    ("status+category", {'status': TaskStatus.COMPLETED, 'category': 'Дом'}),
+    ("status+category+priority", {
+        'status': TaskStatus.COMPLETED, 'category': 'Дом', 'priority': 'Высокий'
+    }),
+]
+
+
+def scan_filters(tasks, filters):
+    """Прежняя реализация apply_filters: копия списка и проходы по нему"""
+    filtered = list(tasks)
+    if filters.get('status'):
+        filtered = [t for t in filtered if t.status.value == filters['status'].value]
+    if filters.get('category'):
+        filtered = [t for t in filtered if t.category == filters['category']]
+    if filters.get('priority'):
+        filtered = [t for t in filtered if t.priority == filters['priority']]
+    return filtered
+
+
+def main():
+    quiet_logging()
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else SIZE
+    rows = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'tasks.json')
+        write_json(path, make_records(size))
+        controller = TaskController(storage_path=path)
+        tasks = controller.tasks.copy()
+
+        for label, filters in QUERIES:
+            matched = len(controller.apply_filters(filters))
+            scan_ms = measure(lambda: scan_filters(tasks, filters), REPEAT)
+            index_ms = measure(lambda: controller.apply_filters(filters), REPEAT)
+            rows.append([label, matched, f"{scan_ms:.2f}", f"{index_ms:.2f}", f"{scan_ms / index_ms:.1f}x"])
+
+    print_table(
+        f"ФИЛЬТРАЦИЯ (мс), {size} задач: проход по списку vs вторичные индексы",
+        ["фильтр", "найдено", "проход", "индексы", "ускорение"],
+        rows
+    )
+
+
+if __name__ == '__main__':
+    main()
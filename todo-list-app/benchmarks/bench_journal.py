@@ -0,0 +1,54 @@
+"""
+Бенчмарк: задержка одной мутации при полной перезаписи JSON и в журнальном режиме
+"""
+import os
+import sys
+import tempfile
+
+from bench_utils import quiet_logging, make_records, write_json, measure, print_table
+
+from controllers.task_controller import TaskController
+from models.task import TaskStatus
+
+SIZES = [1_000, 10_000, 100_000]
+MUTATIONS = 20
+
+
+def bench_mode(records, mode: str) -> float:
+    """Средняя задержка change_task_status в миллисекундах"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'tasks.json')
+        write_json(path, records)
+        controller = TaskController(storage_path=path, storage_mode=mode)
+        task_ids = [task.id for task in controller.tasks[:MUTATIONS]]
+        statuses = [TaskStatus.IN_PROGRESS, TaskStatus.COMPLETED]
+        counter = iter(range(MUTATIONS * 2))
+
+        def mutate():
+            i = next(counter)
+            controller.change_task_status(task_ids[i % len(task_ids)], statuses[i % 2])
+
+        latency = measure(mutate, MUTATIONS)
+        controller.final_save()
+        return latency
+
+
+def main():
+    quiet_logging()
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    rows = []
+    for size in sizes:
+        records = make_records(size)
+        json_ms = bench_mode(records, 'json')
+        journal_ms = bench_mode(records, 'journal')
+        rows.append([size, f"{json_ms:.2f}", f"{journal_ms:.2f}", f"{json_ms / journal_ms:.1f}x"])
+
+    print_table(
+        "ЗАДЕРЖКА МУТАЦИИ (мс): JSON-перезапись vs журнал",
+        ["задач", "json", "journal", "ускорение"],
+        rows
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Бенчмарк: память на задачу до и после компактного представления Task
+"""
+import gc
+import json
+import sys
+import tracemalloc
+from datetime import datetime, date
+
+from bench_utils import make_records, print_table
+
+from models.task import Task, TaskStatus
+
+SIZE = 1_000_000
+CHUNK = 10_000
+
+
+class LegacyTask:
+    """Прежнее представление: обычный объект с __dict__, строки и datetime"""
+
+    def __init__(self, data):
+        self.id = data['id']
+        self.title = data['title']
+        self.description = data.get('description', '')
+        self.category = data.get('category')
+        self.priority = data.get('priority', 'Средний')
+        self.due_date = date.fromisoformat(data['due_date']) if data.get('due_date') else None
+        self.status = TaskStatus(data['status'])
+        self.creation_date = datetime.fromisoformat(data['creation_date'])
+        self.modification_date = datetime.fromisoformat(data['modification_date'])
+
+
+def bytes_per_task(factory, size: int) -> float:
+    """Прирост памяти на одну задачу после загрузки size задач
+
+    Записи проходят через json, как при чтении tasks.json, поэтому строки
+    категорий и приоритетов у каждой записи свои, а не общие литералы.
+    Учитываются только объекты задач: записи освобождаются по частям.
+    """
+    gc.collect()
+    tracemalloc.start()
+    tasks = []
+    for start in range(0, size, CHUNK):
+        records = json.loads(json.dumps(make_records(min(CHUNK, size - start)), ensure_ascii=False))
+        tasks.extend(factory(record) for record in records)
+        del records
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    result = current / len(tasks)
+    del tasks
+    return result
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else SIZE
+    legacy = bytes_per_task(LegacyTask, size)
+    compact = bytes_per_task(Task.from_dict, size)
+    print_table(
+        f"ПАМЯТЬ (байт на задачу), {size} задач",
+        ["представление", "байт/задача", "всего, МБ"],
+        [
+            ["__dict__ + datetime", f"{legacy:.0f}", f"{legacy * size / 2**20:.0f}"],
+            ["__slots__ + коды", f"{compact:.0f}", f"{compact * size / 2**20:.0f}"],
+            ["экономия", f"{legacy - compact:.0f}", f"{(legacy - compact) * size / 2**20:.0f}"],
+        ]
+    )
+
+
+if __name__ == '__main__':
+    main()
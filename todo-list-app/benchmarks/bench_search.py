@@ -0,0 +1,88 @@
+"""
+Бенчмарк: поиск по тексту проходом по задачам и по полнотекстовому индексу
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from bench_utils import quiet_logging, make_records, write_json, measure, print_table
+
+from controllers.task_controller import TaskController
+
+SIZE = 100_000
+REPEAT = 10
+
+WORDS = [
+    "отчет", "квартал", "клиент", "договор", "оплата", "встреча", "звонок", "письмо",
+    "презентация", "бюджет", "ремонт", "покупка", "врач", "тренировка", "курс", "книга",
+    "проект", "релиз", "тестирование", "документация", "счет", "поездка", "подарок", "уборка",
+]
+QUERIES = ["договор", "договоры клиентов", "презент", "бюджет квартала отчет"]
+
+
+def make_texts(records):
+    """Описания из случайных слов в разных формах (до ~40 слов)"""
+    rng = random.Random(1)
+    endings = ["", "а", "ы", "ов", "ом", "ами", "у"]
+    for record in records:
+        words = [rng.choice(WORDS) + rng.choice(endings) for _ in range(rng.randint(5, 40))]
+        record['description'] = " ".join(words)
+        record['title'] = " ".join(rng.choice(WORDS) for _ in range(3))
+    return records
+
+
+def scan_search(tasks, query):
+    """Наивный поиск: все слова запроса - подстроки названия или описания"""
+    words = query.lower().split()
+    return [
+        task for task in tasks
+        if all(word in task.title.lower() or word in task.description.lower() for word in words)
+    ]
+
+
+def main():
+    quiet_logging()
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else SIZE
+    rows = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'tasks.json')
+        write_json(path, make_texts(make_records(size)))
+        controller = TaskController(storage_path=path)
+        tasks = controller.tasks.copy()
+
+        start = time.perf_counter()
+        controller.search_index
+        build_ms = (time.perf_counter() - start) * 1000
+
+        for query in QUERIES:
+            scanned = len(scan_search(tasks, query))
+            found = len(controller.search(query))
+            scan_ms = measure(lambda: scan_search(tasks, query), REPEAT)
+            index_ms = measure(lambda: controller.search(query, limit=50), REPEAT)
+            rows.append([
+                query, scanned, found, f"{scan_ms:.1f}", f"{index_ms:.1f}", f"{scan_ms / index_ms:.1f}x"
+            ])
+
+        # Точечное обновление индекса при изменении одной задачи
+        index = controller.search_index
+        task = tasks[0]
+
+        def reindex():
+            index.remove(task)
+            index.add(task)
+
+        update_ms = measure(reindex, REPEAT * 100)
+        controller.final_save()
+
+    print_table(
+        f"ПОИСК, {size} задач (построение индекса {build_ms:.0f} мс, "
+        f"обновление одной задачи {update_ms:.3f} мс)",
+        ["запрос", "подстрок", "найдено", "проход, мс", "индекс (топ-50), мс", "ускорение"],
+        rows
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+Бенчмарк: поиск по мере ввода - set_search на каждое нажатие клавиши
+
+Замеряется работа контроллера на одно срабатывание отложенного поиска
+(без Tk): пересчет представления по индексу и список id для сверки
+строк таблицы.
+"""
+import os
+import sys
+import tempfile
+import time
+
+from bench_utils import quiet_logging, make_records, write_json, print_table
+from bench_search import make_texts
+
+from controllers.task_controller import TaskController
+
+SIZE = 50_000
+TYPED = ["презентация", "договор клиент"]
+
+
+def main():
+    quiet_logging()
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else SIZE
+    rows = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'tasks.json')
+        write_json(path, make_texts(make_records(size)))
+        controller = TaskController(storage_path=path)
+
+        start = time.perf_counter()
+        controller.search_index
+        build_ms = (time.perf_counter() - start) * 1000
+
+        for text in TYPED:
+            for length in range(1, len(text) + 1):
+                query = text[:length]
+                start = time.perf_counter()
+                view = controller.set_search(query)
+                view.ids()
+                keystroke_ms = (time.perf_counter() - start) * 1000
+                rows.append([repr(query), len(view), f"{keystroke_ms:.2f}"])
+            controller.set_search("")
+        controller.final_save()
+
+    print_table(
+        f"ПОИСК ПРИ ВВОДЕ, {size} задач (построение индекса {build_ms:.0f} мс)",
+        ["строка поиска", "задач в представлении", "нажатие, мс"],
+        rows
+    )
+
+
+if __name__ == '__main__':
+    main()
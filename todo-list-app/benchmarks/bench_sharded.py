@@ -0,0 +1,62 @@
+"""
+Бенчмарк: задержка сохранения одной мутации при полной перезаписи JSON и в шардах
+"""
+import os
+import sys
+import tempfile
+
+from bench_utils import quiet_logging, make_records, write_json, measure, print_table
+
+from controllers.task_controller import TaskController
+from models.task import TaskStatus
+
+SIZES = [1_000, 10_000, 100_000]
+MUTATIONS = 20
+
+
+def bench_storage(records, name: str, **options) -> float:
+    """Средняя задержка change_task_status в миллисекундах"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        json_path = os.path.join(temp_dir, 'tasks.json')
+        write_json(json_path, records)
+        controller = TaskController(storage_path=json_path)
+        if name != 'tasks.json':
+            # Перенос тех же задач в проверяемое хранилище
+            tasks = controller.tasks.copy()
+            controller = TaskController(storage_path=os.path.join(temp_dir, name), **options)
+            controller.storage.replace_all(tasks)
+            controller.load_tasks()
+
+        task_ids = [task.id for task in controller.tasks[:MUTATIONS]]
+        statuses = [TaskStatus.IN_PROGRESS, TaskStatus.COMPLETED]
+        counter = iter(range(MUTATIONS * 2))
+
+        def mutate():
+            i = next(counter)
+            controller.change_task_status(task_ids[i % len(task_ids)], statuses[i % 2])
+
+        latency = measure(mutate, MUTATIONS)
+        controller.final_save()
+        return latency
+
+
+def main():
+    quiet_logging()
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    rows = []
+    for size in sizes:
+        records = make_records(size)
+        json_ms = bench_storage(records, 'tasks.json')
+        month_ms = bench_storage(records, 'tasks.manifest')
+        id_ms = bench_storage(records, 'tasks.manifest', shard_by='id')
+        rows.append([size, f"{json_ms:.2f}", f"{month_ms:.2f}", f"{id_ms:.2f}"])
+
+    print_table(
+        "ЗАДЕРЖКА СОХРАНЕНИЯ МУТАЦИИ (мс): JSON-перезапись vs шарды",
+        ["задач", "json", "шарды по месяцам", "шарды по 1000 id"],
+        rows
+    )
+
+
+if __name__ == '__main__':
+    main()
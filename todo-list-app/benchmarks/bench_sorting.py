@@ -0,0 +1,43 @@
+"""
+Бенчмарк: сортировка через sorted() и обходом упорядоченных индексов
+"""
+import os
+import sys
+import tempfile
+
+from bench_utils import quiet_logging, make_records, write_json, measure, print_table
+
+from controllers.task_controller import TaskController
+from indexes.sort_keys import SORT_KEYS, sort_key
+
+SIZE = 100_000
+REPEAT = 5
+
+
+def main():
+    quiet_logging()
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else SIZE
+    rows = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'tasks.json')
+        write_json(path, make_records(size))
+        controller = TaskController(storage_path=path)
+        tasks = controller.tasks.copy()
+
+        for criteria in SORT_KEYS:
+            for reverse in (False, True):
+                # Прежняя реализация sort_tasks: полная сортировка при каждом клике
+                sorted_ms = measure(lambda: sorted(tasks, key=sort_key(criteria), reverse=reverse), REPEAT)
+                index_ms = measure(lambda: controller.sort_tasks(criteria, reverse), REPEAT)
+                label = criteria + (' desc' if reverse else '')
+                rows.append([label, f"{sorted_ms:.2f}", f"{index_ms:.2f}", f"{sorted_ms / index_ms:.1f}x"])
+
+    print_table(
+        f"СОРТИРОВКА (мс), {size} задач: sorted() vs упорядоченные индексы",
+        ["критерий", "sorted()", "индексы", "ускорение"],
+        rows
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Бенчмарк: фильтрация и сортировка в памяти и запросами SQLite
+"""
+import os
+import sys
+import tempfile
+
+from bench_utils import quiet_logging, make_records, write_json, measure, print_table
+
+from controllers.task_controller import TaskController
+from models.task import TaskStatus
+
+SIZES = [10_000, 100_000]
+REPEAT = 10
+
+QUERIES = [
+    ("status", {'status': TaskStatus.COMPLETED}),
+    ("status+category+priority", {
+        'status': TaskStatus.COMPLETED, 'category': 'Работа', 'priority': 'Высокий'
+    }),
+]
+
+
+def bench_controller(controller):
+    """Время фильтрации по запросам и сортировки по сроку (мс)"""
+    results = []
+    for _, filters in QUERIES:
+        results.append(measure(lambda: controller.apply_filters(filters), REPEAT))
+    controller.apply_filters({'category': 'Работа'})
+    results.append(measure(lambda: controller.sort_tasks('due_date'), REPEAT))
+    return results
+
+
+def main():
+    quiet_logging()
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    rows = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            json_path = os.path.join(temp_dir, 'tasks.json')
+            write_json(json_path, make_records(size))
+
+            memory = TaskController(storage_path=json_path)
+            sqlite = TaskController(
+                storage_path=os.path.join(temp_dir, 'tasks.db'), import_from=json_path
+            )
+            labels = [name for name, _ in QUERIES] + ['sort due_date']
+            for label, json_ms, sqlite_ms in zip(labels, bench_controller(memory), bench_controller(sqlite)):
+                rows.append([size, label, f"{json_ms:.2f}", f"{sqlite_ms:.2f}"])
+            sqlite.final_save()
+
+    print_table(
+        "ФИЛЬТРАЦИЯ И СОРТИРОВКА (мс): список в памяти vs SQLite",
+        ["задач", "операция", "память", "sqlite"],
+        rows
+    )
+
+
+if __name__ == '__main__':
+    main()
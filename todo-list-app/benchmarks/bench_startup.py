@@ -0,0 +1,60 @@
+"""
+Бенчмарк: запуск с полным и ленивым разбором задач
+"""
+import os
+import sys
+import tempfile
+import time
+
+from bench_utils import quiet_logging, make_records, write_json, print_table
+
+from controllers.task_controller import TaskController
+
+SIZES = [100_000, 1_000_000]
+PAGE = 50
+
+
+def first_page(controller: TaskController) -> None:
+    """То, что окно делает до первой отрисовки: строки страницы и статистика"""
+    overdue_ids = controller.classify_deadlines()['overdue']
+    for task in controller.get_filtered_tasks()[:PAGE]:
+        (task.id, task.title, task.category, task.priority, task.status.value,
+         task.due_date, task.id in overdue_ids)
+    len(controller.get_tasks())
+    controller.count_by_status(next(iter(controller.get_tasks())).status)
+
+
+def startup(path: str, lazy: bool):
+    """Время загрузки и время до готовой первой страницы, мс"""
+    start = time.perf_counter()
+    controller = TaskController(storage_path=path, lazy_load=lazy)
+    loaded = time.perf_counter()
+    first_page(controller)
+    ready = time.perf_counter()
+    return (loaded - start) * 1000, (ready - start) * 1000
+
+
+def main():
+    quiet_logging()
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    rows = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'tasks.json')
+            write_json(path, make_records(size))
+            eager_load, eager_ready = startup(path, lazy=False)
+            lazy_load, lazy_ready = startup(path, lazy=True)
+        rows.append([
+            size, f"{eager_load:.0f}", f"{lazy_load:.0f}",
+            f"{eager_ready:.0f}", f"{lazy_ready:.0f}", f"{eager_ready / lazy_ready:.1f}x"
+        ])
+
+    print_table(
+        "ЗАПУСК (мс): полный разбор vs ленивый",
+        ["задач", "загрузка", "ленивая", "1-я страница", "ленивая", "ускорение"],
+        rows
+    )
+
+
+if __name__ == '__main__':
+    main()
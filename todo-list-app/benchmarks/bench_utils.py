@@ -0,0 +1,68 @@
+"""
+Общие утилиты для бенчмарков
+"""
+import json
+import logging
+import os
+import sys
+import time
+from datetime import datetime, date, timedelta
+from typing import List, Dict, Any, Callable
+
+# Добавляем src в путь для импортов
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+CATEGORIES = ["Работа", "Личное", "Здоровье", "Обучение", "Дом", "Другое", None]
+PRIORITIES = ["Высокий", "Средний", "Низкий"]
+STATUSES = ["Не начата", "В процессе", "Выполнена", "Отложена"]
+
+
+def quiet_logging() -> None:
+    """Отключение info-логов приложения на время замеров"""
+    logging.disable(logging.INFO)
+
+
+def make_records(count: int) -> List[Dict[str, Any]]:
+    """Генерация записей задач в формате Task.to_dict()"""
+    base = datetime(2025, 1, 1, 9, 0, 0)
+    today = date.today()
+    records = []
+    for i in range(count):
+        created = base + timedelta(minutes=i)
+        records.append({
+            'id': i + 1,
+            'title': f"Задача номер {i}",
+            'description': f"Описание задачи {i} " * 3,
+            'category': CATEGORIES[i % len(CATEGORIES)],
+            'priority': PRIORITIES[i % len(PRIORITIES)],
+            'due_date': (today + timedelta(days=i % 30 - 10)).isoformat() if i % 4 else None,
+            'status': STATUSES[i % len(STATUSES)],
+            'creation_date': created.isoformat(),
+            'modification_date': created.isoformat()
+        })
+    return records
+
+
+def write_json(path: str, records: List[Dict[str, Any]]) -> None:
+    """Запись записей в формате tasks.json"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(records, f, ensure_ascii=False, indent=2)
+
+
+def measure(func: Callable[[], Any], repeat: int) -> float:
+    """Среднее время одного вызова в миллисекундах"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def print_table(title: str, header: List[str], rows: List[List[Any]]) -> None:
+    """Вывод результатов в виде таблицы"""
+    print("\n" + "=" * 70)
+    print(title)
+    print("=" * 70)
+    widths = [max(len(str(row[i])) for row in [header] + rows) for i in range(len(header))]
+    print("  ".join(str(h).rjust(w) for h, w in zip(header, widths)))
+    for row in rows:
+        print("  ".join(str(c).rjust(w) for c, w in zip(row, widths)))
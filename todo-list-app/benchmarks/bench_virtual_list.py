@@ -0,0 +1,68 @@
+"""
+Бенчмарк: подготовка строк таблицы - все задачи vs окно виртуального списка
+
+Tk здесь не участвует: замеряется работа на Python-стороне, которую
+refresh_task_list делает на весь список (без кэша и через RowCache,
+когда задачи не менялись), а виртуальный список - на один кадр
+прокрутки (срез представления и значения видимых строк).
+"""
+import os
+import random
+import sys
+import tempfile
+
+from bench_utils import quiet_logging, make_records, write_json, measure, print_table
+
+from controllers.task_controller import TaskController
+from indexes.deadline_buckets import OVERDUE
+from views.row_cache import RowCache, task_row_values
+from utils.constants import VIRTUAL_OVERSCAN
+
+SIZES = [10_000, 100_000, 500_000]
+WINDOW = 30 + VIRTUAL_OVERSCAN
+FRAMES = 200
+
+
+def main():
+    quiet_logging()
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    rows = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'tasks.json')
+            write_json(path, make_records(size))
+            controller = TaskController(storage_path=path)
+            view = controller.set_sort('title', reverse=True)
+            overdue_ids = controller.classify_deadlines()[OVERDUE]
+
+            def all_rows():
+                return [task_row_values(task, overdue_ids) for task in view]
+
+            offsets = [random.Random(size).randrange(len(view) - WINDOW) for _ in range(FRAMES)]
+            frames = iter(offsets * 2)
+
+            def frame():
+                offset = next(frames)
+                return [task_row_values(task, overdue_ids) for task in view[offset:offset + WINDOW]]
+
+            cache = RowCache(lambda: overdue_ids)
+
+            def cached_rows():
+                return [cache.row(task) for task in view]
+
+            full_ms = measure(all_rows, 1)
+            cached_rows()
+            cached_ms = measure(cached_rows, 1)
+            frame_ms = measure(frame, FRAMES)
+            rows.append([size, f"{full_ms:.0f}", f"{cached_ms:.0f}", f"{frame_ms:.3f}"])
+            controller.final_save()
+
+    print_table(
+        f"СТРОКИ ТАБЛИЦЫ: весь список vs кадр прокрутки ({WINDOW} строк)",
+        ["задач", "все строки, мс", "все строки из кэша, мс", "кадр, мс"],
+        rows
+    )
+
+
+if __name__ == '__main__':
+    main()
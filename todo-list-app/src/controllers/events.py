@@ -0,0 +1,88 @@
+"""
+События изменения задач для подписчиков контроллера (представлений)
+"""
+import logging
+from typing import Callable, FrozenSet, Iterable, List, Optional, Tuple
+
+from models.task import Task
+
+# Виды событий
+CREATED = 'created'
+UPDATED = 'updated'
+DELETED = 'deleted'
+STATUS_CHANGED = 'status_changed'
+# Фильтры, строка поиска или сортировка: представление построено заново
+FILTERS_CHANGED = 'filters_changed'
+# Задачи загружены из хранилища или все индексы перестроены
+RELOADED = 'reloaded'
+
+EVENT_KINDS = (CREATED, UPDATED, DELETED, STATUS_CHANGED, FILTERS_CHANGED, RELOADED)
+# События, затрагивающие одну задачу
+TASK_EVENTS = (CREATED, UPDATED, DELETED, STATUS_CHANGED)
+
+
+class TaskEvent:
+    """Одно изменение: вид, задача и (для изменений) имена измененных полей
+
+    У удаленной задачи task - объект в состоянии на момент удаления.
+    """
+
+    __slots__ = ('kind', 'task_id', 'task', 'fields')
+
+    def __init__(
+        self,
+        kind: str,
+        task: Optional[Task] = None,
+        fields: FrozenSet[str] = frozenset()
+    ):
+        self.kind = kind
+        self.task = task
+        self.task_id = task.id if task is not None else None
+        self.fields = fields
+
+    def __repr__(self) -> str:
+        fields = f", fields={sorted(self.fields)}" if self.fields else ""
+        return f"TaskEvent({self.kind}, task_id={self.task_id}{fields})"
+
+
+class EventBus:
+    """Подписчики на события контроллера
+
+    Подписчик вызывается синхронно на каждое событие; объединять серии
+    событий (например, в одно обновление окна) - его дело. Исключение
+    в подписчике записывается в лог и не мешает остальным.
+    """
+
+    def __init__(self):
+        self._subscribers: List[Tuple[Callable[[TaskEvent], None], Optional[FrozenSet[str]]]] = []
+        self.logger = logging.getLogger(__name__)
+
+    def subscribe(
+        self,
+        callback: Callable[[TaskEvent], None],
+        kinds: Optional[Iterable[str]] = None
+    ) -> Callable[[], None]:
+        """Подписка на все события или только на kinds -> функция отписки"""
+        entry = (callback, frozenset(kinds) if kinds is not None else None)
+        self._subscribers.append(entry)
+
+        def unsubscribe() -> None:
+            if entry in self._subscribers:
+                self._subscribers.remove(entry)
+
+        return unsubscribe
+
+    def publish(self, events: Iterable[TaskEvent]) -> None:
+        """Доставка событий по порядку всем подходящим подписчикам"""
+        for event in events:
+            for callback, kinds in list(self._subscribers):
+                if kinds is not None and event.kind not in kinds:
+                    continue
+                try:
+                    callback(event)
+                except Exception as e:
+                    self.logger.error(f"Event subscriber failed on {event!r}: {e}")
+
+    def __bool__(self) -> bool:
+        """Есть ли подписчики (без них события не создаются)"""
+        return bool(self._subscribers)
@@ -1,30 +1,103 @@
 """
 Контроллер задач - бизнес-логика согласно диаграммам последовательности
 """
-import json
 import logging
-from typing import List, Optional, Dict, Any
+import threading
+from contextlib import contextmanager
+from itertools import count
+from typing import List, Optional, Dict, Any, FrozenSet, Iterable, Iterator, Set, Tuple
 from pathlib import Path
 from datetime import datetime, date
 
 # АБСОЛЮТНЫЕ ИМПОРТЫ
 from models.task import Task, TaskStatus
+from models.id_allocator import IdAllocator, needs_id_migration
+from models.change_set import ChangeSet
 from utils.validators import validate_task_data
+from storage.factory import create_storage
+from storage.background_writer import BackgroundWriter
+from controllers.transaction import Transaction, DeferredLogger
+from controllers.events import (
+    EventBus, TaskEvent, CREATED, UPDATED, DELETED, STATUS_CHANGED, FILTERS_CHANGED, RELOADED
+)
+from indexes.task_list import TaskList
+from indexes.secondary_index import SecondaryIndexes
+from indexes.live_view import LiveView
+from indexes.order_index import OrderIndexes
+from indexes.column_store import TaskColumns
+from indexes.deadline_buckets import DeadlineBuckets, OVERDUE, DUE_SOON
+from indexes.search_index import SearchIndex, has_terms, narrows, query_terms
+from indexes.task_counters import TaskCounters
+
+# Поля задачи, которые можно изменить через update_task
+EDITABLE_FIELDS = ('title', 'description', 'category', 'priority', 'due_date')
+
+# Пакет не меньше len(tasks) / BULK_REBUILD_DIVISOR изменений перестраивает
+# индексы и представление целиком вместо точечных обновлений
+BULK_REBUILD_DIVISOR = 4
+
+# Результат поиска, отличающийся от представления больше чем на
+# len / SEARCH_PATCH_DIVISOR задач, перестраивает представление целиком
+SEARCH_PATCH_DIVISOR = 2
 
 
 class TaskController:
     """Основной контроллер управления задачами"""
 
-    def __init__(self, storage_path: str = "data/tasks.json"):
+    def __init__(
+        self,
+        storage_path: str = "data/tasks.json",
+        storage_mode: Optional[str] = None,
+        write_behind: bool = False,
+        write_delay: float = 0.5,
+        lazy_load: bool = False,
+        **storage_options
+    ):
         self.storage_path = Path(storage_path)
         self.storage_path.parent.mkdir(parents=True, exist_ok=True)
-        self.tasks: List[Task] = []
-        self.filtered_tasks: List[Task] = []
+        self.storage = create_storage(self.storage_path, storage_mode, **storage_options)
+        # Ленивая загрузка: даты задач разбираются, а индексы строятся
+        # при первом обращении, а не до появления окна
+        self.lazy_load = lazy_load
+        # Все задачи, индексированные по id: поиск и удаление за O(1)
+        self.tasks = TaskList()
+        # Отфильтрованные и отсортированные задачи, обновляемые точечно
+        self._view = LiveView(self._lookup)
+        self.id_allocator = IdAllocator()
+        # Инвертированные индексы статус/категория/приоритет -> id задач
+        # (строятся при первом фильтре, см. свойство indexes)
+        self._indexes: Optional[SecondaryIndexes] = None
+        # Все задачи, упорядоченные по критериям сортировки (строятся по требованию)
+        self.order_indexes = OrderIndexes(lambda: self.tasks)
+        # Статус и срок в массивах для векторных масок по срокам
+        # (строятся при первом обращении, см. свойство columns)
+        self._columns: Optional[TaskColumns] = None
+        # Корзины по срокам, кэшируемые до смены дня
+        self._deadlines: Optional[DeadlineBuckets] = None
+        # Полнотекстовый индекс по названиям и описаниям (строится при первом поиске)
+        self._search: Optional[SearchIndex] = None
+        # Счетчики для статистики (всего, по статусу, приоритету, категории)
+        self.counters = TaskCounters()
         self.current_filters: Dict[str, Any] = {}
+        # Номера изменений задач (Task.version): растут и не повторяются,
+        # поэтому и после отката транзакции не совпадают с более поздними
+        self._versions = count(1)
+        # Изменения с момента последнего сохранения: id -> задача (None - удалена)
+        self.pending_changes = ChangeSet()
+        self._pending_lock = threading.Lock()
+        # Открытая транзакция (см. transaction())
+        self._transaction: Optional[Transaction] = None
+        # Подписчики на изменения задач и представления
+        self.events = EventBus()
         self.logger = self._setup_logger()
 
         self.load_tasks()
 
+        # Режим отложенной записи: мутации не ждут диска
+        self.writer: Optional[BackgroundWriter] = None
+        if write_behind:
+            self.writer = BackgroundWriter(self._write_pending, write_delay)
+
     def _setup_logger(self) -> logging.Logger:
         """Настройка логирования"""
         logger = logging.getLogger(__name__)
@@ -47,17 +120,13 @@ class TaskController:
             raise ValueError("Invalid task data")
 
         # Создание задачи
-        task = Task(
-            title=task_data['title'],
-            description=task_data.get('description', ''),
-            category=task_data.get('category'),
-            priority=task_data.get('priority', 'Средний'),
-            due_date=task_data.get('due_date')
-        )
+        task = self._new_task(task_data)
 
-        self.tasks.append(task)
-        self.apply_filters(self.current_filters)
+        self.tasks.add(task)
+        self._index_task(task)
+        self._mark_created(task)
         self.save_changes()
+        self._publish(CREATED, task)
 
         self.logger.info(f"Task created: {task.title} (ID: {task.id})")
         return task
@@ -75,21 +144,17 @@ class TaskController:
             raise ValueError("Invalid task data")
 
         # Обновление задачи
-        update_data = {}
-        if 'title' in task_data:
-            update_data['title'] = task_data['title']
-        if 'description' in task_data:
-            update_data['description'] = task_data['description']
-        if 'category' in task_data:
-            update_data['category'] = task_data['category']
-        if 'priority' in task_data:
-            update_data['priority'] = task_data['priority']
-        if 'due_date' in task_data:
-            update_data['due_date'] = task_data['due_date']
-
-        task.update(**update_data)
-        self.apply_filters(self.current_filters)
+        update_data = {key: task_data[key] for key in EDITABLE_FIELDS if key in task_data}
+
+        self._unindex_task(task)
+        changed = task.update(**update_data)
+        self._index_task(task)
+        if not changed:
+            self.logger.info(f"Task unchanged: {task.title} (ID: {task.id})")
+            return task
+        self._mark_updated(task)
         self.save_changes()
+        self._publish(UPDATED, task, changed)
 
         self.logger.info(f"Task updated: {task.title} (ID: {task.id})")
         return task
@@ -100,9 +165,11 @@ class TaskController:
 
         task = self.find_task(task_id)
         if task:
-            self.tasks.remove(task)
-            self.apply_filters(self.current_filters)
+            self._unindex_task(task)
+            self._remove_task(task.id)
+            self._mark_deleted(task.id)
             self.save_changes()
+            self._publish(DELETED, task)
             self.logger.info(f"Task deleted: {task.title} (ID: {task.id})")
             return True
         return False
@@ -119,94 +186,660 @@ class TaskController:
             self.logger.warning(f"Task already has status: {status}")
             return task
 
+        self._unindex_task(task)
         task.set_status(status)
-        self.apply_filters(self.current_filters)
+        self._index_task(task)
+        self._mark_updated(task)
         self.save_changes()
+        self._publish(STATUS_CHANGED, task, frozenset(('status',)))
 
         self.logger.info(f"Task status changed: {task.title} -> {status.value}")
         return task
 
+    def create_tasks(self, items: List[Dict[str, Any]]) -> List[Task]:
+        """Пакетное создание задач с одной перестройкой и одной записью
+
+        Все данные проверяются до изменений: при ошибке не создается ничего.
+        Возвращает созданные задачи в порядке items.
+        """
+        if not items:
+            return []
+        self.logger.info(f"Creating {len(items)} tasks")
+        self._validate_all(items)
+
+        rebuild = self._bulk_rebuild(len(items))
+        created = []
+        for task_data in items:
+            task = self._new_task(task_data)
+            self.tasks.add(task)
+            if not rebuild:
+                self._index_task(task)
+            self._mark_created(task)
+            created.append(task)
+        self._finish_bulk(rebuild)
+        for task in created:
+            self._publish(CREATED, task)
+
+        self.logger.info(f"Tasks created: {len(created)}")
+        return created
+
+    def update_tasks(self, updates: Dict[int, Dict[str, Any]]) -> Dict[int, Optional[Task]]:
+        """Пакетное обновление задач: id -> данные
+
+        Все данные проверяются до изменений. Возвращает id -> задача
+        (None - задача не найдена).
+        """
+        self.logger.info(f"Updating {len(updates)} tasks")
+        self._validate_all(updates.values())
+
+        rebuild = self._bulk_rebuild(len(updates))
+        results: Dict[int, Optional[Task]] = {}
+        events = []
+        for task_id, task_data in updates.items():
+            task = results[task_id] = self.tasks.get(task_id)
+            if task is None:
+                continue
+            if not rebuild:
+                self._unindex_task(task)
+            changed = task.update(**{key: task_data[key] for key in EDITABLE_FIELDS if key in task_data})
+            if not rebuild:
+                self._index_task(task)
+            if changed:
+                self._mark_updated(task)
+                events.append((task, changed))
+        self._finish_bulk(rebuild)
+        for task, changed in events:
+            self._publish(UPDATED, task, changed)
+
+        self.logger.info(f"Tasks updated: {sum(task is not None for task in results.values())}")
+        return results
+
+    def delete_tasks(self, task_ids: Iterable[int]) -> Dict[int, bool]:
+        """Пакетное удаление задач -> id -> удалена ли задача"""
+        task_ids = list(dict.fromkeys(task_ids))
+        self.logger.info(f"Deleting {len(task_ids)} tasks")
+
+        rebuild = self._bulk_rebuild(len(task_ids))
+        results: Dict[int, bool] = {}
+        deleted = []
+        for task_id in task_ids:
+            task = self.tasks.get(task_id)
+            results[task_id] = task is not None
+            if task is None:
+                continue
+            if not rebuild:
+                self._unindex_task(task)
+            self._remove_task(task_id)
+            self._mark_deleted(task_id)
+            deleted.append(task)
+        self._finish_bulk(rebuild)
+        for task in deleted:
+            self._publish(DELETED, task)
+
+        self.logger.info(f"Tasks deleted: {sum(results.values())}")
+        return results
+
+    def change_status_many(self, task_ids: Iterable[int], status: TaskStatus) -> Dict[int, Optional[Task]]:
+        """Пакетное изменение статуса -> id -> задача (None - не найдена)"""
+        task_ids = list(dict.fromkeys(task_ids))
+        self.logger.info(f"Changing status of {len(task_ids)} tasks to {status}")
+
+        rebuild = self._bulk_rebuild(len(task_ids))
+        results: Dict[int, Optional[Task]] = {}
+        changed = []
+        for task_id in task_ids:
+            task = results[task_id] = self.tasks.get(task_id)
+            if task is None or task.status == status:
+                continue
+            if not rebuild:
+                self._unindex_task(task)
+            task.set_status(status)
+            if not rebuild:
+                self._index_task(task)
+            self._mark_updated(task)
+            changed.append(task)
+        self._finish_bulk(rebuild)
+        for task in changed:
+            self._publish(STATUS_CHANGED, task, frozenset(('status',)))
+
+        self.logger.info(f"Task statuses changed to {status.value}: {len(changed)}")
+        return results
+
+    def _new_task(self, task_data: Dict[str, Any]) -> Task:
+        """Новая задача с постоянным id (данные уже проверены)"""
+        return Task(
+            title=task_data['title'],
+            description=task_data.get('description', ''),
+            category=task_data.get('category'),
+            priority=task_data.get('priority', 'Средний'),
+            due_date=task_data.get('due_date'),
+            task_id=self._allocate_id()
+        )
+
+    def _validate_all(self, items: Iterable[Dict[str, Any]]) -> None:
+        """Проверка всех данных пакета до каких-либо изменений"""
+        invalid = [position for position, task_data in enumerate(items) if not validate_task_data(task_data)]
+        if invalid:
+            raise ValueError(f"Invalid task data at positions: {invalid}")
+
+    def _bulk_rebuild(self, count: int) -> bool:
+        """Выгоднее ли перестроить индексы целиком, чем обновить count задач
+
+        В транзакции - нет: точечные обновления запоминают состояние задач для отката.
+        """
+        return self._transaction is None and count * BULK_REBUILD_DIVISOR >= len(self.tasks)
+
+    def _finish_bulk(self, rebuild: bool) -> None:
+        """Перестройка индексов (если нужна) и одна запись после пакета"""
+        if rebuild:
+            self._rebuild_indexes()
+        self.save_changes()
+
+    def _rebuild_indexes(self) -> None:
+        """Сброс всех индексов и полное построение представления"""
+        self._indexes = None
+        self.order_indexes.rebuild()
+        self._columns = self._deadlines = None
+        self._search = None
+        self.counters = TaskCounters(self.tasks)
+        if not self.lazy_load:
+            self.build_indexes()
+        self._refilter()
+
+    def _remove_task(self, task_id: int) -> None:
+        """Удаление задачи из списка (в транзакции - с запоминанием порядка)"""
+        if self._transaction is not None and self._transaction.order is None:
+            self._transaction.order = self.tasks.ids()
+        self.tasks.remove(task_id)
+
+    @contextmanager
+    def transaction(self) -> Iterator['TaskController']:
+        """Транзакция над задачами: with controller.transaction(): ...
+
+        Внутри блока повторная фильтрация (apply_filters), запись
+        (save_changes) и info-сообщения откладываются до фиксации, поэтому
+        серия одиночных операций стоит одну фильтрацию и одну запись.
+        Если из блока вылетает исключение, задачи в памяти возвращаются
+        к состоянию до транзакции, а исключение пробрасывается дальше.
+        Вложенные транзакции становятся частью внешней.
+        """
+        if self._transaction is not None:
+            yield self
+            return
+
+        with self._pending_lock:
+            self._transaction = Transaction(self.pending_changes, self.current_filters)
+        logger = self.logger
+        deferred = self.logger = DeferredLogger(logger)
+        try:
+            yield self
+        except BaseException:
+            self.logger = logger
+            self._rollback()
+            raise
+        self.logger = logger
+        self._commit(deferred)
+
+    def _commit(self, deferred: DeferredLogger) -> None:
+        """Фиксация: отложенные сообщения, одна фильтрация и одна запись"""
+        transaction = self._transaction
+        with self._pending_lock:
+            self._transaction = None
+        deferred.flush()
+        if transaction.refilter:
+            self._refilter()
+        self.logger.info(f"Transaction committed: {transaction.touched()} tasks changed")
+        if transaction.touched():
+            self.save_changes()
+        self.events.publish(transaction.events)
+
+    def _rollback(self) -> None:
+        """Возврат задач, несохраненных изменений и фильтров к началу транзакции"""
+        transaction = self._transaction
+        for task_id in transaction.created:
+            self.tasks.remove(task_id)
+        for task, state in transaction.snapshots.values():
+            task.restore(state)
+        if transaction.order is not None:
+            # Возврат удаленных задач на прежние места
+            restored = {task.id: task for task, _ in transaction.snapshots.values()}
+            candidates = (self.tasks.get(task_id) or restored.get(task_id) for task_id in transaction.order)
+            self.tasks = TaskList(task for task in candidates if task is not None)
+
+        with self._pending_lock:
+            self._transaction = None
+            changes = transaction.pending_changes
+            if self.storage.supports_queries:
+                # Хранилище могло получить изменения транзакции через stage()
+                for task_id in transaction.created:
+                    changes.setdefault(task_id, None)
+                for task_id, (task, _) in transaction.snapshots.items():
+                    changes.setdefault(task_id, task)
+            self.pending_changes = changes
+
+        self.current_filters = transaction.filters
+        self._rebuild_indexes()
+        self.logger.warning(f"Transaction rolled back: {transaction.touched()} tasks restored")
+        if transaction.events:
+            # События транзакции не доставлялись, но состояние в памяти менялось
+            self._publish(RELOADED)
+
     def find_task(self, task_id: int) -> Optional[Task]:
         """Поиск задачи по ID"""
-        return next((task for task in self.tasks if task.id == task_id), None)
+        return self.tasks.get(task_id)
+
+    def _lookup(self, task_id: int) -> Optional[Task]:
+        """Задача по id без логирования (для индексов и представлений)"""
+        return self.tasks.get(task_id)
 
-    def apply_filters(self, filters: Dict[str, Any]) -> List[Task]:
+    @property
+    def filtered_tasks(self) -> LiveView:
+        """Задачи, удовлетворяющие текущим фильтрам, в текущем порядке сортировки"""
+        return self._view
+
+    def apply_filters(self, filters: Dict[str, Any]) -> LiveView:
         """Применение фильтров - соответствует Use Case 'Filter Tasks'"""
         self.current_filters = filters
-        self.filtered_tasks = self.tasks.copy()
-
-        # Фильтрация по статусу
-        if filters.get('status'):
-            self.filtered_tasks = [
-                task for task in self.filtered_tasks
-                if task.status.value == filters['status'].value
-            ]
-
-        # Фильтрация по категории
-        if filters.get('category'):
-            self.filtered_tasks = [
-                task for task in self.filtered_tasks
-                if task.category == filters['category']
-            ]
-
-        # Фильтрация по приоритету
-        if filters.get('priority'):
-            self.filtered_tasks = [
-                task for task in self.filtered_tasks
-                if task.priority == filters['priority']
-            ]
-
+        if self._transaction is not None:
+            # Представление перестраивается один раз при фиксации
+            self._transaction.refilter = True
+            self._publish(FILTERS_CHANGED)
+            return self.filtered_tasks
+        self._refilter()
+        # Подписчики видят уже перестроенное представление
+        self._publish(FILTERS_CHANGED)
         self.logger.info(f"Filters applied: {len(self.filtered_tasks)} tasks match criteria")
         return self.filtered_tasks
 
+    def _refilter(self) -> None:
+        """Полное построение представления по текущим фильтрам"""
+        filters = self.current_filters
+        if self.storage.supports_queries:
+            # Фильтрация запросом по индексированным колонкам
+            self._stage_pending()
+            matching = self._resolve(self.storage.query_ids(filters))
+        else:
+            # Пересечение индексов по статусу, категории и приоритету
+            matching_ids = self.indexes.query(filters) if any(filters.values()) else None
+            matching = self.tasks if matching_ids is None else self._resolve(matching_ids)
+        if has_terms(filters.get('query')):
+            # Строка поиска - по полнотекстовому индексу среди подходящих задач
+            allowed = None if matching is self.tasks else {task.id for task in matching}
+            matching = self._resolve(list(self.search_index.matching_ids(filters['query'], allowed)))
+        self._view.rebuild(matching, filters)
+
+    def set_search(self, query: str) -> LiveView:
+        """Строка поиска поверх текущих фильтров (строка без слов - без поиска)
+
+        Вызывается на каждое изменение строки поиска, поэтому представление
+        не перестраивается, а приводится к новому результату точечно, если
+        он отличается от текущего не больше чем наполовину или только
+        сужает его (запрос дописан).
+        """
+        filters = {key: value for key, value in self.current_filters.items() if key != 'query'}
+        if has_terms(query):
+            filters['query'] = query
+        if self._transaction is not None or self.storage.supports_queries:
+            return self.apply_filters(filters)
+
+        current = self.current_filters
+        same_filters = (
+            filters.keys() - {'query'} == current.keys() - {'query'}
+            and all(filters[key] == current[key] for key in filters if key != 'query')
+        )
+        if same_filters and query_terms(filters.get('query', '')) == query_terms(current.get('query', '')):
+            # Те же термины (например, добавлен пробел или первая буква
+            # нового слова) - представление не меняется
+            self.current_filters = filters
+            self._view.filters = filters
+            return self.filtered_tasks
+        # Запрос дописан - результат только сужается: лишнее убирается из
+        # представления без сортировки, даже если убрать нужно почти все
+        narrowing = same_filters and narrows(filters.get('query'), current.get('query'))
+
+        wanted = self.indexes.query(filters) if any(filters.values()) else None
+        if filters.get('query'):
+            wanted = self.search_index.matching_ids(query, wanted)
+        elif wanted is None:
+            wanted = set(self.tasks.ids())
+
+        self.current_filters = filters
+        removed, added = self._view.difference(wanted, narrowing)
+        if not narrowing and (len(removed) + len(added)) * SEARCH_PATCH_DIVISOR > max(len(wanted), len(self._view)):
+            self._view.rebuild(self._resolve(list(wanted)), filters)
+        else:
+            self._view.patch(filters, removed, self._resolve(added))
+        self._publish(FILTERS_CHANGED)
+        self.logger.info(f"Search '{query}': {len(self._view)} tasks match criteria")
+        return self.filtered_tasks
+
+    def search(
+        self,
+        query: str,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None
+    ) -> List[Task]:
+        """Поиск по названию и описанию, по убыванию релевантности
+
+        Найдены задачи, содержащие все слова запроса (в любой форме слова
+        или по началу слова). Результат ограничивается фильтрами filters,
+        по умолчанию - текущими фильтрами apply_filters.
+        """
+        filters = self.current_filters if filters is None else filters
+        allowed = self.indexes.query(filters) if any(filters.values()) else None
+        ranked = self.search_index.search(query, limit, allowed)
+        self.logger.info(f"Search '{query}': {len(ranked)} tasks found")
+        return self._resolve([task_id for task_id, _ in ranked])
+
+    def set_sort(self, criteria: Optional[str], reverse: bool = False) -> LiveView:
+        """Сортировка отфильтрованного представления; порядок сохраняется при изменениях"""
+        ordered = None
+        if criteria is not None and criteria != self._view.criteria:
+            ordered = self._sorted_entries(criteria)
+        self._view.set_sort(criteria, reverse, ordered)
+        self._publish(FILTERS_CHANGED)
+        self.logger.info(f"View sorted by: {criteria}")
+        return self._view
+
     def sort_tasks(self, criteria: str, reverse: bool = False) -> List[Task]:
         """Сортировка задач"""
-        sort_key = {
-            'due_date': lambda t: t.due_date or date.max,
-            'priority': lambda t: {'Высокий': 3, 'Средний': 2, 'Низкий': 1}.get(t.priority, 2),
-            'creation_date': lambda t: t.creation_date,
-            'title': lambda t: t.title.lower()
-        }.get(criteria, lambda t: t.creation_date)
-
-        sorted_tasks = sorted(self.filtered_tasks, key=sort_key, reverse=reverse)
+        if self.storage.supports_queries:
+            self._stage_pending()
+            ids = self.storage.sorted_ids(self.current_filters, criteria, reverse)
+            self.logger.info(f"Tasks sorted by: {criteria}")
+            return self._resolve(ids)
+
+        ids = [task_id for _, task_id in self._sorted_entries(criteria)]
+        if reverse:
+            ids.reverse()
         self.logger.info(f"Tasks sorted by: {criteria}")
-        return sorted_tasks
+        return self._resolve(ids)
+
+    def _sorted_entries(self, criteria: str) -> List[Tuple[Any, int]]:
+        """Записи (ключ, id) отфильтрованных задач по возрастанию ключа
+
+        Обычно это обход упорядоченного индекса с отбором по представлению;
+        представление намного меньше индекса дешевле отсортировать напрямую.
+        """
+        index = self.order_indexes.get(criteria)
+        view = self._view
+        if len(view) * 8 < len(index):
+            key = index.key
+            return sorted((key(task), task.id) for task in view)
+        member = None if len(view) == len(self.tasks) else view.has_id
+        return list(index.entries(member))
+
+    def _allocate_id(self) -> int:
+        """Новый постоянный id; next_id сохраняется вместе с задачами"""
+        task_id = self.id_allocator.allocate()
+        self.storage.metadata['next_id'] = self.id_allocator.next_id
+        return task_id
+
+    def _index_task(self, task: Task) -> None:
+        """Добавление задачи в индексы (после создания или изменения)"""
+        task.version = next(self._versions)
+        if self._indexes is not None:
+            self._indexes.add(task)
+        self.counters.add(task)
+        self.order_indexes.add(task)
+        if self._columns is not None:
+            self._columns.add(task)
+            self._deadlines.update(task)
+        if self._search is not None:
+            self._search.add(task)
+        self._view.offer(task)
+
+    def _unindex_task(self, task: Task) -> None:
+        """Удаление задачи из индексов (до изменения или удаления)"""
+        if self._transaction is not None:
+            self._transaction.remember(task)
+        if self._indexes is not None:
+            self._indexes.remove(task)
+        self.counters.remove(task)
+        self.order_indexes.remove(task)
+        if self._columns is not None:
+            self._columns.remove(task.id)
+            self._deadlines.discard(task.id)
+        if self._search is not None:
+            self._search.remove(task)
+        self._view.discard(task.id)
+
+    @property
+    def indexes(self) -> SecondaryIndexes:
+        """Вторичные индексы; строятся при первом фильтре, а не при загрузке"""
+        if self._indexes is None:
+            self._indexes = SecondaryIndexes()
+            self._indexes.rebuild(self.tasks)
+        return self._indexes
+
+    @property
+    def search_index(self) -> SearchIndex:
+        """Полнотекстовый индекс; строится при первом поиске"""
+        if self._search is None:
+            self._search = SearchIndex(self.tasks)
+        return self._search
+
+    @property
+    def columns(self) -> TaskColumns:
+        """Колоночное хранилище; строится при первом обращении, а не при загрузке"""
+        if self._columns is None:
+            self._columns = TaskColumns(self.tasks)
+            self._deadlines = DeadlineBuckets(self._columns)
+        return self._columns
+
+    @property
+    def deadlines(self) -> DeadlineBuckets:
+        """Корзины сроков поверх колоночного хранилища"""
+        self.columns
+        return self._deadlines
+
+    def build_indexes(self) -> None:
+        """Построение всех индексов сразу, а не при первом обращении"""
+        self.indexes
+        self.columns
+        for criteria in self.order_indexes.criteria:
+            self.order_indexes.get(criteria)
+
+    def _resolve(self, task_ids: List[int]) -> List[Task]:
+        """Преобразование идентификаторов из хранилища в объекты задач"""
+        return [self.tasks.get(task_id) for task_id in task_ids]
 
     def load_tasks(self) -> None:
         """Загрузка задач из хранилища"""
         try:
-            if self.storage_path.exists():
-                with open(self.storage_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.tasks = [Task.from_dict(task_data) for task_data in data]
-                self.filtered_tasks = self.tasks.copy()
+            if self.storage.exists():
+                lazy = self.lazy_load
+                tasks = self.storage.load_tasks(lazy)
+                migrate = needs_id_migration(task.id for task in tasks)
+                if migrate:
+                    for number, task in enumerate(tasks, 1):
+                        task.id = number
+
+                self.tasks = TaskList(tasks)
+                self.pending_changes = ChangeSet()
+                self._indexes = None
+                self.order_indexes.rebuild()
+                self._columns = self._deadlines = None
+                self._search = None
+                self.counters = TaskCounters(self.tasks)
+                self.id_allocator = IdAllocator(self.storage.metadata.get('next_id', 1))
+                self.id_allocator.observe(self.tasks.ids())
+                self.storage.metadata['next_id'] = self.id_allocator.next_id
+                if not lazy:
+                    self.build_indexes()
+                self._refilter()
                 self.logger.info(f"Loaded {len(self.tasks)} tasks from storage")
+
+                if migrate:
+                    # Старые id-адреса заменены на 1..n - сохраняем сразу
+                    self.storage.replace_all(self.tasks.copy())
+                    self.logger.info(f"Migrated {len(self.tasks)} task ids to dense ids")
             else:
                 self.logger.info("No existing storage found, starting with empty task list")
         except Exception as e:
             self.logger.error(f"Error loading tasks: {e}")
-            self.tasks = []
-            self.filtered_tasks = []
+            self.tasks = TaskList()
+            self._indexes = None
+            self.order_indexes.rebuild()
+            self._columns = self._deadlines = None
+            self._search = None
+            self.counters = TaskCounters()
+            self._view.rebuild(self.tasks)
+        self._publish(RELOADED)
+
+    def _publish(
+        self,
+        kind: str,
+        task: Optional[Task] = None,
+        fields: FrozenSet[str] = frozenset()
+    ) -> None:
+        """Событие для подписчиков events (в транзакции - после фиксации)"""
+        if not self.events:
+            return
+        event = TaskEvent(kind, task, fields)
+        if self._transaction is not None:
+            self._transaction.events.append(event)
+        else:
+            self.events.publish((event,))
+
+    def _mark_created(self, task: Task) -> None:
+        """Регистрация новой задачи для следующего сохранения"""
+        with self._pending_lock:
+            self.pending_changes.add_created(task)
+            if self._transaction is not None:
+                self._transaction.created.append(task.id)
+
+    def _mark_updated(self, task: Task) -> None:
+        """Регистрация измененных полей задачи для следующего сохранения"""
+        with self._pending_lock:
+            self.pending_changes.add_updated(task)
+
+    def _mark_deleted(self, task_id: int) -> None:
+        """Регистрация удаления задачи для следующего сохранения"""
+        with self._pending_lock:
+            self.pending_changes.add_deleted(task_id)
+
+    def get_pending_changes(self) -> ChangeSet:
+        """Копия изменений, еще не переданных на сохранение"""
+        with self._pending_lock:
+            return self.pending_changes.copy()
+
+    def _stage_pending(self) -> None:
+        """Передача несохраненных изменений хранилищу перед запросом к нему"""
+        with self._pending_lock:
+            self.storage.stage(self.pending_changes)
+
+    def _write_pending(self) -> None:
+        """Запись накопленных изменений (вызывается и из потока записи)"""
+        with self._pending_lock:
+            if self._transaction is not None:
+                # Изменения открытой транзакции записываются после фиксации
+                return
+            if not self.pending_changes:
+                # Нечего записывать: файл и его резервные копии не трогаются
+                return
+            changes = self.pending_changes
+            self.pending_changes = ChangeSet()
+            # Пометки задач переходят в набор изменений, уходящий на запись;
+            # поля, измененные после сбора набора, остаются помеченными
+            for task_id, fields in changes.fields.items():
+                changes[task_id].mark_clean(fields)
+            # Копия списка нужна только хранилищам, перезаписывающим все задачи
+            tasks = self.tasks.copy() if self.storage.saves_all_tasks else []
+            count = len(self.tasks)
+            self.storage.stage(changes)
+
+        try:
+            self.storage.save(tasks, changes)
+        except Exception:
+            # Возвращаем изменения, не перезаписывая более новые
+            with self._pending_lock:
+                self.pending_changes.merge_older(changes)
+                if self._transaction is not None:
+                    # Транзакция открылась во время записи: при откате эти
+                    # изменения должны остаться в наборе, а не потеряться
+                    self._transaction.pending_changes.merge_older(changes)
+                for task_id, fields in changes.fields.items():
+                    changes[task_id].mark_dirty(fields)
+            raise
+        self.logger.info(f"Saved {count} tasks to storage")
 
     def save_changes(self) -> None:
-        """Сохранение изменений"""
+        """Сохранение изменений (в транзакции - при ее фиксации)"""
+        if self._transaction is not None:
+            return
+        if self.writer:
+            self.writer.mark_dirty()
+            return
+
         try:
-            data = [task.to_dict() for task in self.tasks]
-            with open(self.storage_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-            self.logger.info(f"Saved {len(self.tasks)} tasks to storage")
+            self._write_pending()
         except Exception as e:
             self.logger.error(f"Error saving tasks: {e}")
 
+    def flush(self) -> None:
+        """Немедленная запись отложенных изменений"""
+        if self.writer:
+            self.writer.flush()
+        else:
+            self.save_changes()
+
+    def get_persistence_stats(self) -> Dict[str, Any]:
+        """Счетчики фоновой записи (объединенные записи, задержка сброса)"""
+        return self.writer.get_stats() if self.writer else {}
+
     def final_save(self) -> None:
         """Финальное сохранение при закрытии приложения"""
+        if self.writer:
+            self.writer.stop()
+            self.writer = None
         self.save_changes()
+        self.storage.close()
         self.logger.info("Final save completed")
 
-    def get_tasks(self) -> List[Task]:
+    def get_tasks(self) -> TaskList:
         """Получение всех задач"""
         return self.tasks
 
-    def get_filtered_tasks(self) -> List[Task]:
+    def get_filtered_tasks(self) -> LiveView:
         """Получение отфильтрованных задач"""
-        return self.filtered_tasks
\ No newline at end of file
+        return self.filtered_tasks
+
+    def classify_deadlines(self, today: Optional[date] = None) -> Dict[str, Set[int]]:
+        """Корзины overdue/due_soon/on_track/no_deadline -> id задач
+
+        Пересчитываются одним проходом только при смене дня; не изменять результат.
+        """
+        return self.deadlines.classify(today)
+
+    def get_deadline_bucket(self, task_id: int) -> Optional[str]:
+        """Корзина срока одной задачи"""
+        return self.deadlines.bucket_of(task_id)
+
+    def get_overdue_ids(self) -> Set[int]:
+        """id просроченных невыполненных задач"""
+        return set(self.classify_deadlines()[OVERDUE])
+
+    def get_due_soon_ids(self) -> Set[int]:
+        """id невыполненных задач, срок которых истекает в ближайшие 2 дня"""
+        return set(self.classify_deadlines()[DUE_SOON])
+
+    def count_by_status(self, status: TaskStatus) -> int:
+        """Количество задач со статусом - из счетчиков, за O(1)"""
+        return self.counters.count_status(status)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Снимок статистики: всего, по статусу, приоритету и категории,
+        выполнено, активные, просрочено и в текущем представлении
+
+        Счетчики поддерживаются при каждом изменении, просроченные берутся
+        из корзин сроков (пересчет - раз в день), поэтому снимок не
+        проходит по задачам.
+        """
+        stats = self.counters.snapshot()
+        completed = self.counters.count_status(TaskStatus.COMPLETED)
+        stats['completed'] = completed
+        stats['active'] = stats['total'] - completed
+        stats['overdue'] = len(self.classify_deadlines()[OVERDUE])
+        stats['filtered'] = len(self.filtered_tasks)
+        return stats
\ No newline at end of file
@@ -0,0 +1,63 @@
+"""
+Транзакция (unit of work) над задачами контроллера
+"""
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from models.change_set import ChangeSet
+from models.task import Task
+
+
+class DeferredLogger:
+    """Логгер, откладывающий info-сообщения до фиксации транзакции
+
+    Предупреждения и ошибки пишутся сразу.
+    """
+
+    def __init__(self, logger: logging.Logger):
+        self.logger = logger
+        self.messages: List[str] = []
+
+    def info(self, message: str) -> None:
+        self.messages.append(message)
+
+    def warning(self, message: str) -> None:
+        self.logger.warning(message)
+
+    def error(self, message: str) -> None:
+        self.logger.error(message)
+
+    def flush(self) -> None:
+        """Вывод отложенных сообщений"""
+        for message in self.messages:
+            self.logger.info(message)
+        self.messages = []
+
+
+class Transaction:
+    """Журнал отмены изменений в памяти на время транзакции
+
+    Перед первым изменением каждой задачи запоминается ее состояние;
+    созданные задачи запоминаются по id. Откат возвращает прежние поля
+    тем же объектам задач, поэтому ссылки на них остаются верными.
+    """
+
+    def __init__(self, pending_changes: ChangeSet, filters: Dict[str, Any]):
+        self.pending_changes = pending_changes.copy()
+        self.filters = filters
+        self.refilter = False
+        self.snapshots: Dict[int, Tuple[Task, tuple]] = {}
+        self.created: List[int] = []
+        # Порядок задач до первого удаления (для отката удалений)
+        self.order: Optional[List[int]] = None
+        # События, которые получат подписчики после фиксации
+        self.events: List[Any] = []
+
+    def remember(self, task: Task) -> None:
+        """Запоминание состояния задачи перед ее изменением или удалением"""
+        if task.id not in self.snapshots and task.id not in self.created:
+            self.snapshots[task.id] = (task, task.snapshot())
+
+    def touched(self) -> int:
+        """Количество задач, затронутых транзакцией"""
+        return len(self.snapshots) + len(self.created)
@@ -0,0 +1,131 @@
+"""
+Колоночное хранилище полей задач для векторных масок по срокам
+"""
+from array import array
+from datetime import date
+from itertools import compress
+from typing import Dict, Iterable, List, Optional
+
+from models.task import Task, TaskStatus
+
+# Код 0 в колонке статусов - свободная строка
+STATUS_CODES = {status: code for code, status in enumerate(TaskStatus, 1)}
+# Ординал для задач без срока: больше любой реальной даты
+NO_DUE_DATE = 2 ** 31 - 1
+
+
+def status_table(codes: Iterable[int]) -> bytes:
+    """Таблица bytes.translate: заданные коды статуса -> 1, остальные -> 0"""
+    table = bytearray(256)
+    for code in codes:
+        table[code] = 1
+    return bytes(table)
+
+
+# Маски по статусу строятся одним вызовом translate
+LIVE_TABLE = status_table(STATUS_CODES.values())
+OPEN_TABLE = status_table(
+    code for status, code in STATUS_CODES.items() if status != TaskStatus.COMPLETED
+)
+
+
+def mask_and(left: bytes, right: bytes) -> bytes:
+    """Поэлементное И двух масок из байтов 0/1"""
+    size = len(left)
+    return (int.from_bytes(left, 'big') & int.from_bytes(right, 'big')).to_bytes(size, 'big')
+
+
+class TaskColumns:
+    """Статус и срок задач в параллельных массивах
+
+    Каждой задаче соответствует строка; освобожденные строки используются
+    повторно. Маски строятся целиком на уровне C (bytes.translate для
+    статусов, map по встроенным методам сравнения для сроков,
+    int.from_bytes для И, itertools.compress для отбора), без обращения
+    к объектам Task. Результаты - id задач в порядке строк.
+    """
+
+    def __init__(self, tasks: Iterable[Task] = ()):
+        self.rebuild(tasks)
+
+    def rebuild(self, tasks: Iterable[Task]) -> None:
+        """Построение колонок заново"""
+        tasks = list(tasks)
+        self.row_ids = array('q', [task.id for task in tasks])
+        self.status = bytearray([STATUS_CODES[task.status] for task in tasks])
+        self.due = array('i', [
+            task.due_date.toordinal() if task.due_date else NO_DUE_DATE for task in tasks
+        ])
+        self._row_by_id: Dict[int, int] = {task_id: row for row, task_id in enumerate(self.row_ids)}
+        self._free_rows: List[int] = []
+
+    def add(self, task: Task) -> None:
+        """Запись задачи в свободную или новую строку"""
+        status = STATUS_CODES[task.status]
+        due = task.due_date.toordinal() if task.due_date else NO_DUE_DATE
+        row = self._row_by_id.get(task.id)
+        if row is None and self._free_rows:
+            row = self._free_rows.pop()
+        if row is None:
+            self._row_by_id[task.id] = len(self.row_ids)
+            self.row_ids.append(task.id)
+            self.status.append(status)
+            self.due.append(due)
+            return
+
+        self._row_by_id[task.id] = row
+        self.row_ids[row] = task.id
+        self.status[row] = status
+        self.due[row] = due
+
+    def remove(self, task_id: int) -> None:
+        """Освобождение строки задачи"""
+        row = self._row_by_id.pop(task_id, None)
+        if row is not None:
+            self.status[row] = 0
+            self._free_rows.append(row)
+
+    def __len__(self) -> int:
+        return len(self._row_by_id)
+
+    # Маски (bytes, по байту 0/1 на строку)
+
+    def live_mask(self) -> bytes:
+        return bytes(self.status.translate(LIVE_TABLE))
+
+    def overdue_mask(self, today: Optional[date] = None) -> bytes:
+        """Срок прошел, а задача не выполнена (как Task.is_overdue)"""
+        today = (today or date.today()).toordinal()
+        return mask_and(self._open_mask(), bytes(map(today.__gt__, self.due)))
+
+    def due_soon_mask(self, today: Optional[date] = None) -> bytes:
+        """До срока 0-2 дня, задача не выполнена (как Task.is_due_soon)"""
+        today = (today or date.today()).toordinal()
+        window = mask_and(
+            bytes(map((today - 1).__lt__, self.due)),
+            bytes(map((today + 3).__gt__, self.due))
+        )
+        return mask_and(self._open_mask(), window)
+
+    def no_deadline_mask(self) -> bytes:
+        """Живые строки задач без срока"""
+        return mask_and(self.live_mask(), bytes(map(NO_DUE_DATE.__eq__, self.due)))
+
+    def _open_mask(self) -> bytes:
+        """Живые строки с любым статусом, кроме 'Выполнена'"""
+        return bytes(self.status.translate(OPEN_TABLE))
+
+    # Результаты
+
+    def ids(self, mask: bytes) -> List[int]:
+        """id задач в строках маски"""
+        return list(compress(self.row_ids, mask))
+
+    def overdue_ids(self, today: Optional[date] = None) -> List[int]:
+        return self.ids(self.overdue_mask(today))
+
+    def due_soon_ids(self, today: Optional[date] = None) -> List[int]:
+        return self.ids(self.due_soon_mask(today))
+
+    def no_deadline_ids(self) -> List[int]:
+        return self.ids(self.no_deadline_mask())
@@ -0,0 +1,125 @@
+"""
+Классификация задач по срокам с кэшированием до смены дня
+"""
+from datetime import date
+from typing import Dict, Optional, Set
+
+from models.task import Task, TaskStatus
+from indexes.column_store import TaskColumns
+
+OVERDUE = 'overdue'
+DUE_SOON = 'due_soon'
+ON_TRACK = 'on_track'
+NO_DEADLINE = 'no_deadline'
+BUCKETS = (OVERDUE, DUE_SOON, ON_TRACK, NO_DEADLINE)
+
+# Сколько классификаций на другие даты (не текущую) хранится в кэше
+OTHER_DATES_LIMIT = 4
+
+
+def deadline_bucket(task: Task, today: date) -> str:
+    """Корзина одной задачи; совпадает с Task.is_overdue и Task.is_due_soon"""
+    if not task.due_date:
+        return NO_DEADLINE
+    if task.status != TaskStatus.COMPLETED:
+        days_until_due = (task.due_date - today).days
+        if days_until_due < 0:
+            return OVERDUE
+        if days_until_due <= 2:
+            return DUE_SOON
+    return ON_TRACK
+
+
+class DeadlineBuckets:
+    """id задач по корзинам: просрочена, скоро срок, в срок, без срока
+
+    Полная классификация - один проход масок по колонкам с одной датой.
+    Результат кэшируется до смены дня; изменения задач переносят между
+    корзинами только саму задачу (update/discard из хуков контроллера).
+    Текущая дата сдвигается только вперед; корзины на другие даты
+    (явный today) кэшируются отдельно до следующего изменения задач,
+    поэтому чередование явной даты и сегодняшней не перестраивает
+    основные корзины.
+    """
+
+    def __init__(self, columns: TaskColumns):
+        self.columns = columns
+        self.today: Optional[date] = None
+        self.buckets: Dict[str, Set[int]] = {bucket: set() for bucket in BUCKETS}
+        self._bucket_by_id: Dict[int, str] = {}
+        # Корзины на даты, отличные от текущей
+        self._other: Dict[date, Dict[str, Set[int]]] = {}
+        self.rebuilds = 0
+
+    def classify(self, today: Optional[date] = None) -> Dict[str, Set[int]]:
+        """Корзины на дату (по умолчанию - сегодня); не изменять результат"""
+        if today is None:
+            today = date.today()
+            if self.today is None or today > self.today:
+                self._rebuild(today)
+        elif self.today is None:
+            self._rebuild(today)
+        if today == self.today:
+            return self.buckets
+
+        buckets = self._other.get(today)
+        if buckets is None:
+            if len(self._other) >= OTHER_DATES_LIMIT:
+                self._other.clear()
+            buckets = self._other[today] = self._classify(today)
+        return buckets
+
+    def bucket_of(self, task_id: int, today: Optional[date] = None) -> Optional[str]:
+        """Корзина задачи или None, если задачи нет"""
+        buckets = self.classify(today)
+        if buckets is self.buckets:
+            return self._bucket_by_id.get(task_id)
+        return next((bucket for bucket, task_ids in buckets.items() if task_id in task_ids), None)
+
+    def update(self, task: Task) -> None:
+        """Перенос новой или измененной задачи в ее корзину"""
+        if self.today is None:
+            return
+        self.discard(task.id)
+        bucket = deadline_bucket(task, self.today)
+        self.buckets[bucket].add(task.id)
+        self._bucket_by_id[task.id] = bucket
+
+    def discard(self, task_id: int) -> None:
+        self._other.clear()
+        bucket = self._bucket_by_id.pop(task_id, None)
+        if bucket is not None:
+            self.buckets[bucket].discard(task_id)
+
+    def invalidate(self) -> None:
+        """Сброс кэша (после полной перезагрузки задач)"""
+        self.today = None
+        self._other.clear()
+
+    def _rebuild(self, today: date) -> None:
+        """Основные корзины на новую текущую дату"""
+        self.buckets = self._classify(today)
+        self._bucket_by_id = {
+            task_id: bucket for bucket, task_ids in self.buckets.items() for task_id in task_ids
+        }
+        self.today = today
+        self._other.pop(today, None)
+
+    def _classify(self, today: date) -> Dict[str, Set[int]]:
+        """Классификация всех задач на дату проходом по колонкам"""
+        columns = self.columns
+        overdue = set(columns.overdue_ids(today))
+        due_soon = set(columns.due_soon_ids(today))
+        no_deadline = set(columns.no_deadline_ids())
+        on_track = set(columns.ids(columns.live_mask()))
+        on_track -= overdue
+        on_track -= due_soon
+        on_track -= no_deadline
+
+        self.rebuilds += 1
+        return {
+            OVERDUE: overdue,
+            DUE_SOON: due_soon,
+            ON_TRACK: on_track,
+            NO_DEADLINE: no_deadline,
+        }
@@ -0,0 +1,219 @@
+"""
+Живое представление отфильтрованных и отсортированных задач
+"""
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from models.task import Task
+from indexes.sorted_list import SortedList
+from indexes.sort_keys import sort_key
+from indexes.search_index import matches_query
+
+# Больше len / BULK_DISCARD_DIVISOR удалений за раз - один проход по
+# записям вместо поиска и удаления каждой
+BULK_DISCARD_DIVISOR = 16
+
+
+def matches_filters(task: Task, filters: Dict[str, Any]) -> bool:
+    """Удовлетворяет ли задача фильтрам TaskController.apply_filters
+
+    Ключ query - строка поиска по названию и описанию.
+    """
+    if filters.get('status') and task.status.value != filters['status'].value:
+        return False
+    if filters.get('category') and task.category != filters['category']:
+        return False
+    if filters.get('priority') and task.priority != filters['priority']:
+        return False
+    if filters.get('query') and not matches_query(task, filters['query']):
+        return False
+    return True
+
+
+class LiveView:
+    """Результат фильтрации в текущем порядке сортировки
+
+    Изменение одной задачи обрабатывается точечно: ее запись удаляется
+    из отсортированного списка и, если задача по-прежнему подходит под
+    фильтры, вставляется на новое место - без пересчета остальных строк.
+    """
+
+    def __init__(self, resolve: Callable[[int], Optional[Task]]):
+        self.resolve = resolve
+        self.filters: Dict[str, Any] = {}
+        self.criteria: Optional[str] = None
+        self.reverse = False
+        self._entries = SortedList()
+        self._entry_by_id: Dict[int, Tuple[Any, int]] = {}
+
+    def matches(self, task: Task) -> bool:
+        """Подходит ли задача под фильтры представления"""
+        return matches_filters(task, self.filters)
+
+    def rebuild(self, tasks: Iterable[Task], filters: Optional[Dict[str, Any]] = None) -> None:
+        """Заполнение представления уже отфильтрованными задачами"""
+        if filters is not None:
+            self.filters = filters
+        self._entry_by_id = {task.id: self._entry(task) for task in tasks}
+        self._entries = SortedList(self._entry_by_id.values())
+
+    def difference(self, wanted: Set[int], narrowing: bool = False) -> Tuple[List[int], List[int]]:
+        """(id, которые нужно убрать, id, которые нужно добавить) до множества wanted
+
+        narrowing - wanted заведомо часть представления, добавлять нечего.
+        """
+        shown = self._entry_by_id.keys()
+        # Разности множеств считаются на уровне C; порядок не важен - added
+        # вставляются по ключу сортировки
+        return list(shown - wanted), [] if narrowing else list(wanted - shown)
+
+    def patch(self, filters: Dict[str, Any], removed: Iterable[int], added: Iterable[Task]) -> None:
+        """Смена фильтров с точечным удалением и вставкой задач
+
+        Для небольших отличий от текущего содержимого (например, при
+        уточнении строки поиска); задачи added уже подходят под filters.
+        """
+        self.filters = filters
+        removed = list(removed)
+        if len(removed) * BULK_DISCARD_DIVISOR > len(self._entries):
+            entry_by_id = self._entry_by_id
+            for task_id in removed:
+                entry_by_id.pop(task_id, None)
+            # Записи остаются отсортированными - сортировка не нужна
+            self._entries = SortedList(
+                [entry for entry in self._entries if entry[1] in entry_by_id], presorted=True
+            )
+        else:
+            for task_id in removed:
+                self.discard(task_id)
+        for task in added:
+            entry = self._entry(task)
+            self._entry_by_id[task.id] = entry
+            self._entries.add(entry)
+
+    def set_sort(
+        self,
+        criteria: Optional[str],
+        reverse: bool = False,
+        ordered: Optional[Iterable[Tuple[Any, int]]] = None
+    ) -> None:
+        """Смена порядка сортировки (None - порядок добавления)
+
+        Обратный порядок - зеркало прямого, поэтому смена только направления
+        не перестраивает представление. ordered - записи (ключ, id) задач
+        представления по возрастанию (например, обход упорядоченного индекса);
+        с ними представление строится без сортировки.
+        """
+        same_order = criteria == self.criteria
+        self.criteria = criteria
+        self.reverse = reverse if criteria is not None else False
+        if same_order:
+            return
+        if ordered is None or criteria is None:
+            self.rebuild([self.resolve(task_id) for task_id in self._entry_by_id])
+            return
+
+        entries = list(ordered)
+        self._entry_by_id = {task_id: (key, task_id) for key, task_id in entries}
+        self._entries = SortedList(entries, presorted=True)
+
+    def offer(self, task: Task) -> bool:
+        """Вставка новой или измененной задачи, если она подходит под фильтры"""
+        if task.id in self._entry_by_id or not self.matches(task):
+            return False
+        entry = self._entry(task)
+        self._entry_by_id[task.id] = entry
+        self._entries.add(entry)
+        return True
+
+    def discard(self, task_id: int) -> bool:
+        """Удаление задачи из представления"""
+        entry = self._entry_by_id.pop(task_id, None)
+        if entry is None:
+            return False
+        self._entries.remove(entry)
+        return True
+
+    def has_id(self, task_id: int) -> bool:
+        return task_id in self._entry_by_id
+
+    def get(self, task_id: int) -> Optional[Task]:
+        return self.resolve(task_id) if task_id in self._entry_by_id else None
+
+    def index_of(self, task_id: int) -> int:
+        """Позиция задачи в представлении; ValueError если ее нет"""
+        entry = self._entry_by_id.get(task_id)
+        if entry is None:
+            raise ValueError(f"Task {task_id} is not in view")
+        position = self._entries.index(entry)
+        return len(self._entries) - 1 - position if self.reverse else position
+
+    def ids(self) -> List[int]:
+        """id задач в порядке отображения"""
+        return list(map(itemgetter(1), self._ordered_entries()))
+
+    def copy(self) -> List[Task]:
+        """Снимок представления в виде списка"""
+        return list(self)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[Task]:
+        resolve = self.resolve
+        return (resolve(task_id) for _, task_id in self._ordered_entries())
+
+    def __contains__(self, task: object) -> bool:
+        return isinstance(task, Task) and self.get(task.id) is task
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return self._slice(index)
+        if index < 0:
+            index += len(self._entries)
+        if not 0 <= index < len(self._entries):
+            raise IndexError("view index out of range")
+        if self.reverse:
+            index = len(self._entries) - 1 - index
+        return self.resolve(self._entries[index][1])
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, LiveView)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"LiveView({self.ids()!r})"
+
+    def _entry(self, task: Task) -> Tuple[Any, int]:
+        """Запись (ключ, id) для отсортированного списка
+
+        Без сортировки задачи идут в порядке id (порядке добавления);
+        при равных ключах порядок добавления тоже сохраняется.
+        """
+        if self.criteria is None:
+            return (0, task.id)
+        return (sort_key(self.criteria)(task), task.id)
+
+    def _slice(self, index: slice) -> List[Task]:
+        """Срез в порядке отображения без обхода предшествующих строк
+
+        Окно виртуальной прокрутки стоит одинаково в начале и в конце
+        представления любого размера.
+        """
+        start, stop, step = index.indices(len(self))
+        if step != 1:
+            return [self[i] for i in range(start, stop, step)]
+        if self.reverse:
+            total = len(self._entries)
+            entries = self._entries[total - stop:total - start][::-1]
+        else:
+            entries = self._entries[start:stop]
+        resolve = self.resolve
+        return [resolve(task_id) for _, task_id in entries]
+
+    def _ordered_entries(self) -> Iterator[Tuple[Any, int]]:
+        """Записи в порядке отображения"""
+        if self.reverse:
+            return reversed(self._entries)
+        return iter(self._entries)
@@ -0,0 +1,93 @@
+"""
+Упорядоченные индексы для сортировки задач без полной пересортировки
+"""
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from models.task import Task
+from indexes.sorted_list import SortedList
+from indexes.sort_keys import SORT_KEYS, sort_key
+
+Entry = Tuple[Any, int]
+
+
+class OrderIndex:
+    """Все задачи, упорядоченные по ключу одного критерия сортировки
+
+    Записи (ключ, id) хранятся по возрастанию; при равных ключах задачи
+    идут в порядке добавления. Обратный порядок - обход с конца.
+    """
+
+    def __init__(self, criteria: str):
+        self.criteria = criteria
+        self.key = sort_key(criteria)
+        self._entries = SortedList()
+        # Запись хранится отдельно: ключ изменившейся задачи уже другой
+        self._entry_by_id: Dict[int, Entry] = {}
+
+    def add(self, task: Task) -> None:
+        entry = (self.key(task), task.id)
+        self._entry_by_id[task.id] = entry
+        self._entries.add(entry)
+
+    def remove(self, task: Task) -> None:
+        entry = self._entry_by_id.pop(task.id, None)
+        if entry is not None:
+            self._entries.remove(entry)
+
+    def rebuild(self, tasks: Iterable[Task]) -> None:
+        """Построение индекса заново"""
+        key = self.key
+        self._entry_by_id = {task.id: (key(task), task.id) for task in tasks}
+        self._entries = SortedList(self._entry_by_id.values())
+
+    def entries(
+        self,
+        member: Optional[Callable[[int], bool]] = None,
+        reverse: bool = False
+    ) -> Iterator[Entry]:
+        """Обход записей в порядке отображения, при необходимости с отбором по id"""
+        ordered = reversed(self._entries) if reverse else iter(self._entries)
+        if member is None:
+            return ordered
+        return (entry for entry in ordered if member(entry[1]))
+
+    def ids(self, member: Optional[Callable[[int], bool]] = None, reverse: bool = False) -> List[int]:
+        """id задач в порядке отображения"""
+        return [task_id for _, task_id in self.entries(member, reverse)]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class OrderIndexes:
+    """Упорядоченные индексы по всем критериям сортировки
+
+    Индекс критерия строится при первой сортировке по нему, поэтому при
+    запуске ключи (и ленивые поля задач, например даты) не вычисляются.
+    """
+
+    def __init__(self, source: Callable[[], Iterable[Task]], criteria: Iterable[str] = SORT_KEYS):
+        self.source = source
+        self.criteria = tuple(criteria)
+        self.indexes: Dict[str, OrderIndex] = {}
+
+    def add(self, task: Task) -> None:
+        for index in self.indexes.values():
+            index.add(task)
+
+    def remove(self, task: Task) -> None:
+        for index in self.indexes.values():
+            index.remove(task)
+
+    def rebuild(self) -> None:
+        """Сброс построенных индексов (построятся заново при обращении)"""
+        self.indexes = {}
+
+    def get(self, criteria: Optional[str]) -> OrderIndex:
+        """Индекс критерия (неизвестные критерии - по дате создания)"""
+        name = criteria if criteria in self.criteria else 'creation_date'
+        index = self.indexes.get(name)
+        if index is None:
+            index = self.indexes[name] = OrderIndex(name)
+            index.rebuild(self.source())
+        return index
@@ -0,0 +1,245 @@
+"""
+Полнотекстовый индекс по названиям и описаниям задач
+"""
+import heapq
+import math
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from models.task import Task
+from indexes.sorted_list import SortedList
+
+TOKEN_RE = re.compile(r'\w+')
+
+# Вхождение в название весит больше, чем в описание
+TITLE_WEIGHT = 3
+DESCRIPTION_WEIGHT = 1
+# Термин, найденный только по префиксу, весит меньше точного совпадения
+PREFIX_FACTOR = 0.5
+# Более короткие термины запроса ищутся только точно (последний - отбрасывается, см. query_terms)
+MIN_PREFIX = 2
+
+# Окончания русских слов, отбрасываемые при стемминге (длинные проверяются первыми)
+SUFFIXES = sorted((
+    'иями', 'ями', 'ами', 'иях', 'ях', 'ах', 'ией', 'ием', 'ого', 'его', 'ому', 'ему',
+    'ыми', 'ими', 'ться', 'тся', 'ить', 'ать', 'ять', 'еть', 'ует', 'ют', 'ут', 'ет',
+    'ит', 'ешь', 'ишь', 'ая', 'яя', 'ое', 'ее', 'ые', 'ие', 'ой', 'ей', 'ий', 'ый',
+    'ом', 'ем', 'ам', 'ям', 'ую', 'юю', 'ов', 'ев', 'ия', 'ья', 'ью', 'ла', 'ло',
+    'ли', 'а', 'я', 'о', 'е', 'ы', 'и', 'у', 'ю', 'ь', 'й',
+), key=len, reverse=True)
+# Основа после отбрасывания окончания не короче
+MIN_STEM = 3
+
+
+def normalize(text: str) -> str:
+    """Приведение к нижнему регистру без различия е/ё"""
+    return text.casefold().replace('ё', 'е')
+
+
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    """Основа слова: русское окончание отбрасывается, прочие слова не меняются"""
+    if not 'а' <= word[-1] <= 'я':
+        return word
+    for suffix in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM:
+            return word[:-len(suffix)]
+    return word
+
+
+def terms(text: str) -> List[str]:
+    """Основы слов текста по порядку"""
+    return [stem(token) for token in TOKEN_RE.findall(normalize(text))]
+
+
+def task_terms(task: Task) -> Dict[str, int]:
+    """Термины задачи с весами по полям"""
+    weights: Dict[str, int] = {}
+    for term in terms(task.title):
+        weights[term] = weights.get(term, 0) + TITLE_WEIGHT
+    if task.description:
+        for term in terms(task.description):
+            weights[term] = weights.get(term, 0) + DESCRIPTION_WEIGHT
+    return weights
+
+
+def query_terms(query: str) -> List[Tuple[str, bool]]:
+    """Различные термины запроса -> (термин, искать ли по началу слова)
+
+    Термины короче MIN_PREFIX ищутся точно, а последний такой термин
+    отбрасывается: это слово пользователь, скорее всего, еще набирает,
+    и по одной букве оно почти ничего не отсекает.
+    """
+    words = list(dict.fromkeys(terms(query)))
+    if words and len(words[-1]) < MIN_PREFIX:
+        words.pop()
+    return [(word, len(word) >= MIN_PREFIX) for word in words]
+
+
+def has_terms(query: Optional[str]) -> bool:
+    """Есть ли в запросе слова для поиска
+
+    Запрос без слов (например, "?" или одна набираемая буква) -
+    отсутствие запроса.
+    """
+    return bool(query) and bool(query_terms(query))
+
+
+def narrows(query: Optional[str], previous: Optional[str]) -> bool:
+    """Может ли результат запроса query быть только частью результата previous
+
+    Так при наборе: слово дописывается или добавляется новое. Каждый
+    термин previous должен следовать из какого-то термина query.
+    """
+    new = query_terms(query) if query else []
+    old = query_terms(previous) if previous else []
+    return all(
+        any(
+            term == old_term and (prefix <= old_prefix)
+            or old_prefix and term.startswith(old_term)
+            for term, prefix in new
+        )
+        for old_term, old_prefix in old
+    )
+
+
+def matches_query(task: Task, query: str) -> bool:
+    """Содержит ли задача все слова запроса (по тем же правилам, что и SearchIndex)
+
+    Запросу без слов соответствует любая задача.
+    """
+    if not has_terms(query):
+        return True
+    words = task_terms(task)
+    for query_term, prefix in query_terms(query):
+        if not prefix:
+            if query_term not in words:
+                return False
+        elif not any(word.startswith(query_term) for word in words):
+            return False
+    return True
+
+
+class SearchIndex:
+    """Инвертированный индекс: термин -> {id задачи: вес}
+
+    Словарь терминов хранится отсортированным, поэтому термины запроса
+    сопоставляются и по префиксу ("зад" найдет "задача"). Как и другие
+    индексы, обновляется точечно: remove() до изменения задачи, add() после.
+    """
+
+    def __init__(self, tasks: Iterable[Task] = ()):
+        self.postings: Dict[str, Dict[int, int]] = {}
+        # id всех задач индекса, в том числе без единого слова
+        self.ids: Set[int] = set()
+        for task in tasks:
+            for term, weight in task_terms(task).items():
+                posting = self.postings.get(term)
+                if posting is None:
+                    posting = self.postings[term] = {}
+                posting[task.id] = weight
+            self.ids.add(task.id)
+        self._vocabulary = SortedList(self.postings)
+
+    def add(self, task: Task) -> None:
+        """Добавление задачи по текущим названию и описанию"""
+        for term, weight in task_terms(task).items():
+            posting = self.postings.get(term)
+            if posting is None:
+                posting = self.postings[term] = {}
+                self._vocabulary.add(term)
+            posting[task.id] = weight
+        self.ids.add(task.id)
+
+    def remove(self, task: Task) -> None:
+        """Удаление задачи по текущим названию и описанию"""
+        for term in task_terms(task):
+            posting = self.postings.get(term)
+            if posting is None or posting.pop(task.id, None) is None:
+                continue
+            if not posting:
+                del self.postings[term]
+                self._vocabulary.remove(term)
+        self.ids.discard(task.id)
+
+    @property
+    def count(self) -> int:
+        return len(self.ids)
+
+    def search(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        allowed: Optional[Set[int]] = None
+    ) -> List[Tuple[int, float]]:
+        """(id, релевантность) задач, содержащих все слова запроса, по убыванию релевантности
+
+        allowed - id задач, среди которых ищется результат (например, по фильтрам).
+        """
+        scores: Optional[Dict[int, float]] = None
+        for query_term, prefix in query_terms(query):
+            term_scores = self._match(query_term, prefix)
+            if scores is None:
+                scores = term_scores
+                if allowed is not None:
+                    scores = {task_id: score for task_id, score in scores.items() if task_id in allowed}
+            else:
+                scores = {
+                    task_id: score + term_scores[task_id]
+                    for task_id, score in scores.items() if task_id in term_scores
+                }
+            if not scores:
+                return []
+
+        if not scores:
+            return []
+        order = lambda item: (-item[1], item[0])
+        if limit is not None and limit < len(scores):
+            return heapq.nsmallest(limit, scores.items(), key=order)
+        return sorted(scores.items(), key=order)
+
+    def matching_ids(self, query: str, allowed: Optional[Set[int]] = None) -> Set[int]:
+        """id задач, содержащих все слова запроса, без подсчета релевантности
+
+        Для фильтрации, где порядок задает сортировка представления.
+        Запросу без слов, как и в matches_query, соответствуют все задачи.
+        """
+        if not has_terms(query):
+            return set(self.ids if allowed is None else allowed)
+        result: Optional[Set[int]] = None
+        for query_term, prefix in query_terms(query):
+            ids: Set[int] = set()
+            for term in self._matched_terms(query_term, prefix):
+                ids.update(self.postings[term])
+            if result is None:
+                result = ids if allowed is None else ids & allowed
+            else:
+                result &= ids
+            if not result:
+                return set()
+        return result or set()
+
+    def _matched_terms(self, query_term: str, prefix: bool) -> List[str]:
+        """Термины словаря для термина запроса (точно или по префиксу)"""
+        if not prefix:
+            return [query_term] if query_term in self.postings else []
+        matched = []
+        for term in self._vocabulary.irange(query_term):
+            if not term.startswith(query_term):
+                break
+            matched.append(term)
+        return matched
+
+    def _match(self, query_term: str, prefix: bool) -> Dict[int, float]:
+        """Оценки задач по одному термину запроса (точно или по префиксу)"""
+        scores: Dict[int, float] = {}
+        for term in self._matched_terms(query_term, prefix):
+            posting = self.postings[term]
+            factor = 1.0 if term == query_term else PREFIX_FACTOR
+            weight = math.log(1 + self.count / len(posting)) * factor
+            for task_id, count in posting.items():
+                score = count * weight
+                if score > scores.get(task_id, 0.0):
+                    scores[task_id] = score
+        return scores
@@ -0,0 +1,88 @@
+"""
+Вторичные (инвертированные) индексы для фильтрации задач
+"""
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from models.task import Task
+
+# Поля, по которым TaskController.apply_filters фильтрует задачи
+INDEXED_FIELDS = ('status', 'category', 'priority')
+
+
+class FieldIndex:
+    """Значение поля -> множество id задач с этим значением"""
+
+    def __init__(self, field: str):
+        self.field = field
+        self.buckets: Dict[Any, Set[int]] = {}
+
+    def add(self, task: Task) -> None:
+        """Добавление задачи по текущему значению поля"""
+        value = getattr(task, self.field)
+        bucket = self.buckets.get(value)
+        if bucket is None:
+            bucket = self.buckets[value] = set()
+        bucket.add(task.id)
+
+    def remove(self, task: Task) -> None:
+        """Удаление задачи по текущему значению поля"""
+        value = getattr(task, self.field)
+        bucket = self.buckets.get(value)
+        if bucket is not None:
+            bucket.discard(task.id)
+            if not bucket:
+                del self.buckets[value]
+
+    def lookup(self, value: Any) -> Set[int]:
+        """id задач с заданным значением (не изменять результат)"""
+        return self.buckets.get(value, set())
+
+
+class SecondaryIndexes:
+    """Набор индексов по полям фильтрации"""
+
+    def __init__(self, fields: Iterable[str] = INDEXED_FIELDS):
+        self.fields = {field: FieldIndex(field) for field in fields}
+
+    def add(self, task: Task) -> None:
+        for index in self.fields.values():
+            index.add(task)
+
+    def remove(self, task: Task) -> None:
+        for index in self.fields.values():
+            index.remove(task)
+
+    def rebuild(self, tasks: Iterable[Task]) -> None:
+        """Построение индексов заново (по одному проходу на поле)"""
+        tasks = list(tasks)
+        for field in self.fields:
+            index = self.fields[field] = FieldIndex(field)
+            buckets = index.buckets
+            for task in tasks:
+                value = getattr(task, field)
+                bucket = buckets.get(value)
+                if bucket is None:
+                    bucket = buckets[value] = set()
+                bucket.add(task.id)
+
+    def query(self, filters: Dict[str, Any]) -> Optional[Set[int]]:
+        """id задач, удовлетворяющих фильтрам; None - если фильтров нет
+
+        Множества пересекаются начиная с самого маленького, поэтому
+        стоимость определяется размером результата, а не числом задач.
+        """
+        candidates: List[Set[int]] = [
+            index.lookup(filters[field])
+            for field, index in self.fields.items()
+            if filters.get(field)
+        ]
+        if not candidates:
+            return None
+
+        candidates.sort(key=len)
+        result = set(candidates[0])
+        for candidate in candidates[1:]:
+            if not result:
+                break
+            result.intersection_update(candidate)
+        return result
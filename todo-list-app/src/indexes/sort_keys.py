@@ -0,0 +1,25 @@
+"""
+Ключи сортировки задач
+"""
+from datetime import date
+from typing import Any, Callable, Dict, Optional
+
+from models.task import Task, TaskStatus
+
+PRIORITY_RANKS = {'Высокий': 3, 'Средний': 2, 'Низкий': 1}
+# Статусы сортируются в порядке жизненного цикла задачи
+STATUS_RANKS = {status: rank for rank, status in enumerate(TaskStatus)}
+
+SORT_KEYS: Dict[str, Callable[[Task], Any]] = {
+    'due_date': lambda t: t.due_date or date.max,
+    'priority': lambda t: PRIORITY_RANKS.get(t.priority, 2),
+    'creation_date': lambda t: t.creation_date,
+    'title': lambda t: t.title.lower(),
+    'category': lambda t: t.category or '',
+    'status': lambda t: STATUS_RANKS[t.status],
+}
+
+
+def sort_key(criteria: Optional[str]) -> Callable[[Task], Any]:
+    """Функция ключа для критерия (неизвестные критерии - по дате создания)"""
+    return SORT_KEYS.get(criteria, SORT_KEYS['creation_date'])
@@ -0,0 +1,146 @@
+"""
+Отсортированный список с быстрой вставкой и удалением
+"""
+from bisect import bisect_left, bisect_right, insort
+from itertools import chain, islice
+from typing import Any, Iterable, Iterator, List, Optional, Union
+
+
+class SortedList:
+    """Отсортированная последовательность, разбитая на корзины
+
+    Поиск корзины - бинарный по максимумам корзин, вставка и удаление
+    сдвигают элементы только внутри одной корзины (не более 2 * LOAD),
+    поэтому операции остаются быстрыми и на сотнях тысяч элементов.
+    """
+
+    LOAD = 512
+
+    def __init__(self, values: Iterable[Any] = (), presorted: bool = False):
+        items = list(values)
+        if not presorted:
+            items.sort()
+        self._lists: List[List[Any]] = [
+            items[start:start + self.LOAD] for start in range(0, len(items), self.LOAD)
+        ]
+        self._maxes: List[Any] = [bucket[-1] for bucket in self._lists]
+        self._len = len(items)
+        # Смещения начала корзин для доступа по позиции (строятся лениво)
+        self._offsets: Optional[List[int]] = None
+
+    def add(self, value: Any) -> None:
+        """Вставка с сохранением порядка"""
+        if not self._lists:
+            self._lists.append([value])
+            self._maxes.append(value)
+        else:
+            position = bisect_right(self._maxes, value)
+            if position == len(self._maxes):
+                position -= 1
+                self._lists[position].append(value)
+                self._maxes[position] = value
+            else:
+                insort(self._lists[position], value)
+            self._split(position)
+        self._len += 1
+        self._offsets = None
+
+    def remove(self, value: Any) -> None:
+        """Удаление значения; ValueError если его нет"""
+        position = bisect_left(self._maxes, value)
+        if position == len(self._maxes):
+            raise ValueError(f"{value!r} not in list")
+        bucket = self._lists[position]
+        index = bisect_left(bucket, value)
+        if index == len(bucket) or bucket[index] != value:
+            raise ValueError(f"{value!r} not in list")
+
+        del bucket[index]
+        if bucket:
+            self._maxes[position] = bucket[-1]
+        else:
+            del self._lists[position]
+            del self._maxes[position]
+        self._len -= 1
+        self._offsets = None
+
+    def index(self, value: Any) -> int:
+        """Позиция значения; ValueError если его нет"""
+        position = bisect_left(self._maxes, value)
+        if position == len(self._maxes):
+            raise ValueError(f"{value!r} not in list")
+        bucket = self._lists[position]
+        index = bisect_left(bucket, value)
+        if index == len(bucket) or bucket[index] != value:
+            raise ValueError(f"{value!r} not in list")
+        return self._bucket_offsets()[position] + index
+
+    def irange(self, start: Any) -> Iterator[Any]:
+        """Значения >= start по возрастанию"""
+        position = bisect_left(self._maxes, start)
+        if position == len(self._maxes):
+            return iter(())
+        first = self._lists[position]
+        head = islice(first, bisect_left(first, start), None)
+        return chain(head, chain.from_iterable(self._lists[position + 1:]))
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[Any]:
+        return chain.from_iterable(self._lists)
+
+    def __reversed__(self) -> Iterator[Any]:
+        return chain.from_iterable(reversed(bucket) for bucket in reversed(self._lists))
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return self._slice(index)
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("SortedList index out of range")
+        offsets = self._bucket_offsets()
+        position = bisect_right(offsets, index) - 1
+        return self._lists[position][index - offsets[position]]
+
+    def _slice(self, index: slice) -> List[Any]:
+        """Срез по позициям: копируются только затронутые корзины"""
+        start, stop, step = index.indices(self._len)
+        if step != 1:
+            return [self[i] for i in range(start, stop, step)]
+        if start >= stop:
+            return []
+        offsets = self._bucket_offsets()
+        position = bisect_right(offsets, start) - 1
+        start -= offsets[position]
+        result: List[Any] = []
+        remaining = stop - offsets[position] - start
+        while remaining > 0:
+            chunk = self._lists[position][start:start + remaining]
+            result.extend(chunk)
+            remaining -= len(chunk)
+            position += 1
+            start = 0
+        return result
+
+    def _split(self, position: int) -> None:
+        """Разделение переполненной корзины пополам"""
+        bucket = self._lists[position]
+        if len(bucket) > 2 * self.LOAD:
+            half = bucket[self.LOAD:]
+            del bucket[self.LOAD:]
+            self._lists.insert(position + 1, half)
+            self._maxes[position] = bucket[-1]
+            self._maxes.insert(position + 1, half[-1])
+
+    def _bucket_offsets(self) -> List[int]:
+        """Смещение первого элемента каждой корзины"""
+        if self._offsets is None:
+            offsets = []
+            total = 0
+            for bucket in self._lists:
+                offsets.append(total)
+                total += len(bucket)
+            self._offsets = offsets
+        return self._offsets
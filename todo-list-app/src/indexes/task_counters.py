@@ -0,0 +1,65 @@
+"""
+Счетчики задач для статистики
+"""
+from collections import Counter
+from operator import attrgetter
+from typing import Any, Dict, Iterable, Optional
+
+from models.task import Task, TaskStatus
+from models.codes import CATEGORY_CODES, PRIORITY_CODES
+
+
+class TaskCounters:
+    """Количество задач всего и по статусу, приоритету и категории
+
+    Строится одним проходом при загрузке, дальше поддерживается хуками
+    контроллера: remove() до изменения задачи, add() после. Чтение любого
+    счетчика - O(1). Приоритет и категория считаются по кодам задачи и
+    переводятся в строки только в snapshot(); статус - по строковому
+    значению, хэш которого (в отличие от Enum) считается в C.
+    """
+
+    def __init__(self, tasks: Iterable[Task] = ()):
+        tasks = list(tasks)
+        self.total = len(tasks)
+        self._statuses: Counter = Counter(task.status.value for task in tasks)
+        self._priorities: Counter = Counter(map(attrgetter('priority_code'), tasks))
+        self._categories: Counter = Counter(map(attrgetter('category_code'), tasks))
+
+    def add(self, task: Task) -> None:
+        """Учет задачи по текущим значениям полей"""
+        self.total += 1
+        self._statuses[task.status.value] += 1
+        self._priorities[task.priority_code] += 1
+        self._categories[task.category_code] += 1
+
+    def remove(self, task: Task) -> None:
+        """Снятие задачи с учета по текущим значениям полей"""
+        self.total -= 1
+        self._statuses[task.status.value] -= 1
+        self._priorities[task.priority_code] -= 1
+        self._categories[task.category_code] -= 1
+
+    def count_status(self, status: TaskStatus) -> int:
+        return self._statuses[status.value]
+
+    def count_priority(self, priority: str) -> int:
+        return self._priorities[PRIORITY_CODES.code(priority)]
+
+    def count_category(self, category: Optional[str]) -> int:
+        return self._categories[CATEGORY_CODES.code(category)]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Копия счетчиков (без нулевых значений)"""
+        return {
+            'total': self.total,
+            'by_status': {
+                status: self._statuses[status.value] for status in TaskStatus if self._statuses[status.value]
+            },
+            'by_priority': {
+                PRIORITY_CODES.value(code): count for code, count in self._priorities.items() if count
+            },
+            'by_category': {
+                CATEGORY_CODES.value(code): count for code, count in self._categories.items() if count
+            },
+        }
@@ -0,0 +1,88 @@
+"""
+Упорядоченная коллекция задач с индексом по id
+"""
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+from models.task import Task
+
+
+class TaskList:
+    """Список задач в порядке добавления с поиском и удалением по id за O(1)
+
+    Поддерживает len(), итерацию, индексацию и срезы, как обычный список,
+    поэтому может возвращаться из методов контроллера вместо list.
+    """
+
+    def __init__(self, tasks: Iterable[Task] = ()):
+        self._by_id: Dict[int, Task] = {task.id: task for task in tasks}
+        # Кэш позиционного доступа, сбрасывается при изменениях
+        self._items: Optional[List[Task]] = None
+
+    def get(self, task_id: int) -> Optional[Task]:
+        """Задача по id или None"""
+        return self._by_id.get(task_id)
+
+    def has_id(self, task_id: int) -> bool:
+        """Есть ли задача с таким id"""
+        return task_id in self._by_id
+
+    def add(self, task: Task) -> None:
+        """Добавление (или замена) задачи; новые задачи попадают в конец"""
+        self._by_id[task.id] = task
+        self._items = None
+
+    def remove(self, task_id: int) -> Optional[Task]:
+        """Удаление задачи по id за O(1)"""
+        task = self._by_id.pop(task_id, None)
+        if task is not None:
+            self._items = None
+        return task
+
+    def clear(self) -> None:
+        """Удаление всех задач"""
+        self._by_id.clear()
+        self._items = None
+
+    def ids(self) -> List[int]:
+        """Идентификаторы задач по порядку"""
+        return list(self._by_id)
+
+    def copy(self) -> List[Task]:
+        """Снимок задач в виде обычного списка"""
+        return list(self._by_id.values())
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator[Task]:
+        return iter(self._by_id.values())
+
+    def __reversed__(self) -> Iterator[Task]:
+        return reversed(self._by_id.values())
+
+    def __contains__(self, task: object) -> bool:
+        return isinstance(task, Task) and self._by_id.get(task.id) is task
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            if index.step is None and (index.start or 0) >= 0 and (index.stop is None or index.stop >= 0):
+                return list(islice(self._by_id.values(), index.start, index.stop))
+            return self._positional()[index]
+        return self._positional()[index]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, TaskList):
+            return list(self._by_id.values()) == list(other._by_id.values())
+        if isinstance(other, list):
+            return list(self._by_id.values()) == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"TaskList({list(self._by_id.values())!r})"
+
+    def _positional(self) -> List[Task]:
+        """Список для доступа по позиции (строится лениво)"""
+        if self._items is None:
+            self._items = list(self._by_id.values())
+        return self._items
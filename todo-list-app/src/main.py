@@ -36,7 +36,7 @@ def main():
 
     try:
         # Создание контроллера
-        task_controller = TaskController()
+        task_controller = TaskController(write_behind=True, lazy_load=True)
 
         # Создание главного окна
         root = tk.Tk()
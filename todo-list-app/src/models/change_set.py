@@ -0,0 +1,83 @@
+"""
+Набор изменений задач с момента последнего сохранения
+"""
+from typing import Dict, FrozenSet, Optional, Set
+
+from models.task import Task
+
+
+class ChangeSet(Dict[int, Optional[Task]]):
+    """Изменения задач: id -> задача (None - задача удалена)
+
+    Сам набор - словарь в том виде, в котором его принимают хранилища
+    (TaskStorage.stage/save). Дополнительно помнит, какие задачи созданы
+    и какие поля изменены, - для синхронизации, отмены и обновления
+    интерфейса. Поля запоминаются и у созданных задач: после записи с
+    задачи снимаются пометки только этих полей (см. Task.mark_clean).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.created: Set[int] = set()
+        self.fields: Dict[int, Set[str]] = {}
+
+    def add_created(self, task: Task) -> None:
+        """Новая задача"""
+        self[task.id] = task
+        self.created.add(task.id)
+
+    def add_updated(self, task: Task) -> None:
+        """Измененная задача; поля берутся из task.dirty_fields"""
+        self[task.id] = task
+        if task.dirty_fields:
+            self.fields.setdefault(task.id, set()).update(task.dirty_fields)
+
+    def add_deleted(self, task_id: int) -> None:
+        """Удаленная задача
+
+        Даже задача, созданная в этом же наборе, остается в нем с None:
+        хранилище уже могло получить ее через stage().
+        """
+        self[task_id] = None
+        self.created.discard(task_id)
+        self.fields.pop(task_id, None)
+
+    def created_ids(self) -> Set[int]:
+        return set(self.created)
+
+    def updated_ids(self) -> Set[int]:
+        return {
+            task_id for task_id, task in self.items()
+            if task is not None and task_id not in self.created
+        }
+
+    def deleted_ids(self) -> Set[int]:
+        return {task_id for task_id, task in self.items() if task is None}
+
+    def changed_fields(self, task_id: int) -> FrozenSet[str]:
+        """Поля, измененные у задачи (пусто для созданных и удаленных)"""
+        if task_id in self.created:
+            return frozenset()
+        return frozenset(self.fields.get(task_id, ()))
+
+    def merge_older(self, older: 'ChangeSet') -> None:
+        """Возврат более старых изменений (например, после неудачной записи)
+
+        Более новые записи этого набора не перезаписываются.
+        """
+        for task_id, task in older.items():
+            if task_id not in self:
+                self[task_id] = task
+                if task_id in older.created:
+                    self.created.add(task_id)
+            elif task_id in older.created and self[task_id] is not None:
+                self.created.add(task_id)
+            if task_id in older.fields and self[task_id] is not None:
+                self.fields.setdefault(task_id, set()).update(older.fields[task_id])
+
+    def copy(self) -> 'ChangeSet':
+        changes = ChangeSet()
+        changes.update(self)
+        changes.created = set(self.created)
+        changes.fields = {task_id: set(fields) for task_id, fields in self.fields.items()}
+        return changes
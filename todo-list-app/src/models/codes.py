@@ -0,0 +1,47 @@
+"""
+Таблицы кодов для компактного хранения повторяющихся строк задач
+"""
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from models.category import Category
+from models.priority import Priority
+
+
+class CodeTable:
+    """Двусторонняя таблица: строковое значение <-> малый целый код
+
+    Каждое значение хранится в единственном экземпляре, а задача держит
+    только его код. Код 0 зарезервирован за None. Значения вне исходного
+    набора (например, пользовательские категории) получают новые коды.
+    """
+
+    def __init__(self, values: Iterable[str] = ()):
+        self.values: List[Optional[str]] = [None]
+        self.codes: Dict[Optional[str], int] = {None: 0}
+        self._lock = threading.Lock()
+        for value in values:
+            self.code(value)
+
+    def code(self, value: Optional[str]) -> int:
+        """Код значения (новое значение регистрируется)"""
+        code = self.codes.get(value)
+        if code is None:
+            with self._lock:
+                code = self.codes.get(value)
+                if code is None:
+                    code = len(self.values)
+                    self.values.append(value)
+                    self.codes[value] = code
+        return code
+
+    def value(self, code: int) -> Optional[str]:
+        """Значение по коду"""
+        return self.values[code]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+CATEGORY_CODES = CodeTable(category.value for category in Category)
+PRIORITY_CODES = CodeTable(priority.value for priority in Priority)
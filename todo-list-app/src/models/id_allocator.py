@@ -0,0 +1,49 @@
+"""
+Выдача плотных монотонных идентификаторов задач
+"""
+import itertools
+from typing import Any, Iterable
+
+# Старые файлы хранили id(self) - адреса объектов в памяти (~10^12)
+LEGACY_ID_THRESHOLD = 1 << 32
+
+
+class IdAllocator:
+    """Монотонный счетчик id: 1, 2, 3, ...
+
+    Значение next_id сохраняется вместе с данными, поэтому id удаленных
+    задач не выдаются повторно и после перезапуска приложения.
+    """
+
+    def __init__(self, next_id: int = 1):
+        self.next_id = max(1, next_id)
+
+    def allocate(self) -> int:
+        """Выдача следующего id"""
+        task_id = self.next_id
+        self.next_id += 1
+        return task_id
+
+    def observe(self, task_ids: Iterable[int]) -> None:
+        """Учет уже занятых id, чтобы не выдать их повторно"""
+        for task_id in task_ids:
+            if task_id >= self.next_id:
+                self.next_id = task_id + 1
+
+
+def needs_id_migration(task_ids: Iterable[Any]) -> bool:
+    """Есть ли среди id старые id на основе адресов объектов"""
+    return any(
+        not isinstance(task_id, int) or task_id >= LEGACY_ID_THRESHOLD
+        for task_id in task_ids
+    )
+
+
+# Временные id для задач, созданных вне контроллера; они отрицательные
+# и поэтому не пересекаются с выданными IdAllocator
+_transient_ids = itertools.count(1)
+
+
+def transient_id() -> int:
+    """Временный id для задачи без постоянного идентификатора"""
+    return -next(_transient_ids)
@@ -2,9 +2,12 @@
 Модель задачи (Task)
 Соответствует диаграмме классов предметной области
 """
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from enum import Enum
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, FrozenSet, Iterable
+
+from models.id_allocator import transient_id
+from models.codes import CATEGORY_CODES, PRIORITY_CODES
 
 class TaskStatus(Enum):
     """Статусы задачи согласно диаграмме состояний"""
@@ -17,8 +20,51 @@ class TaskStatus(Enum):
         return self.value
 
 
+# Даты хранятся как микросекунды от эпохи (наивное локальное время, как datetime.now())
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_STATUS_BY_VALUE = {status.value: status for status in TaskStatus}
+
+
+def to_micros(value: datetime) -> int:
+    """Дата и время -> целое число микросекунд от эпохи"""
+    if value.tzinfo is not None:
+        value = value.replace(tzinfo=None)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def from_micros(value: int) -> datetime:
+    """Микросекунды от эпохи -> дата и время"""
+    return _EPOCH + timedelta(microseconds=value)
+
+
+def _now() -> int:
+    return to_micros(datetime.now())
+
+
 class Task:
-    """Класс задачи - центральная сущность системы"""
+    """Класс задачи - центральная сущность системы
+
+    Представление компактное: __slots__ вместо __dict__, категория и
+    приоритет хранятся малыми кодами из общих таблиц, а даты создания и
+    изменения - целым числом микросекунд. Публичные атрибуты при этом
+    остаются прежними: строки, TaskStatus и datetime.
+
+    Задача, загруженная через from_dict(lazy=True), хранит даты исходными
+    ISO-строками и разбирает каждую при первом обращении к ней.
+
+    update() и set_status() запоминают измененные поля (dirty_fields) до
+    вызова mark_clean() после сохранения.
+
+    version - номер последнего изменения, который выдает контроллер, для
+    кэшей представления: в отличие от даты изменения он различается и у
+    правок, сделанных в один такт часов.
+    """
+
+    __slots__ = (
+        'id', 'title', 'description', 'status',
+        'category_code', 'priority_code', '_due', '_created', '_modified', 'version', '_dirty'
+    )
 
     def __init__(
         self,
@@ -29,71 +75,220 @@ class Task:
         due_date: Optional[date] = None,
         task_id: Optional[int] = None
     ):
-        self.id = task_id or id(self)
+        # Постоянные id выдает контроллер; задачи вне него получают временный id
+        self.id = task_id if task_id is not None else transient_id()
         self.title = title
         self.description = description
-        self.category = category
-        self.priority = priority
-        self.due_date = due_date
+        self.category_code = CATEGORY_CODES.code(category)
+        self.priority_code = PRIORITY_CODES.code(priority)
+        self._due = due_date
         self.status = TaskStatus.NOT_STARTED
-        self.creation_date = datetime.now()
-        self.modification_date = datetime.now()
+        self._created = self._modified = _now()
+        self.version = 0
+        self._dirty = None
+
+    @property
+    def category(self) -> Optional[str]:
+        return CATEGORY_CODES.values[self.category_code]
+
+    @category.setter
+    def category(self, value: Optional[str]) -> None:
+        self.category_code = CATEGORY_CODES.code(value)
+
+    @property
+    def priority(self) -> str:
+        return PRIORITY_CODES.values[self.priority_code]
+
+    @priority.setter
+    def priority(self, value: str) -> None:
+        self.priority_code = PRIORITY_CODES.code(value)
+
+    @property
+    def due_date(self) -> Optional[date]:
+        value = self._due
+        if type(value) is str:
+            value = self._due = date.fromisoformat(value)
+        return value
 
-    def update(self, **kwargs) -> None:
-        """Обновление данных задачи"""
+    @due_date.setter
+    def due_date(self, value: Optional[date]) -> None:
+        self._due = value
+
+    @property
+    def creation_date(self) -> datetime:
+        value = self._created
+        if type(value) is str:
+            value = self._created = to_micros(datetime.fromisoformat(value))
+        return from_micros(value)
+
+    @creation_date.setter
+    def creation_date(self, value: datetime) -> None:
+        self._created = to_micros(value)
+
+    @property
+    def modification_date(self) -> datetime:
+        return from_micros(self.modified_micros)
+
+    @property
+    def modified_micros(self) -> int:
+        """Дата изменения в микросекундах от эпохи, без создания datetime"""
+        value = self._modified
+        if type(value) is str:
+            value = self._modified = to_micros(datetime.fromisoformat(value))
+        return value
+
+    @modification_date.setter
+    def modification_date(self, value: datetime) -> None:
+        self._modified = to_micros(value)
+
+    def update(self, **kwargs) -> FrozenSet[str]:
+        """Обновление данных задачи -> имена действительно измененных полей"""
+        changed = set()
         for key, value in kwargs.items():
-            if hasattr(self, key):
+            if hasattr(self, key) and getattr(self, key) != value:
                 setattr(self, key, value)
-        self.modification_date = datetime.now()
+                changed.add(key)
+        if changed:
+            self._modified = _now()
+            self.mark_dirty(changed)
+        return frozenset(changed)
 
     def set_status(self, status: TaskStatus) -> None:
         """Изменение статуса задачи"""
+        if status == self.status:
+            return
         self.status = status
-        self.modification_date = datetime.now()
+        self._modified = _now()
+        self.mark_dirty(('status',))
+
+    @property
+    def dirty_fields(self) -> FrozenSet[str]:
+        """Поля, измененные с последнего mark_clean()"""
+        return frozenset(self._dirty or ())
+
+    @property
+    def is_dirty(self) -> bool:
+        return bool(self._dirty)
+
+    def mark_dirty(self, fields: Iterable[str]) -> None:
+        """Пометка полей измененными (например, при повторе неудачной записи)"""
+        if self._dirty is None:
+            self._dirty = set()
+        self._dirty.update(fields)
+
+    def mark_clean(self, fields: Optional[Iterable[str]] = None) -> None:
+        """Сброс пометок после передачи изменений на сохранение
 
-    def is_overdue(self) -> bool:
-        """Проверка просрочена ли задача"""
+        fields - только эти поля: пометки, появившиеся после того, как
+        набор изменений был собран, остаются до следующей записи.
+        """
+        if fields is None or not self._dirty:
+            self._dirty = None
+            return
+        self._dirty.difference_update(fields)
+        if not self._dirty:
+            self._dirty = None
+
+    def snapshot(self) -> tuple:
+        """Состояние всех полей для последующего restore()"""
+        state = tuple(getattr(self, name) for name in self.__slots__)
+        return state[:-1] + (set(self._dirty) if self._dirty else None,)
+
+    def restore(self, state: tuple) -> None:
+        """Возврат полей к состоянию из snapshot() (объект задачи тот же)"""
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+    def is_overdue(self, today: Optional[date] = None) -> bool:
+        """Проверка просрочена ли задача (today - общая дата для серии проверок)"""
         if not self.due_date:
             return False
-        return self.due_date < date.today() and self.status != TaskStatus.COMPLETED
+        return self.due_date < (today or date.today()) and self.status != TaskStatus.COMPLETED
 
-    def is_due_soon(self) -> bool:
-        """Проверка приближения дедлайна"""
+    def is_due_soon(self, today: Optional[date] = None) -> bool:
+        """Проверка приближения дедлайна (today - общая дата для серии проверок)"""
         if not self.due_date:
             return False
-        days_until_due = (self.due_date - date.today()).days
+        days_until_due = (self.due_date - (today or date.today())).days
         return 0 <= days_until_due <= 2 and self.status != TaskStatus.COMPLETED
 
     def to_dict(self) -> Dict[str, Any]:
-        """Сериализация в словарь для хранения"""
+        """Сериализация в словарь для хранения
+
+        Еще не разобранные даты ленивой задачи записываются как есть.
+        """
+        due = self._due
+        created = self._created
+        modified = self._modified
         return {
             'id': self.id,
             'title': self.title,
             'description': self.description,
             'category': self.category,
             'priority': self.priority,
-            'due_date': self.due_date.isoformat() if self.due_date else None,
+            'due_date': due if type(due) is str else (due.isoformat() if due else None),
             'status': self.status.value,
-            'creation_date': self.creation_date.isoformat(),
-            'modification_date': self.modification_date.isoformat()
+            'creation_date': created if type(created) is str else from_micros(created).isoformat(),
+            'modification_date': modified if type(modified) is str else from_micros(modified).isoformat()
         }
 
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'Task':
-        """Десериализация из словаря"""
-        task = cls(
-            title=data['title'],
-            description=data.get('description', ''),
-            category=data.get('category'),
-            priority=data.get('priority', 'Средний'),
-            due_date=date.fromisoformat(data['due_date']) if data.get('due_date') else None,
-            task_id=data['id']
-        )
-
-        task.status = TaskStatus(data['status'])
-        task.creation_date = datetime.fromisoformat(data['creation_date'])
-        task.modification_date = datetime.fromisoformat(data['modification_date'])
+    def from_dict(cls, data: Dict[str, Any], lazy: bool = False) -> 'Task':
+        """Десериализация из словаря
+
+        lazy - даты остаются строками до первого обращения: при загрузке
+        больших файлов разбираются только те поля, которые понадобились.
+        """
+        task = cls.__new__(cls)
+        task.id = data.get('id')
+        task.title = data['title']
+        task.description = data.get('description', '')
+        task.category_code = CATEGORY_CODES.code(data.get('category'))
+        task.priority_code = PRIORITY_CODES.code(data.get('priority', 'Средний'))
+        status = data['status']
+        task.status = _STATUS_BY_VALUE.get(status) or TaskStatus(status)
+        if lazy:
+            task._due = data.get('due_date') or None
+            task._created = data['creation_date']
+            task._modified = data['modification_date']
+        else:
+            task._due = date.fromisoformat(data['due_date']) if data.get('due_date') else None
+            task._created = to_micros(datetime.fromisoformat(data['creation_date']))
+            task._modified = to_micros(datetime.fromisoformat(data['modification_date']))
+        task.version = 0
+        task._dirty = None
+        return task
+
+    @classmethod
+    def from_fields(
+        cls,
+        task_id: int,
+        title: str,
+        description: str,
+        category: Optional[str],
+        priority: str,
+        status: TaskStatus,
+        due_date: Optional[date],
+        created_micros: int,
+        modified_micros: int
+    ) -> 'Task':
+        """Задача из уже разобранных полей (даты - микросекунды от эпохи)
 
+        Для хранилищ, которые держат данные в двоичном виде и могут
+        обойтись без словаря и ISO-строк.
+        """
+        task = cls.__new__(cls)
+        task.id = task_id
+        task.title = title
+        task.description = description
+        task.category_code = CATEGORY_CODES.code(category)
+        task.priority_code = PRIORITY_CODES.code(priority)
+        task.status = status
+        task._due = due_date
+        task._created = created_micros
+        task._modified = modified_micros
+        task.version = 0
+        task._dirty = None
         return task
 
     def __str__(self) -> str:
@@ -0,0 +1,117 @@
+"""
+Фоновая запись изменений (write-behind)
+
+Мутации только помечают хранилище "грязным", а отдельный поток
+объединяет серию пометок в одну запись через заданную задержку.
+"""
+import logging
+import threading
+import time
+from typing import Callable, Dict, Any
+
+
+class BackgroundWriter:
+    """Поток отложенной записи с объединением изменений"""
+
+    def __init__(self, write: Callable[[], None], delay: float = 0.5):
+        self.write = write
+        self.delay = delay
+        self.logger = logging.getLogger(__name__)
+
+        self._condition = threading.Condition()
+        self._dirty = False
+        self._writing = False
+        self._flush_requested = False
+        self._stopped = False
+        self._cycles = 0
+
+        self.stats: Dict[str, Any] = {
+            'requests': 0,
+            'writes': 0,
+            'coalesced': 0,
+            'errors': 0,
+            'last_flush_ms': 0.0,
+            'max_flush_ms': 0.0,
+            'total_flush_ms': 0.0,
+        }
+
+        self._thread = threading.Thread(target=self._run, name='task-writer', daemon=True)
+        self._thread.start()
+
+    def mark_dirty(self) -> None:
+        """Пометка о наличии несохраненных изменений"""
+        with self._condition:
+            self.stats['requests'] += 1
+            if self._dirty:
+                self.stats['coalesced'] += 1
+            self._dirty = True
+            self._condition.notify_all()
+
+    def flush(self) -> None:
+        """Немедленная запись и ожидание ее завершения"""
+        with self._condition:
+            if not self._dirty:
+                target = self._cycles + 1 if self._writing else self._cycles
+            else:
+                target = self._cycles + (2 if self._writing else 1)
+
+            self._flush_requested = True
+            self._condition.notify_all()
+            while self._cycles < target and self._thread.is_alive():
+                self._condition.wait()
+            self._flush_requested = False
+
+    def stop(self) -> None:
+        """Запись оставшихся изменений и остановка потока"""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        self._thread.join()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Копия счетчиков записи"""
+        with self._condition:
+            stats = dict(self.stats)
+        stats['avg_flush_ms'] = stats['total_flush_ms'] / stats['writes'] if stats['writes'] else 0.0
+        return stats
+
+    def _run(self) -> None:
+        """Цикл потока записи"""
+        while True:
+            with self._condition:
+                while not self._dirty and not self._stopped:
+                    self._condition.wait()
+                if not self._dirty and self._stopped:
+                    return
+
+                # Ждем задержку, собирая следующие изменения в ту же запись
+                deadline = time.monotonic() + self.delay
+                while not self._stopped and not self._flush_requested:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+                self._dirty = False
+                self._writing = True
+
+            start = time.perf_counter()
+            try:
+                self.write()
+            except Exception as e:
+                self.logger.error(f"Background write failed: {e}")
+                with self._condition:
+                    self.stats['errors'] += 1
+                    # Повторим запись после следующей задержки
+                    if not self._stopped:
+                        self._dirty = True
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+            with self._condition:
+                self._writing = False
+                self._cycles += 1
+                self.stats['writes'] += 1
+                self.stats['last_flush_ms'] = elapsed_ms
+                self.stats['max_flush_ms'] = max(self.stats['max_flush_ms'], elapsed_ms)
+                self.stats['total_flush_ms'] += elapsed_ms
+                self._condition.notify_all()
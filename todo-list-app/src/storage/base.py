@@ -0,0 +1,62 @@
+"""
+Базовый интерфейс хранилища задач
+"""
+from pathlib import Path
+from typing import List, Dict, Any, Iterable, Optional
+
+from models.task import Task
+from storage.durability import DurabilityPolicy
+
+
+class TaskStorage:
+    """Базовый класс хранилища - определяет контракт для TaskController"""
+
+    # Умеет ли хранилище выполнять фильтрацию и сортировку само
+    supports_queries = False
+    # Нужен ли save() полный список задач (иначе хватает changes)
+    saves_all_tasks = True
+
+    def __init__(self, path: Path, fsync: str = 'batched'):
+        self.path = Path(path)
+        self.durability = DurabilityPolicy(fsync)
+        # Служебные данные, хранимые вместе с задачами (например, next_id)
+        self.metadata: Dict[str, Any] = {}
+
+    def exists(self) -> bool:
+        """Есть ли сохраненные данные"""
+        return self.path.exists()
+
+    def load(self) -> List[Dict[str, Any]]:
+        """Загрузка всех записей задач (и заполнение self.metadata)"""
+        raise NotImplementedError
+
+    def load_tasks(self, lazy: bool = False) -> List[Task]:
+        """Загрузка всех задач объектами Task (lazy - см. Task.from_dict)
+
+        Хранилища, умеющие строить задачи без промежуточных словарей,
+        переопределяют этот метод.
+        """
+        return [Task.from_dict(record, lazy) for record in self.load()]
+
+    def save(self, tasks: Iterable[Task], changes: Dict[int, Optional[Task]]) -> None:
+        """Сохранение задач
+
+        changes - задачи, измененные с момента последнего сохранения
+        (id -> задача, None для удаленных задач). Перед save контроллер
+        всегда передает те же изменения в stage().
+        """
+        raise NotImplementedError
+
+    def replace_all(self, tasks: List[Task]) -> None:
+        """Полная замена содержимого хранилища (например, после миграции id)"""
+        raise NotImplementedError
+
+    def stage(self, changes: Dict[int, Optional[Task]]) -> None:
+        """Быстрое применение изменений в памяти хранилища перед записью
+
+        Вызывается контроллером синхронно; сама запись на диск (save)
+        может выполняться в фоновом потоке.
+        """
+
+    def close(self) -> None:
+        """Освобождение ресурсов хранилища"""
@@ -0,0 +1,280 @@
+"""
+Компактный двоичный снимок задач с чтением через mmap
+
+Формат (все числа little-endian):
+    заголовок   HEADER: сигнатура, версия, размер записи, число записей,
+                смещения таблицы записей, кучи строк и словаря
+    записи      RECORD фиксированной ширины на задачу: id, ссылки на
+                название и описание в куче, коды статуса, приоритета и
+                категории, срок (ординал), даты создания и изменения (мкс)
+    куча        UTF-8 названий и описаний подряд
+    словарь     JSON: метаданные хранилища и таблицы строк приоритетов
+                и категорий, на которые ссылаются коды записей
+
+Открытие снимка (BinarySnapshot) читает только заголовок и словарь;
+записи разбираются по одной при обращении к ним (task, record).
+BinaryTaskStorage при загрузке разбирает все записи сразу и закрывает
+отображение: контроллеру нужен полный список задач.
+"""
+import json
+import mmap
+import struct
+import sys
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from models.task import Task, TaskStatus, to_micros, from_micros
+from storage.base import TaskStorage
+from storage.durability import atomic_write, backup_path
+from storage.json_storage import DEFAULT_BACKUPS, build_document, load_snapshot, read_json_snapshot
+
+MAGIC = b'TSKB'
+FORMAT_VERSION = 1
+
+# сигнатура, версия, размер записи, число записей, смещения: записи, куча, словарь; длина словаря
+HEADER = struct.Struct('<4sHHIQQQQ')
+# id, название (смещение, длина), описание (смещение, длина), статус,
+# приоритет, категория, срок, создание, изменение
+RECORD = struct.Struct('<qQIQIBHHiqq')
+
+STATUSES = list(TaskStatus)
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+NO_DUE_DATE = 0
+
+
+class BinarySnapshot:
+    """Открытый только для чтения двоичный снимок
+
+    Файл отображается в память; название и описание декодируются прямо
+    из отображения через memoryview, без промежуточных копий.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            size = f.seek(0, 2)
+            if size < HEADER.size:
+                raise ValueError(f"{self.path.name} is too short for a task snapshot")
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+
+        (magic, version, record_size, self.count,
+         self._records, self._heap, dictionary, dictionary_size) = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path.name} is not a task snapshot")
+        if version != FORMAT_VERSION or record_size != RECORD.size:
+            raise ValueError(f"Unsupported task snapshot version {version}")
+        if dictionary + dictionary_size > size or self._records + self.count * RECORD.size > size:
+            raise ValueError(f"{self.path.name} is truncated")
+
+        strings = json.loads(str(self._view[dictionary:dictionary + dictionary_size], 'utf-8'))
+        self.metadata: Dict[str, Any] = strings['metadata']
+        self.priorities: List[Optional[str]] = strings['priorities']
+        self.categories: List[Optional[str]] = strings['categories']
+        self._dates: Dict[int, date] = {}
+
+    def __len__(self) -> int:
+        return self.count
+
+    def unpack(self, index: int) -> Tuple:
+        """Сырые поля записи index"""
+        if not 0 <= index < self.count:
+            raise IndexError("snapshot record index out of range")
+        return RECORD.unpack_from(self._mmap, self._records + index * RECORD.size)
+
+    def record(self, index: int) -> Dict[str, Any]:
+        """Запись index в формате Task.to_dict()"""
+        return self._to_dict(self.unpack(index))
+
+    def task(self, index: int) -> Task:
+        """Задача из записи index без промежуточных ISO-строк"""
+        return self._to_task(self.unpack(index))
+
+    def tasks(self) -> List[Task]:
+        """Все задачи по порядку"""
+        return [self._to_task(fields) for fields in RECORD.iter_unpack(self._table())]
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        """Все записи по порядку (таблица разбирается struct.iter_unpack)"""
+        return (self._to_dict(fields) for fields in RECORD.iter_unpack(self._table()))
+
+    def close(self) -> None:
+        self._view.release()
+        self._mmap.close()
+
+    def __enter__(self) -> 'BinarySnapshot':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _table(self) -> memoryview:
+        return self._view[self._records:self._records + self.count * RECORD.size]
+
+    def _due_date(self, ordinal: int) -> Optional[date]:
+        """Срок по ординалу; даты повторяются, поэтому объекты кэшируются"""
+        if ordinal == NO_DUE_DATE:
+            return None
+        due = self._dates.get(ordinal)
+        if due is None:
+            due = self._dates[ordinal] = date.fromordinal(ordinal)
+        return due
+
+    def _to_task(self, fields: Tuple) -> Task:
+        (task_id, title_offset, title_length, description_offset, description_length,
+         status, priority, category, due, created, modified) = fields
+        return Task.from_fields(
+            task_id,
+            self._string(title_offset, title_length),
+            self._string(description_offset, description_length),
+            self.categories[category],
+            self.priorities[priority],
+            STATUSES[status],
+            self._due_date(due),
+            created,
+            modified
+        )
+
+    def _string(self, offset: int, length: int) -> str:
+        start = self._heap + offset
+        return str(self._view[start:start + length], 'utf-8')
+
+    def _to_dict(self, fields: Tuple) -> Dict[str, Any]:
+        (task_id, title_offset, title_length, description_offset, description_length,
+         status, priority, category, due, created, modified) = fields
+        return {
+            'id': task_id,
+            'title': self._string(title_offset, title_length),
+            'description': self._string(description_offset, description_length),
+            'category': self.categories[category],
+            'priority': self.priorities[priority],
+            'due_date': self._due_date(due).isoformat() if due != NO_DUE_DATE else None,
+            'status': STATUSES[status].value,
+            'creation_date': from_micros(created).isoformat(),
+            'modification_date': from_micros(modified).isoformat(),
+        }
+
+
+def encode_snapshot(tasks: Iterable[Task], metadata: Dict[str, Any]) -> bytes:
+    """Двоичный снимок задач"""
+    priorities: Dict[Optional[str], int] = {}
+    categories: Dict[Optional[str], int] = {None: 0}
+    records = bytearray()
+    heap = bytearray()
+    count = 0
+
+    for task in tasks:
+        title = task.title.encode('utf-8')
+        description = (task.description or '').encode('utf-8')
+        title_offset = len(heap)
+        heap += title
+        description_offset = len(heap)
+        heap += description
+        due = task.due_date
+        records += RECORD.pack(
+            task.id,
+            title_offset, len(title),
+            description_offset, len(description),
+            STATUS_CODES[task.status],
+            priorities.setdefault(task.priority, len(priorities)),
+            categories.setdefault(task.category, len(categories)),
+            due.toordinal() if due else NO_DUE_DATE,
+            to_micros(task.creation_date),
+            to_micros(task.modification_date),
+        )
+        count += 1
+
+    dictionary = json.dumps({
+        'metadata': metadata,
+        'priorities': list(priorities),
+        'categories': list(categories),
+    }, ensure_ascii=False).encode('utf-8')
+
+    records_offset = HEADER.size
+    heap_offset = records_offset + len(records)
+    dictionary_offset = heap_offset + len(heap)
+    header = HEADER.pack(
+        MAGIC, FORMAT_VERSION, RECORD.size, count,
+        records_offset, heap_offset, dictionary_offset, len(dictionary)
+    )
+    return b''.join((header, records, heap, dictionary))
+
+
+def read_binary_snapshot(path: Path) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Чтение двоичного снимка -> (записи, метаданные)"""
+    with BinarySnapshot(path) as snapshot:
+        return list(snapshot.records()), dict(snapshot.metadata)
+
+
+def read_binary_tasks(path: Path) -> Tuple[List[Task], Dict[str, Any]]:
+    """Чтение двоичного снимка сразу в объекты Task -> (задачи, метаданные)"""
+    with BinarySnapshot(path) as snapshot:
+        return snapshot.tasks(), dict(snapshot.metadata)
+
+
+class BinaryTaskStorage(TaskStorage):
+    """Хранилище с полной перезаписью двоичного снимка при каждом сохранении"""
+
+    def __init__(self, path: Path, fsync: str = 'batched', backups: int = DEFAULT_BACKUPS):
+        super().__init__(path, fsync)
+        self.backups = backups
+
+    def exists(self) -> bool:
+        """Есть ли снимок или его резервные копии"""
+        return self.path.exists() or any(
+            backup_path(self.path, number).exists() for number in range(1, self.backups + 1)
+        )
+
+    def load(self) -> List[Dict[str, Any]]:
+        """Загрузка задач из двоичного снимка"""
+        records, self.metadata = load_snapshot(self.path, self.backups, read_binary_snapshot)
+        return records
+
+    def load_tasks(self, lazy: bool = False) -> List[Task]:
+        """Загрузка задач напрямую из записей, без словарей и ISO-строк
+
+        lazy не влияет: даты в записях - уже числа (микросекунды), и
+        откладывать их разбор, как в Task.from_dict, незачем.
+        """
+        tasks, self.metadata = load_snapshot(self.path, self.backups, read_binary_tasks)
+        return tasks
+
+    def save(self, tasks: Iterable[Task], changes: Dict[int, Optional[Task]]) -> None:
+        """Атомарная перезапись снимка текущим списком задач (если есть изменения)"""
+        if changes:
+            self.replace_all(tasks)
+
+    def replace_all(self, tasks: List[Task]) -> None:
+        """Полная перезапись снимка"""
+        atomic_write(self.path, encode_snapshot(tasks, self.metadata), self.durability, self.backups)
+
+
+def json_to_binary(json_path: Path, binary_path: Path) -> int:
+    """Преобразование tasks.json в двоичный снимок"""
+    records, metadata = read_json_snapshot(Path(json_path))
+    tasks = [Task.from_dict(record) for record in records]
+    Path(binary_path).write_bytes(encode_snapshot(tasks, metadata))
+    return len(tasks)
+
+
+def binary_to_json(binary_path: Path, json_path: Path) -> int:
+    """Преобразование двоичного снимка в tasks.json"""
+    records, metadata = read_binary_snapshot(Path(binary_path))
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(build_document(records, metadata), f, ensure_ascii=False, indent=2)
+    return len(records)
+
+
+if __name__ == '__main__':
+    # Преобразование: python -m storage.binary_storage data/tasks.json data/tasks.tdb
+    #            или: python -m storage.binary_storage data/tasks.tdb data/tasks.json
+    if len(sys.argv) != 3:
+        print("Usage: python -m storage.binary_storage <source> <target>  (.json <-> .tdb)")
+        sys.exit(1)
+    source, target = Path(sys.argv[1]), Path(sys.argv[2])
+    if source.suffix.lower() == '.json':
+        converted = json_to_binary(source, target)
+    else:
+        converted = binary_to_json(source, target)
+    print(f"Converted {converted} tasks into {target}")
@@ -0,0 +1,103 @@
+"""
+Политика долговечности записи и атомарные снимки
+"""
+import os
+import time
+from pathlib import Path
+
+# always - fsync после каждой записи
+# batched - fsync не чаще одного раза на batch_size записей или batch_interval секунд
+# never - данные остаются в кэше ОС, запись только атомарная
+FSYNC_POLICIES = ('always', 'batched', 'never')
+
+
+class DurabilityPolicy:
+    """Решает, когда выполнять fsync после записи"""
+
+    def __init__(self, fsync: str = 'batched', batch_size: int = 16, batch_interval: float = 1.0):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync}")
+        self.mode = fsync
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self.fsync_count = 0
+
+    def sync(self, f) -> bool:
+        """fsync открытого файла согласно политике; True - если выполнен"""
+        f.flush()
+        if self.mode == 'never':
+            return False
+
+        self._unsynced += 1
+        if self.mode == 'batched':
+            due = (
+                self._unsynced >= self.batch_size
+                or time.monotonic() - self._last_sync >= self.batch_interval
+            )
+            if not due:
+                return False
+
+        os.fsync(f.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self.fsync_count += 1
+        return True
+
+    def sync_directory(self, path: Path) -> None:
+        """fsync каталога, чтобы переименование пережило сбой питания"""
+        if self.mode != 'always' or not hasattr(os, 'O_DIRECTORY'):
+            return
+        fd = os.open(str(path), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+def backup_path(path: Path, number: int) -> Path:
+    """Путь к N-й предыдущей версии снимка (tasks.json.1, tasks.json.2, ...)"""
+    return path.with_name(f"{path.name}.{number}")
+
+
+def unchanged(path: Path, data: bytes) -> bool:
+    """Совпадает ли содержимое файла с data (сначала сравнивается размер)"""
+    try:
+        if path.stat().st_size != len(data):
+            return False
+        with open(path, 'rb') as f:
+            return f.read() == data
+    except OSError:
+        return False
+
+
+def atomic_write(
+    path: Path,
+    data: bytes,
+    policy: DurabilityPolicy,
+    backups: int = 0
+) -> None:
+    """Запись снимка через временный файл и переименование
+
+    Предыдущие версии сохраняются как path.1 ... path.N. При сбое посреди
+    записи на диске остается либо старый, либо новый файл целиком.
+    Если файл уже содержит ровно эти байты, он не переписывается и
+    резервные копии не сдвигаются.
+    """
+    if unchanged(path, data):
+        return
+    temp_path = path.with_name(f".{path.name}.tmp")
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+        policy.sync(f)
+
+    if backups > 0 and path.exists():
+        for number in range(backups - 1, 0, -1):
+            older = backup_path(path, number)
+            if older.exists():
+                os.replace(older, backup_path(path, number + 1))
+        os.replace(path, backup_path(path, 1))
+
+    os.replace(temp_path, path)
+    policy.sync_directory(path.parent)
@@ -0,0 +1,37 @@
+"""
+Выбор реализации хранилища задач
+"""
+from pathlib import Path
+from typing import Optional
+
+from storage.base import TaskStorage
+from storage.json_storage import JsonTaskStorage
+from storage.journal_storage import JournalTaskStorage
+from storage.sqlite_storage import SqliteTaskStorage
+from storage.binary_storage import BinaryTaskStorage
+from storage.sharded_storage import ShardedTaskStorage
+
+STORAGE_MODES = {
+    'json': JsonTaskStorage,
+    'journal': JournalTaskStorage,
+    'sqlite': SqliteTaskStorage,
+    'binary': BinaryTaskStorage,
+    'sharded': ShardedTaskStorage,
+}
+
+# Режим по расширению файла, если он не указан явно
+SUFFIX_MODES = {
+    '.db': 'sqlite',
+    '.sqlite': 'sqlite',
+    '.sqlite3': 'sqlite',
+    '.tdb': 'binary',
+    '.manifest': 'sharded',
+}
+
+
+def create_storage(path: Path, mode: Optional[str] = None, **options) -> TaskStorage:
+    """Создание хранилища по режиму или расширению файла (по умолчанию - JSON)"""
+    mode = mode or SUFFIX_MODES.get(Path(path).suffix.lower(), 'json')
+    if mode not in STORAGE_MODES:
+        raise ValueError(f"Unknown storage mode: {mode}")
+    return STORAGE_MODES[mode](Path(path), **options)
@@ -0,0 +1,210 @@
+"""
+Журнальное хранилище задач (append-only)
+
+Каждая мутация дописывает одну компактную запись в журнал рядом со
+снимком. При загрузке снимок читается целиком, затем журнал
+проигрывается поверх него. Когда журнал превышает порог размера,
+он уплотняется в новый снимок в фоновом потоке.
+"""
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+
+from models.task import Task
+from storage.base import TaskStorage
+from storage.durability import atomic_write
+from storage.json_storage import DEFAULT_BACKUPS, load_snapshot, build_document
+
+# Порог размера журнала (в байтах), после которого запускается уплотнение
+DEFAULT_COMPACT_THRESHOLD = 4 * 1024 * 1024
+
+OP_PUT = 'put'
+OP_DELETE = 'del'
+
+
+class JournalTaskStorage(TaskStorage):
+    """Снимок + журнал изменений с фоновым уплотнением"""
+
+    saves_all_tasks = False
+
+    def __init__(
+        self,
+        path: Path,
+        compact_threshold: int = DEFAULT_COMPACT_THRESHOLD,
+        fsync: str = 'batched',
+        backups: int = DEFAULT_BACKUPS
+    ):
+        super().__init__(path, fsync)
+        self.backups = backups
+        self.journal_path = self.path.with_name(self.path.name + '.journal')
+        self.compacting_path = self.path.with_name(self.path.name + '.journal.compacting')
+        self.compact_threshold = compact_threshold
+        self.logger = logging.getLogger(__name__)
+
+        self._lock = threading.Lock()
+        self._journal = None
+        self._journal_size = self.journal_path.stat().st_size if self.journal_path.exists() else 0
+        self._compactor: Optional[threading.Thread] = None
+
+    def exists(self) -> bool:
+        """Есть ли снимок или журнал"""
+        return (
+            self.path.exists()
+            or self.journal_path.exists()
+            or self.compacting_path.exists()
+        )
+
+    def load(self) -> List[Dict[str, Any]]:
+        """Чтение снимка и проигрывание журнала поверх него"""
+        records, self.metadata = self._read_state(self.compacting_path, self.journal_path)
+        return list(records.values())
+
+    def save(self, tasks: Iterable[Task], changes: Dict[int, Optional[Task]]) -> None:
+        """Дописывание в журнал только измененных задач"""
+        if not changes:
+            return
+
+        lines = []
+        for task_id, task in changes.items():
+            if task is None:
+                entry = {'op': OP_DELETE, 'id': task_id}
+            else:
+                entry = {'op': OP_PUT, 'task': task.to_dict()}
+            lines.append(json.dumps(entry, ensure_ascii=False, separators=(',', ':')))
+        payload = ('\n'.join(lines) + '\n').encode('utf-8')
+
+        with self._lock:
+            if self._journal is None:
+                self._journal = open(self.journal_path, 'ab')
+            self._journal.write(payload)
+            self.durability.sync(self._journal)
+            self._journal_size += len(payload)
+
+            if self._journal_size >= self.compact_threshold:
+                self._start_compaction()
+
+    def replace_all(self, tasks: List[Task]) -> None:
+        """Запись нового снимка и удаление журналов"""
+        with self._lock:
+            compactor = self._compactor
+        if compactor:
+            compactor.join()
+
+        with self._lock:
+            document = build_document([task.to_dict() for task in tasks], self.metadata)
+            payload = json.dumps(document, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            atomic_write(self.path, payload, self.durability, self.backups)
+
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            for journal_path in (self.journal_path, self.compacting_path):
+                if journal_path.exists():
+                    os.remove(journal_path)
+            self._journal_size = 0
+
+    def compact(self, wait: bool = True) -> None:
+        """Принудительное уплотнение журнала в снимок"""
+        with self._lock:
+            compactor = self._compactor
+        if compactor:
+            compactor.join()
+
+        with self._lock:
+            if self._journal_size:
+                self._start_compaction()
+            compactor = self._compactor
+        if wait and compactor:
+            compactor.join()
+
+    def close(self) -> None:
+        """Ожидание фонового уплотнения и закрытие журнала"""
+        with self._lock:
+            compactor = self._compactor
+        if compactor:
+            compactor.join()
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+
+    def _start_compaction(self) -> None:
+        """Переключение на новый журнал и запуск уплотнения (под self._lock)"""
+        if self._compactor and self._compactor.is_alive():
+            return
+        if self.compacting_path.exists():
+            # Предыдущее уплотнение не завершилось - дождемся его повтора
+            self._compactor = threading.Thread(target=self._compact_worker, daemon=True)
+            self._compactor.start()
+            return
+
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        os.replace(self.journal_path, self.compacting_path)
+        self._journal_size = 0
+
+        self._compactor = threading.Thread(target=self._compact_worker, daemon=True)
+        self._compactor.start()
+
+    def _compact_worker(self) -> None:
+        """Слияние снимка с замороженным журналом и атомарная запись снимка"""
+        try:
+            records, metadata = self._read_state(self.compacting_path)
+            payload = json.dumps(
+                build_document(list(records.values()), metadata),
+                ensure_ascii=False, separators=(',', ':')
+            ).encode('utf-8')
+            atomic_write(self.path, payload, self.durability, self.backups)
+            os.remove(self.compacting_path)
+            self.logger.info(f"Journal compacted into snapshot: {len(records)} tasks")
+        except Exception as e:
+            self.logger.error(f"Error compacting journal: {e}")
+
+    def _read_state(self, *journal_paths: Path) -> Tuple[Dict[int, Dict[str, Any]], Dict[str, Any]]:
+        """Снимок + последовательное проигрывание журналов"""
+        snapshot, metadata = load_snapshot(self.path, self.backups)
+        records: Dict[int, Dict[str, Any]] = {record['id']: record for record in snapshot}
+
+        for journal_path in journal_paths:
+            if journal_path.exists():
+                self._replay(journal_path, records, metadata)
+        return records, metadata
+
+    def _replay(
+        self,
+        journal_path: Path,
+        records: Dict[int, Dict[str, Any]],
+        metadata: Dict[str, Any]
+    ) -> None:
+        """Применение записей журнала к состоянию
+
+        next_id выводится из записей: id удаленных задач тоже считаются занятыми.
+        """
+        next_id = metadata.get('next_id', 1)
+        with open(journal_path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Оборванная последняя запись после аварийного завершения
+                    self.logger.warning(
+                        f"Skipping damaged journal entry {journal_path.name}:{line_number}"
+                    )
+                    continue
+
+                if entry['op'] == OP_PUT:
+                    task_data = entry['task']
+                    records[task_data['id']] = task_data
+                    next_id = max(next_id, task_data['id'] + 1)
+                elif entry['op'] == OP_DELETE:
+                    records.pop(entry['id'], None)
+                    # Задача могла быть создана и удалена в одной записи журнала
+                    next_id = max(next_id, entry['id'] + 1)
+
+        metadata['next_id'] = next_id
@@ -0,0 +1,101 @@
+"""
+Хранилище задач в одном JSON файле
+"""
+import json
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from models.task import Task
+from storage.base import TaskStorage
+from storage.durability import atomic_write, backup_path
+
+# Количество предыдущих версий снимка, хранимых рядом с основным файлом
+DEFAULT_BACKUPS = 3
+
+# Версия 1 - список задач; версия 2 - документ {version, next_id, tasks}
+FORMAT_VERSION = 2
+
+
+def parse_document(data: Any) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Разбор содержимого tasks.json любой версии -> (записи, метаданные)"""
+    if isinstance(data, list):
+        return data, {}
+    metadata = {key: value for key, value in data.items() if key not in ('version', 'tasks')}
+    return data['tasks'], metadata
+
+
+def build_document(records: List[Dict[str, Any]], metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Документ tasks.json текущей версии"""
+    document: Dict[str, Any] = {'version': FORMAT_VERSION}
+    document.update(metadata)
+    document['tasks'] = records
+    return document
+
+
+def read_json_snapshot(path: Path) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Чтение файла tasks.json -> (записи, метаданные)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return parse_document(json.load(f))
+
+
+def load_snapshot(
+    path: Path,
+    backups: int,
+    read: Callable[[Path], Tuple[List[Dict[str, Any]], Dict[str, Any]]] = read_json_snapshot
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Чтение снимка; при повреждении - самой свежей целой резервной копии"""
+    logger = logging.getLogger(__name__)
+    candidates = [path] + [backup_path(path, number) for number in range(1, backups + 1)]
+    first_error: Optional[Exception] = None
+
+    for candidate in candidates:
+        if not candidate.exists():
+            continue
+        try:
+            data = read(candidate)
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Snapshot {candidate.name} is damaged: {e}")
+            first_error = first_error or e
+            continue
+
+        if candidate != path:
+            logger.warning(f"Restored tasks from backup snapshot {candidate.name}")
+        return data
+
+    if first_error:
+        raise first_error
+    return [], {}
+
+
+class JsonTaskStorage(TaskStorage):
+    """Хранилище с полной перезаписью JSON файла при каждом сохранении"""
+
+    def __init__(self, path: Path, fsync: str = 'batched', backups: int = DEFAULT_BACKUPS):
+        super().__init__(path, fsync)
+        self.backups = backups
+
+    def exists(self) -> bool:
+        """Есть ли снимок или его резервные копии"""
+        return self.path.exists() or any(
+            backup_path(self.path, number).exists() for number in range(1, self.backups + 1)
+        )
+
+    def load(self) -> List[Dict[str, Any]]:
+        """Загрузка задач из JSON файла"""
+        records, self.metadata = load_snapshot(self.path, self.backups)
+        return records
+
+    def save(self, tasks: Iterable[Task], changes: Dict[int, Optional[Task]]) -> None:
+        """Атомарная перезапись всего файла текущим списком задач
+
+        Без изменений файл не переписывается, и резервные копии не сдвигаются.
+        """
+        if changes:
+            self.replace_all(tasks)
+
+    def replace_all(self, tasks: List[Task]) -> None:
+        """Полная перезапись снимка"""
+        document = build_document([task.to_dict() for task in tasks], self.metadata)
+        payload = json.dumps(document, ensure_ascii=False, indent=2).encode('utf-8')
+        atomic_write(self.path, payload, self.durability, self.backups)
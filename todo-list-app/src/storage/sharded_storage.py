@@ -0,0 +1,269 @@
+"""
+Хранилище задач, разбитое на шарды
+
+Задачи раскладываются по отдельным JSON файлам (шардам) по месяцу
+создания или по диапазону id; ключ шарда у задачи не меняется. Рядом
+лежит манифест со списком шардов и сводкой по каждому: количество задач
+и встречающиеся статусы, категории и приоритеты.
+
+Сохранение перезаписывает только шарды с измененными задачами и
+манифест, поэтому его время зависит от размера шарда, а не от общего
+числа задач. По сводкам загрузка пропускает шарды, в которых не может
+быть задач, подходящих под фильтры load_filters (например, месяцы,
+где все задачи выполнены).
+"""
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from models.task import Task
+from storage.base import TaskStorage
+from storage.durability import atomic_write, backup_path
+from storage.json_storage import DEFAULT_BACKUPS, build_document, load_snapshot
+
+MANIFEST_VERSION = 1
+
+# Задач в шарде при разбиении по диапазону id
+DEFAULT_SHARD_SIZE = 1000
+
+# Поля манифеста, не относящиеся к метаданным хранилища
+LAYOUT_KEYS = ('version', 'shard_by', 'shard_size', 'shards')
+
+# Поле фильтра -> (поле сводки шарда, значение поля задачи)
+SUMMARY_FIELDS: Dict[str, Tuple[str, Callable[[Task], Any]]] = {
+    'status': ('statuses', lambda task: task.status.value),
+    'category': ('categories', lambda task: task.category),
+    'priority': ('priorities', lambda task: task.priority),
+}
+
+
+def month_key(task: Task, shard_size: int) -> str:
+    """Шард по месяцу создания: 2025-01"""
+    return task.creation_date.strftime('%Y-%m')
+
+
+def id_range_key(task: Task, shard_size: int) -> str:
+    """Шард по диапазону id: 000000, 000001, ..."""
+    return f"{task.id // shard_size:06d}"
+
+
+SHARD_KEYS: Dict[str, Callable[[Task, int], str]] = {
+    'month': month_key,
+    'id': id_range_key,
+}
+
+
+def read_manifest(path: Path) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Чтение манифеста -> (раскладка, метаданные)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        document = json.load(f)
+    if not isinstance(document.get('shards'), dict):
+        raise ValueError(f"{path.name} is not a shard manifest")
+    layout = {key: document[key] for key in LAYOUT_KEYS if key in document}
+    metadata = {key: value for key, value in document.items() if key not in LAYOUT_KEYS}
+    return layout, metadata
+
+
+def summarize(tasks: Iterable[Task]) -> Dict[str, Any]:
+    """Сводка шарда для манифеста"""
+    tasks = list(tasks)
+    summary: Dict[str, Any] = {'count': len(tasks)}
+    for field, value in SUMMARY_FIELDS.values():
+        summary[field] = sorted({value(task) for task in tasks}, key=lambda v: (v is None, v or ''))
+    return summary
+
+
+def shard_matches(summary: Dict[str, Any], filters: Dict[str, Any]) -> bool:
+    """Может ли в шарде быть задача, подходящая под фильтры"""
+    if not summary.get('count'):
+        return False
+    for name, wanted in filters.items():
+        if not wanted or name not in SUMMARY_FIELDS:
+            continue
+        field, _ = SUMMARY_FIELDS[name]
+        value = getattr(wanted, 'value', wanted)
+        if field in summary and value not in summary[field]:
+            return False
+    return True
+
+
+class ShardedTaskStorage(TaskStorage):
+    """Манифест + шарды, перезаписываемые только при изменении их задач"""
+
+    saves_all_tasks = False
+
+    def __init__(
+        self,
+        path: Path,
+        shard_by: str = 'month',
+        shard_size: int = DEFAULT_SHARD_SIZE,
+        load_filters: Optional[Dict[str, Any]] = None,
+        fsync: str = 'batched',
+        backups: int = DEFAULT_BACKUPS
+    ):
+        super().__init__(path, fsync)
+        if shard_by not in SHARD_KEYS:
+            raise ValueError(f"Unknown shard layout: {shard_by}")
+        self.shard_by = shard_by
+        self.shard_size = shard_size
+        self.load_filters = load_filters or {}
+        self.backups = backups
+        self.shard_dir = self.path.with_name(self.path.stem + '.shards')
+        self.logger = logging.getLogger(__name__)
+
+        self._lock = threading.Lock()
+        # Загруженные шарды: ключ -> (id -> задача) в порядке добавления
+        self._shards: Dict[str, Dict[int, Task]] = {}
+        self._shard_of: Dict[int, str] = {}
+        # Сводки всех шардов, включая пропущенные при загрузке
+        self._summaries: Dict[str, Dict[str, Any]] = {}
+        self._dirty: Set[str] = set()
+        # Шарды, не загруженные из-за load_filters
+        self.skipped: List[str] = []
+
+    def exists(self) -> bool:
+        """Есть ли манифест, его резервные копии или каталог шардов"""
+        return (
+            self.path.exists()
+            or self.shard_dir.exists()
+            or any(backup_path(self.path, number).exists() for number in range(1, self.backups + 1))
+        )
+
+    def shard_key(self, task: Task) -> str:
+        """Ключ шарда задачи"""
+        return SHARD_KEYS[self.shard_by](task, self.shard_size)
+
+    def shard_path(self, key: str) -> Path:
+        """Файл шарда"""
+        return self.shard_dir / f"{key}.json"
+
+    def dirty_shards(self) -> Set[str]:
+        """Шарды с изменениями, еще не записанными на диск"""
+        with self._lock:
+            return set(self._dirty)
+
+    def load(self) -> List[Dict[str, Any]]:
+        """Загрузка записей задач из шардов, подходящих под load_filters"""
+        return [task.to_dict() for task in self.load_tasks()]
+
+    def load_tasks(self, lazy: bool = False) -> List[Task]:
+        """Загрузка задач из шардов, подходящих под load_filters"""
+        layout, self.metadata = load_snapshot(self.path, self.backups, read_manifest)
+        layout = layout or {}
+        # Раскладка файлов на диске важнее параметров конструктора
+        self.shard_by = layout.get('shard_by', self.shard_by)
+        self.shard_size = layout.get('shard_size', self.shard_size)
+        summaries = dict(layout.get('shards', {}))
+        # Шарды, записанные до сбоя, но не попавшие в манифест
+        if self.shard_dir.exists():
+            for shard_path in self.shard_dir.glob('*.json'):
+                summaries.setdefault(shard_path.stem, {'count': None})
+
+        shards: Dict[str, Dict[int, Task]] = {}
+        self.skipped = []
+        for key in sorted(summaries):
+            summary = summaries[key]
+            if summary.get('count') is not None and not shard_matches(summary, self.load_filters):
+                self.skipped.append(key)
+                continue
+            records, _ = load_snapshot(self.shard_path(key), self.backups)
+            shard = shards[key] = {}
+            for record in records:
+                task = Task.from_dict(record, lazy)
+                shard[task.id] = task
+            summaries[key] = summarize(shard.values())
+
+        with self._lock:
+            self._shards = shards
+            self._shard_of = {task_id: key for key, shard in shards.items() for task_id in shard}
+            self._summaries = summaries
+            self._dirty = set()
+        if self.skipped:
+            self.logger.info(f"Skipped {len(self.skipped)} shards not matching load filters")
+        return [task for shard in shards.values() for task in shard.values()]
+
+    def stage(self, changes: Dict[int, Optional[Task]]) -> None:
+        """Перенос изменений в шарды и пометка этих шардов"""
+        with self._lock:
+            for task_id, task in changes.items():
+                old_key = self._shard_of.get(task_id)
+                key = self.shard_key(task) if task is not None else None
+                if old_key is not None and old_key != key:
+                    del self._shards[old_key][task_id]
+                    del self._shard_of[task_id]
+                    self._dirty.add(old_key)
+                if key is not None:
+                    # Запись на место сохраняет порядок задач внутри шарда
+                    self._open_shard(key)[task_id] = task
+                    self._shard_of[task_id] = key
+                    self._dirty.add(key)
+
+    def save(self, tasks: Iterable[Task], changes: Dict[int, Optional[Task]]) -> None:
+        """Перезапись измененных шардов, затем манифеста"""
+        with self._lock:
+            if not self._dirty:
+                return
+            dirty = sorted(self._dirty)
+            self._dirty = set()
+            payloads = {}
+            for key in dirty:
+                shard = self._shards.get(key, {})
+                payloads[key] = [task.to_dict() for task in shard.values()]
+                self._summaries[key] = summarize(shard.values())
+            manifest = self._manifest()
+
+        try:
+            if payloads:
+                self.shard_dir.mkdir(parents=True, exist_ok=True)
+            for key, records in payloads.items():
+                payload = json.dumps(build_document(records, {}), ensure_ascii=False, indent=2)
+                atomic_write(self.shard_path(key), payload.encode('utf-8'), self.durability, self.backups)
+            atomic_write(self.path, manifest, self.durability, self.backups)
+        except Exception:
+            with self._lock:
+                self._dirty.update(dirty)
+            raise
+
+    def replace_all(self, tasks: List[Task]) -> None:
+        """Полная замена содержимого: все известные шарды перезаписываются
+
+        Задач из шардов, пропущенных при загрузке, нет в tasks: такие шарды
+        дочитываются, и их задачи записываются вместе с tasks.
+        """
+        replacement = {task.id: task for task in tasks}
+        with self._lock:
+            for key in list(self.skipped):
+                for task_id, task in self._open_shard(key).items():
+                    replacement.setdefault(task_id, task)
+            self._dirty = set(self._summaries) | set(self._shards)
+            self._shards = {}
+            self._shard_of = {}
+        self.stage(replacement)
+        self.save(tasks, {})
+
+    def _open_shard(self, key: str) -> Dict[int, Task]:
+        """Шард для изменения (под self._lock)
+
+        Пропущенный при загрузке шард дочитывается, чтобы его перезапись
+        не потеряла задачи, которых нет в памяти контроллера.
+        """
+        shard = self._shards.get(key)
+        if shard is None:
+            shard = self._shards[key] = {}
+            if key in self.skipped:
+                records, _ = load_snapshot(self.shard_path(key), self.backups)
+                for record in records:
+                    shard[record['id']] = Task.from_dict(record, lazy=True)
+                self.skipped.remove(key)
+        return shard
+
+    def _manifest(self) -> bytes:
+        """Содержимое манифеста (под self._lock)"""
+        document: Dict[str, Any] = {'version': MANIFEST_VERSION}
+        document.update(self.metadata)
+        document['shard_by'] = self.shard_by
+        document['shard_size'] = self.shard_size
+        document['shards'] = {key: self._summaries[key] for key in sorted(self._summaries)}
+        return json.dumps(document, ensure_ascii=False, indent=2).encode('utf-8')
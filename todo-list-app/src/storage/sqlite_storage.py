@@ -0,0 +1,256 @@
+"""
+Хранилище задач в SQLite
+
+Поля Task.to_dict() разложены по колонкам с индексами по статусу,
+категории, приоритету и сроку выполнения, поэтому фильтрация и
+сортировка выполняются запросами к базе, а не проходом по списку.
+
+Ограничение: задачи по-прежнему загружаются в память все сразу
+(load), как и в остальных хранилищах - контроллер держит полный
+список и ищет задачи по id в нем. Запросы возвращают только id, а
+изменения записываются построчно; постраничной загрузки задач из базы
+нет, поэтому потребление памяти растет с числом задач так же, как у
+JSON-снимка.
+"""
+import json
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Iterable, Optional
+
+from models.task import Task
+from storage.base import TaskStorage
+from storage.json_storage import parse_document
+from indexes.sort_keys import PRIORITY_RANKS, STATUS_RANKS
+
+COLUMNS = (
+    'id', 'title', 'description', 'category', 'priority',
+    'due_date', 'status', 'creation_date', 'modification_date'
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    position INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    title_key TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    category TEXT,
+    priority TEXT NOT NULL,
+    priority_rank INTEGER NOT NULL,
+    due_date TEXT,
+    status TEXT NOT NULL,
+    creation_date TEXT NOT NULL,
+    modification_date TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_position ON tasks (position);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status, position);
+CREATE INDEX IF NOT EXISTS idx_tasks_category ON tasks (category, position);
+CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks (priority, position);
+CREATE INDEX IF NOT EXISTS idx_tasks_priority_rank ON tasks (priority_rank, position);
+CREATE INDEX IF NOT EXISTS idx_tasks_due_date ON tasks (due_date, position);
+CREATE INDEX IF NOT EXISTS idx_tasks_creation_date ON tasks (creation_date, position);
+CREATE INDEX IF NOT EXISTS idx_tasks_title_key ON tasks (title_key, position);
+"""
+
+UPSERT = """
+INSERT INTO tasks (
+    id, position, title, title_key, description, category, priority,
+    priority_rank, due_date, status, creation_date, modification_date
+) VALUES (
+    :id, COALESCE((SELECT MAX(position) FROM tasks), 0) + 1, :title, :title_key,
+    :description, :category, :priority, :priority_rank, :due_date, :status,
+    :creation_date, :modification_date
+)
+ON CONFLICT(id) DO UPDATE SET
+    title = excluded.title,
+    title_key = excluded.title_key,
+    description = excluded.description,
+    category = excluded.category,
+    priority = excluded.priority,
+    priority_rank = excluded.priority_rank,
+    due_date = excluded.due_date,
+    status = excluded.status,
+    creation_date = excluded.creation_date,
+    modification_date = excluded.modification_date
+"""
+
+# Режим PRAGMA synchronous для политики fsync
+SYNCHRONOUS_MODES = {'always': 'FULL', 'batched': 'NORMAL', 'never': 'OFF'}
+
+# Выражения ORDER BY для критериев TaskController.sort_tasks
+SORT_COLUMNS = {
+    'due_date': ['due_date IS NULL', 'due_date'],
+    'priority': ['priority_rank'],
+    'creation_date': ['creation_date'],
+    'title': ['title_key'],
+    'category': ["COALESCE(category, '')"],
+    'status': [
+        'CASE status '
+        + ' '.join(f"WHEN '{status.value}' THEN {rank}" for status, rank in STATUS_RANKS.items())
+        + ' END'
+    ],
+}
+
+
+class SqliteTaskStorage(TaskStorage):
+    """Хранилище задач в базе SQLite с индексированными колонками"""
+
+    supports_queries = True
+    saves_all_tasks = False
+
+    def __init__(self, path: Path, import_from: Optional[str] = None, fsync: str = 'batched'):
+        super().__init__(path, fsync)
+        # Соединение используется и потоком интерфейса, и фоновой записью
+        self.connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.connection.execute(f"PRAGMA synchronous = {SYNCHRONOUS_MODES[fsync]}")
+        self.connection.executescript(SCHEMA)
+        self._lock = threading.RLock()
+
+        if import_from and Path(import_from).exists() and self.count() == 0:
+            self.import_json(Path(import_from))
+
+    def exists(self) -> bool:
+        """База создается при открытии, поэтому хранилище есть всегда"""
+        return True
+
+    def count(self) -> int:
+        """Количество задач в базе"""
+        with self._lock:
+            return self.connection.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+
+    def load(self) -> List[Dict[str, Any]]:
+        """Загрузка всех задач в порядке добавления (целиком, см. описание модуля)"""
+        with self._lock:
+            self.metadata = {
+                key: json.loads(value)
+                for key, value in self.connection.execute("SELECT key, value FROM meta")
+            }
+            cursor = self.connection.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM tasks ORDER BY position"
+            )
+            return [dict(zip(COLUMNS, row)) for row in cursor]
+
+    def save(self, tasks: Iterable[Task], changes: Dict[int, Optional[Task]]) -> None:
+        """Фиксация транзакции с изменениями, уже переданными в stage()"""
+        with self._lock:
+            self.connection.commit()
+
+    def stage(self, changes: Dict[int, Optional[Task]]) -> None:
+        """Применение изменений к базе без фиксации транзакции
+
+        Незафиксированные изменения видны запросам этого же соединения,
+        поэтому контроллер вызывает stage перед фильтрацией и сортировкой.
+        """
+        upserts = []
+        deletes = []
+        for task_id, task in changes.items():
+            if task is None:
+                deletes.append((task_id,))
+            else:
+                upserts.append(self._row(task.to_dict()))
+
+        with self._lock:
+            if upserts:
+                self.connection.executemany(UPSERT, upserts)
+            if deletes:
+                self.connection.executemany("DELETE FROM tasks WHERE id = ?", deletes)
+            self._stage_metadata()
+
+    def replace_all(self, tasks: List[Task]) -> None:
+        """Полная замена содержимого таблицы задач"""
+        with self._lock, self.connection:
+            self.connection.execute("DELETE FROM tasks")
+            self.connection.executemany(UPSERT, [self._row(task.to_dict()) for task in tasks])
+            self._stage_metadata()
+
+    def query_ids(self, filters: Dict[str, Any]) -> List[int]:
+        """Идентификаторы задач, удовлетворяющих фильтрам, в порядке добавления"""
+        where, params = self._where(filters)
+        with self._lock:
+            cursor = self.connection.execute(
+                f"SELECT id FROM tasks{where} ORDER BY position", params
+            )
+            return [row[0] for row in cursor]
+
+    def sorted_ids(self, filters: Dict[str, Any], criteria: str, reverse: bool = False) -> List[int]:
+        """Идентификаторы отфильтрованных задач, отсортированные по критерию"""
+        direction = ' DESC' if reverse else ''
+        order = [column + direction for column in SORT_COLUMNS.get(criteria, SORT_COLUMNS['creation_date'])]
+        # При равных ключах - порядок добавления; обратный порядок - его зеркало
+        order.append('position' + direction)
+
+        where, params = self._where(filters)
+        with self._lock:
+            cursor = self.connection.execute(
+                f"SELECT id FROM tasks{where} ORDER BY {', '.join(order)}", params
+            )
+            return [row[0] for row in cursor]
+
+    def import_json(self, json_path: Path) -> int:
+        """Однократный импорт задач из файла формата tasks.json"""
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data, metadata = parse_document(json.load(f))
+
+        with self._lock, self.connection:
+            self.connection.executemany(UPSERT, [self._row(record) for record in data])
+            self.metadata.update(metadata)
+            self._stage_metadata()
+        return len(data)
+
+    def close(self) -> None:
+        """Фиксация и закрытие соединения"""
+        with self._lock:
+            self.connection.commit()
+            self.connection.close()
+
+    def _stage_metadata(self) -> None:
+        """Запись self.metadata в таблицу meta (без фиксации)"""
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+            [(key, json.dumps(value)) for key, value in self.metadata.items()]
+        )
+
+    @staticmethod
+    def _row(record: Dict[str, Any]) -> Dict[str, Any]:
+        """Запись Task.to_dict() -> параметры запроса UPSERT"""
+        row = {column: record.get(column) for column in COLUMNS}
+        row['description'] = row['description'] or ''
+        row['priority'] = row['priority'] or 'Средний'
+        row['title_key'] = record['title'].lower()
+        row['priority_rank'] = PRIORITY_RANKS.get(row['priority'], 2)
+        return row
+
+    @staticmethod
+    def _where(filters: Dict[str, Any]):
+        """Условие WHERE по фильтрам TaskController.apply_filters"""
+        clauses = []
+        params = []
+        if filters.get('status'):
+            clauses.append('status = ?')
+            params.append(filters['status'].value)
+        if filters.get('category'):
+            clauses.append('category = ?')
+            params.append(filters['category'])
+        if filters.get('priority'):
+            clauses.append('priority = ?')
+            params.append(filters['priority'])
+
+        where = ' WHERE ' + ' AND '.join(clauses) if clauses else ''
+        return where, params
+
+
+if __name__ == '__main__':
+    # Импорт: python -m storage.sqlite_storage data/tasks.json data/tasks.db
+    if len(sys.argv) != 3:
+        print("Usage: python -m storage.sqlite_storage <tasks.json> <tasks.db>")
+        sys.exit(1)
+    storage = SqliteTaskStorage(Path(sys.argv[2]))
+    imported = storage.import_json(Path(sys.argv[1]))
+    storage.close()
+    print(f"Imported {imported} tasks into {sys.argv[2]}")
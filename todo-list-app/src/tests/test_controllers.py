@@ -3,14 +3,17 @@
 """
 import unittest
 import tempfile
+import glob
 import os
 import sys
-from datetime import date
+from datetime import date, timedelta
 
 # Импорты из проекта
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from controllers.task_controller import TaskController
+from controllers import events
 from models.task import TaskStatus
+from indexes.sort_keys import sort_key
 
 class TestTaskControllerUseCases(unittest.TestCase):
     """Use Case тестирование TaskController"""
@@ -22,6 +25,9 @@ class TestTaskControllerUseCases(unittest.TestCase):
     
     def tearDown(self):
         os.unlink(self.temp_file.name)
+        # Резервные копии снимка (tasks.json.1, ...)
+        for backup in glob.glob(self.temp_file.name + '.*'):
+            os.unlink(backup)
     
     # Use Case: Add Task
     def test_uc_add_task_positive(self):
@@ -77,4 +83,381 @@ class TestTaskControllerUseCases(unittest.TestCase):
     def test_uc_delete_task_negative_not_found(self):
         """UC-DT-002: Удаление несуществующей задачи"""
         result = self.controller.delete_task(999)
-        self.assertFalse(result)
\ No newline at end of file
+        self.assertFalse(result)
+
+    def test_delete_keeps_indexes_in_sync(self):
+        """Удаление убирает задачу из индекса и отфильтрованного списка"""
+        task1 = self.controller.create_task({'title': 'Task 1'})
+        task2 = self.controller.create_task({'title': 'Task 2'})
+        self.controller.delete_task(task1.id)
+
+        self.assertIsNone(self.controller.find_task(task1.id))
+        self.assertIs(self.controller.find_task(task2.id), task2)
+        self.assertEqual(self.controller.filtered_tasks.ids(), [task2.id])
+
+    def test_filters_follow_updates(self):
+        """Фильтры учитывают изменения категории и статуса"""
+        task1 = self.controller.create_task({'title': 'Task 1', 'category': 'Работа'})
+        task2 = self.controller.create_task({'title': 'Task 2', 'category': 'Дом'})
+        self.controller.update_task(task2.id, {'title': 'Task 2', 'category': 'Работа'})
+        self.controller.change_task_status(task1.id, TaskStatus.IN_PROGRESS)
+
+        work = self.controller.apply_filters({'category': 'Работа'})
+        self.assertEqual([t.id for t in work], [task1.id, task2.id])
+        in_progress = self.controller.apply_filters({
+            'category': 'Работа', 'status': TaskStatus.IN_PROGRESS
+        })
+        self.assertEqual([t.id for t in in_progress], [task1.id])
+
+    def test_sort_survives_mutations(self):
+        """Сортировка сохраняется при создании, изменении и удалении задач"""
+        task_b = self.controller.create_task({'title': 'B', 'category': 'Работа'})
+        task_c = self.controller.create_task({'title': 'C', 'category': 'Работа'})
+        self.controller.apply_filters({'category': 'Работа'})
+        self.controller.set_sort('title')
+
+        task_a = self.controller.create_task({'title': 'A', 'category': 'Работа'})
+        self.controller.create_task({'title': 'D', 'category': 'Дом'})
+        self.assertEqual(self.controller.filtered_tasks.ids(), [task_a.id, task_b.id, task_c.id])
+
+        self.controller.update_task(task_a.id, {'title': 'E', 'category': 'Работа'})
+        self.assertEqual(self.controller.filtered_tasks.ids(), [task_b.id, task_c.id, task_a.id])
+
+        self.controller.update_task(task_b.id, {'title': 'B', 'category': 'Дом'})
+        self.controller.delete_task(task_c.id)
+        self.assertEqual(self.controller.filtered_tasks.ids(), [task_a.id])
+
+    def test_sort_matches_full_sort(self):
+        """Сортировка по индексу совпадает с sorted(), обратная - ее зеркало"""
+        priorities = ['Низкий', 'Высокий', 'Средний']
+        for i in range(12):
+            task = self.controller.create_task({
+                'title': f'Task {i % 5}',
+                'priority': priorities[i % 3],
+                'category': 'Работа' if i % 2 else None,
+                'due_date': date.today() + timedelta(days=i % 4) if i % 3 else None,
+            })
+            if i % 4 == 0:
+                self.controller.change_task_status(task.id, TaskStatus.COMPLETED)
+
+        for filters in ({}, {'category': 'Работа'}):
+            self.controller.apply_filters(filters)
+            for criteria in ('due_date', 'priority', 'creation_date', 'title', 'category', 'status'):
+                for reverse in (False, True):
+                    with self.subTest(filters=filters, criteria=criteria, reverse=reverse):
+                        self.controller.set_sort(None)
+                        expected = sorted(self.controller.filtered_tasks, key=sort_key(criteria))
+                        if reverse:
+                            expected.reverse()
+                        self.assertEqual(self.controller.sort_tasks(criteria, reverse), expected)
+                        self.controller.set_sort(criteria, reverse)
+                        self.assertEqual(list(self.controller.filtered_tasks), expected)
+
+    def test_status_counts_and_overdue_follow_changes(self):
+        """Счетчики и просроченные задачи следуют за изменениями"""
+        task1 = self.controller.create_task({'title': 'Task 1', 'due_date': date.today()})
+        task2 = self.controller.create_task({'title': 'Task 2'})
+        self.controller.change_task_status(task2.id, TaskStatus.COMPLETED)
+        self.assertEqual(self.controller.count_by_status(TaskStatus.COMPLETED), 1)
+        self.assertEqual(self.controller.get_due_soon_ids(), {task1.id})
+        self.assertEqual(self.controller.get_overdue_ids(), set())
+
+        self.controller.delete_task(task2.id)
+        self.assertEqual(self.controller.count_by_status(TaskStatus.COMPLETED), 0)
+        self.assertEqual(self.controller.count_by_status(TaskStatus.NOT_STARTED), 1)
+
+    def test_statistics_snapshot(self):
+        """Снимок статистики следует за изменениями и совпадает после загрузки"""
+        task1 = self.controller.create_task({'title': 'Task 1', 'category': 'Работа', 'priority': 'Высокий'})
+        task2 = self.controller.create_task({'title': 'Task 2', 'due_date': date.today()})
+        self.controller.update_task(task1.id, {'title': 'Task 1', 'category': 'Дом', 'priority': 'Высокий'})
+        self.controller.change_task_status(task1.id, TaskStatus.COMPLETED)
+        self.controller.apply_filters({'status': TaskStatus.COMPLETED})
+
+        stats = self.controller.get_statistics()
+        self.assertEqual(stats['total'], 2)
+        self.assertEqual(stats['by_status'], {TaskStatus.COMPLETED: 1, TaskStatus.NOT_STARTED: 1})
+        self.assertEqual(stats['by_priority'], {'Высокий': 1, 'Средний': 1})
+        self.assertEqual(stats['by_category'], {'Дом': 1, None: 1})
+        self.assertEqual((stats['completed'], stats['active'], stats['overdue'], stats['filtered']), (1, 1, 0, 1))
+
+        self.controller.final_save()
+        loaded = TaskController(storage_path=self.temp_file.name).get_statistics()
+        self.assertEqual(loaded['by_category'], stats['by_category'])
+        self.controller.delete_task(task2.id)
+        self.assertEqual(self.controller.get_statistics()['by_status'], {TaskStatus.COMPLETED: 1})
+
+    def test_lazy_load_defers_decoding_and_indexes(self):
+        """Ленивая загрузка: индексы строятся по требованию, результаты те же"""
+        self.controller.create_task({'title': 'B', 'category': 'Работа', 'due_date': date.today()})
+        self.controller.create_task({'title': 'A', 'category': 'Дом'})
+        self.controller.final_save()
+
+        lazy = TaskController(storage_path=self.temp_file.name, lazy_load=True)
+        self.assertIsNone(lazy._indexes)
+        self.assertEqual(lazy.order_indexes.indexes, {})
+        self.assertIsInstance(lazy.tasks[0]._due, str)
+
+        self.assertEqual([t.title for t in lazy.apply_filters({'category': 'Работа'})], ['B'])
+        self.assertEqual([t.title for t in lazy.apply_filters({})], ['B', 'A'])
+        self.assertEqual([t.title for t in lazy.sort_tasks('title')], ['A', 'B'])
+        self.assertEqual(lazy.get_due_soon_ids(), {lazy.tasks[0].id})
+        self.assertEqual(
+            [t.to_dict() for t in lazy.tasks], [t.to_dict() for t in self.controller.tasks]
+        )
+
+    def test_pending_changes_track_fields(self):
+        """Набор изменений хранит созданные, измененные поля и удаления"""
+        # Отложенная запись с большой задержкой: изменения копятся до flush()
+        controller = TaskController(storage_path=self.temp_file.name, write_behind=True, write_delay=60)
+        task1 = controller.create_task({'title': 'Task 1'})
+        task2 = controller.create_task({'title': 'Task 2'})
+        controller.flush()
+        self.assertFalse(task1.is_dirty)
+
+        controller.update_task(task1.id, {'title': 'Task 1', 'priority': 'Высокий'})
+        controller.delete_task(task2.id)
+        task3 = controller.create_task({'title': 'Task 3'})
+        changes = controller.get_pending_changes()
+        self.assertEqual(changes.created_ids(), {task3.id})
+        self.assertEqual(changes.updated_ids(), {task1.id})
+        self.assertEqual(changes.changed_fields(task1.id), {'priority'})
+        self.assertEqual(changes.deleted_ids(), {task2.id})
+
+        controller.final_save()
+        self.assertEqual(len(controller.get_pending_changes()), 0)
+        self.assertFalse(task1.is_dirty)
+
+    def test_write_keeps_fields_changed_after_collecting(self):
+        """Запись снимает пометки только с полей, попавших в набор изменений"""
+        controller = TaskController(storage_path=self.temp_file.name, write_behind=True, write_delay=60)
+        task = controller.create_task({'title': 'Task'})
+        controller.update_task(task.id, {'title': 'Task', 'priority': 'Высокий'})
+        # Поле изменено, но набор изменений еще не получил его (гонка с потоком записи)
+        task.update(description='Описание')
+        controller.flush()
+        self.assertEqual(task.dirty_fields, {'description'})
+
+        controller._mark_updated(task)
+        self.assertEqual(controller.get_pending_changes().changed_fields(task.id), {'description'})
+        controller.final_save()
+        self.assertFalse(task.is_dirty)
+
+    def test_unchanged_update_is_not_saved(self):
+        """Обновление без фактических изменений не вызывает сохранения"""
+        task = self.controller.create_task({'title': 'Task'})
+        os.utime(self.temp_file.name, (0, 0))
+        self.controller.update_task(task.id, {'title': 'Task'})
+        self.assertEqual(os.path.getmtime(self.temp_file.name), 0)
+
+    def test_bulk_operations(self):
+        """Пакетные операции: результаты по элементам и одна запись"""
+        with self.assertRaises(ValueError):
+            self.controller.create_tasks([{'title': 'Ok'}, {'title': ''}])
+        self.assertEqual(len(self.controller.tasks), 0)
+
+        os.unlink(self.temp_file.name)
+        self.assertEqual(self.controller.create_tasks([]), [])
+        self.assertFalse(os.path.exists(self.temp_file.name))
+        tasks = self.controller.create_tasks([
+            {'title': f'Task {i}', 'category': 'Работа' if i % 2 else 'Дом'} for i in range(6)
+        ])
+        self.assertEqual([t.id for t in tasks], [1, 2, 3, 4, 5, 6])
+        # Одна запись: предыдущей версии снимка нет
+        self.assertEqual(glob.glob(self.temp_file.name + '.*'), [])
+
+        self.controller.apply_filters({'category': 'Работа'})
+        self.controller.set_sort('title', reverse=True)
+        updated = self.controller.update_tasks({1: {'title': 'Task 9', 'category': 'Работа'}, 99: {'title': 'X'}})
+        self.assertEqual(updated, {1: tasks[0], 99: None})
+        statuses = self.controller.change_status_many([2, 4, 100], TaskStatus.COMPLETED)
+        self.assertIsNone(statuses[100])
+        self.assertEqual(statuses[2].status, TaskStatus.COMPLETED)
+        self.assertEqual(self.controller.delete_tasks([6, 6, 100]), {6: True, 100: False})
+
+        self.assertEqual(self.controller.filtered_tasks.ids(), [1, 4, 2])
+        self.assertEqual(self.controller.count_by_status(TaskStatus.COMPLETED), 2)
+        loaded = TaskController(storage_path=self.temp_file.name)
+        self.assertEqual([t.to_dict() for t in loaded.tasks], [t.to_dict() for t in self.controller.tasks])
+
+    def test_transaction_commits_once(self):
+        """Транзакция: одна фильтрация и одна запись при фиксации"""
+        os.unlink(self.temp_file.name)
+        with self.controller.transaction():
+            task1 = self.controller.create_task({'title': 'Task 1', 'category': 'Работа'})
+            task2 = self.controller.create_task({'title': 'Task 2'})
+            self.controller.apply_filters({'category': 'Работа'})
+            self.controller.change_task_status(task2.id, TaskStatus.COMPLETED)
+            self.assertFalse(os.path.exists(self.temp_file.name))
+
+        self.assertEqual(glob.glob(self.temp_file.name + '*'), [self.temp_file.name])
+        self.assertEqual(self.controller.filtered_tasks.ids(), [task1.id])
+        loaded = TaskController(storage_path=self.temp_file.name)
+        self.assertEqual(loaded.find_task(task2.id).status, TaskStatus.COMPLETED)
+
+    def test_transaction_rolls_back_on_error(self):
+        """Исключение в транзакции возвращает задачи в памяти к исходному состоянию"""
+        tasks = [self.controller.create_task({'title': f'Task {i}'}) for i in range(3)]
+        self.controller.apply_filters({})
+        self.controller.set_sort('title', reverse=True)
+        before = [t.to_dict() for t in self.controller.tasks]
+        view = self.controller.filtered_tasks.ids()
+
+        with self.assertRaises(RuntimeError):
+            with self.controller.transaction():
+                self.controller.update_task(tasks[0].id, {'title': 'Changed'})
+                self.controller.delete_task(tasks[1].id)
+                self.controller.change_task_status(tasks[2].id, TaskStatus.COMPLETED)
+                self.controller.create_task({'title': 'Task 3'})
+                self.controller.apply_filters({'status': TaskStatus.COMPLETED})
+                raise RuntimeError("abort")
+
+        self.assertEqual([t.to_dict() for t in self.controller.tasks], before)
+        self.assertIs(self.controller.find_task(tasks[1].id), tasks[1])
+        self.assertEqual(self.controller.filtered_tasks.ids(), view)
+        self.assertEqual(len(self.controller.get_pending_changes()), 0)
+        self.assertEqual(self.controller.count_by_status(TaskStatus.COMPLETED), 0)
+        loaded = TaskController(storage_path=self.temp_file.name)
+        self.assertEqual([t.to_dict() for t in loaded.tasks], before)
+
+    def test_rollback_keeps_changes_of_failed_write(self):
+        """Изменения неудачной записи, вернувшиеся во время транзакции, переживают откат"""
+        controller = TaskController(storage_path=self.temp_file.name + '.store', storage_mode='journal')
+        save = controller.storage.save
+        transaction = controller.transaction()
+
+        def failing_save(tasks, changes):
+            # Транзакция открывается, пока запись еще идет
+            transaction.__enter__()
+            raise OSError("disk full")
+
+        controller.storage.save = failing_save
+        task = controller.create_task({'title': 'Task 1'})
+        controller.storage.save = save
+        controller.create_task({'title': 'Task 2'})
+        transaction.__exit__(RuntimeError, RuntimeError("abort"), None)
+
+        self.assertEqual(set(controller.get_pending_changes()), {task.id})
+        controller.final_save()
+        loaded = TaskController(storage_path=self.temp_file.name + '.store', storage_mode='journal')
+        self.assertEqual([t.title for t in loaded.tasks], ['Task 1'])
+        loaded.final_save()
+
+    def test_change_events(self):
+        """Изменения публикуются событиями с измененными полями"""
+        received = []
+        unsubscribe = self.controller.events.subscribe(received.append)
+
+        task = self.controller.create_task({'title': 'Task 1'})
+        self.controller.update_task(task.id, {'title': 'Task 1'})
+        self.controller.update_task(task.id, {'title': 'Renamed', 'priority': 'Высокий'})
+        self.controller.change_task_status(task.id, TaskStatus.COMPLETED)
+        self.controller.apply_filters({'status': TaskStatus.COMPLETED})
+        self.controller.set_sort('title')
+        self.controller.delete_task(task.id)
+        self.controller.load_tasks()
+
+        self.assertEqual([e.kind for e in received], [
+            events.CREATED, events.UPDATED, events.STATUS_CHANGED,
+            events.FILTERS_CHANGED, events.FILTERS_CHANGED, events.DELETED, events.RELOADED,
+        ])
+        self.assertEqual(received[1].fields, {'title', 'priority'})
+        self.assertEqual(received[5].task_id, task.id)
+
+        unsubscribe()
+        self.controller.create_task({'title': 'Task 2'})
+        self.assertEqual(len(received), 7)
+
+    def test_filters_event_sees_new_view(self):
+        """Подписчик на смену фильтров видит уже перестроенное представление"""
+        task1 = self.controller.create_task({'title': 'Task 1', 'category': 'Работа'})
+        self.controller.create_task({'title': 'Task 2'})
+        seen = []
+        self.controller.events.subscribe(
+            lambda event: seen.append(self.controller.filtered_tasks.ids()),
+            kinds=[events.FILTERS_CHANGED]
+        )
+        self.controller.apply_filters({'category': 'Работа'})
+        self.assertEqual(seen, [[task1.id]])
+
+    def test_transaction_events_delivered_on_commit(self):
+        """В транзакции события копятся до фиксации; откат сообщает о перезагрузке"""
+        received = []
+        self.controller.events.subscribe(received.append, kinds=events.TASK_EVENTS)
+        with self.controller.transaction():
+            task = self.controller.create_task({'title': 'Task 1'})
+            self.controller.change_task_status(task.id, TaskStatus.COMPLETED)
+            self.controller.apply_filters({})
+            self.assertEqual(received, [])
+        self.assertEqual([e.kind for e in received], [events.CREATED, events.STATUS_CHANGED])
+
+        received.clear()
+        reloads = []
+        self.controller.events.subscribe(reloads.append, kinds=[events.RELOADED])
+        with self.assertRaises(RuntimeError):
+            with self.controller.transaction():
+                self.controller.delete_task(task.id)
+                raise RuntimeError("abort")
+        self.assertEqual(received, [])
+        self.assertEqual([e.kind for e in reloads], [events.RELOADED])
+
+    def test_search_combines_with_filters(self):
+        """Поиск следует за изменениями и учитывает фильтры"""
+        task1 = self.controller.create_task({'title': 'Отчет за квартал', 'category': 'Работа'})
+        task2 = self.controller.create_task({'title': 'Письмо', 'description': 'Приложить отчеты'})
+        self.assertEqual(self.controller.search('отчёт'), [task1, task2])
+
+        self.controller.apply_filters({'category': 'Работа'})
+        self.assertEqual(self.controller.search('отчет'), [task1])
+        self.assertEqual(self.controller.search('отчет', filters={}), [task1, task2])
+
+        self.controller.update_task(task1.id, {'title': 'Квартал', 'category': 'Работа'})
+        self.assertEqual(self.controller.search('отчет'), [])
+        self.controller.delete_task(task2.id)
+        self.assertEqual(self.controller.search('отч', filters={}), [])
+
+    def test_set_search_filters_view(self):
+        """Строка поиска сужает представление и сочетается с фильтрами"""
+        task1 = self.controller.create_task({'title': 'Отчет за квартал', 'category': 'Работа'})
+        task2 = self.controller.create_task({'title': 'Отчеты', 'category': 'Дом'})
+        self.controller.create_task({'title': 'Письмо', 'category': 'Работа'})
+
+        view = self.controller.set_search('отч')
+        self.assertEqual(set(view.ids()), {task1.id, task2.id})
+
+        self.controller.apply_filters({'category': 'Работа', 'query': 'отч'})
+        self.assertEqual(self.controller.get_filtered_tasks().ids(), [task1.id])
+        self.assertEqual(self.controller.search('квартал'), [task1])
+
+        # Новая подходящая задача сразу попадает в представление
+        task4 = self.controller.create_task({'title': 'Отчет о поездке', 'category': 'Работа'})
+        self.assertIn(task4.id, self.controller.get_filtered_tasks().ids())
+
+        view = self.controller.set_search('  ')
+        self.assertEqual(self.controller.current_filters, {'category': 'Работа'})
+        self.assertEqual(len(view), 3)
+
+        # Уточнение строки поиска сохраняет порядок сортировки
+        self.controller.set_sort('title')
+        self.controller.set_search('отчет')
+        view = self.controller.set_search('отчет по')
+        self.assertEqual(view.ids(), [task4.id])
+        view = self.controller.set_search('отчет')
+        self.assertEqual(view.ids(), [task1.id, task4.id])
+
+        # Первая буква нового слова не сужает и не опустошает список
+        self.controller.apply_filters({})
+        self.assertEqual(len(self.controller.set_search('о')), 4)
+        self.assertEqual(self.controller.set_search('отчет к').ids(), [task1.id, task4.id, task2.id])
+        self.assertEqual(self.controller.set_search('отчет кв').ids(), [task1.id])
+        self.controller.apply_filters({'category': 'Работа'})
+
+        # Строка без слов - не поиск: видны все задачи по фильтрам
+        view = self.controller.set_search('?')
+        self.assertNotIn('query', self.controller.current_filters)
+        self.assertEqual(len(view), 3)
+        task5 = self.controller.create_task({'title': 'Отчет', 'category': 'Работа'})
+        self.assertEqual(len(self.controller.get_filtered_tasks()), 4)
+        self.controller.apply_filters({'category': 'Работа', 'query': '?'})
+        self.assertIn(task5.id, self.controller.get_filtered_tasks().ids())
+        self.assertEqual(len(self.controller.get_filtered_tasks()), 4)
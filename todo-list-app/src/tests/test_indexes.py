@@ -0,0 +1,392 @@
+"""
+Тесты индексов и коллекций задач
+"""
+import unittest
+import os
+import sys
+from datetime import date, timedelta
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from models.task import Task, TaskStatus
+from indexes.task_list import TaskList
+from indexes.secondary_index import SecondaryIndexes
+from indexes.sorted_list import SortedList
+from indexes.live_view import LiveView
+from indexes.order_index import OrderIndex
+from indexes.column_store import TaskColumns
+from indexes.deadline_buckets import DeadlineBuckets, deadline_bucket, OVERDUE, DUE_SOON, ON_TRACK, NO_DEADLINE
+from indexes.search_index import SearchIndex, matches_query, narrows, stem
+
+
+class TestTaskList(unittest.TestCase):
+    """Тесты коллекции задач с индексом по id"""
+
+    def setUp(self):
+        self.tasks = [Task(title=f'Task {i}', task_id=i) for i in range(1, 6)]
+        self.task_list = TaskList(self.tasks)
+
+    def test_sequence_behaviour(self):
+        """Порядок, длина, индексация и срезы как у списка"""
+        self.assertEqual(len(self.task_list), 5)
+        self.assertEqual(list(self.task_list), self.tasks)
+        self.assertIs(self.task_list[0], self.tasks[0])
+        self.assertIs(self.task_list[-1], self.tasks[-1])
+        self.assertEqual(self.task_list[1:3], self.tasks[1:3])
+        self.assertEqual(self.task_list, self.tasks)
+
+    def test_lookup_and_remove_by_id(self):
+        """Поиск и удаление по id"""
+        self.assertIs(self.task_list.get(3), self.tasks[2])
+        self.assertIsNone(self.task_list.get(42))
+
+        removed = self.task_list.remove(3)
+        self.assertIs(removed, self.tasks[2])
+        self.assertIsNone(self.task_list.remove(3))
+        self.assertEqual(self.task_list.ids(), [1, 2, 4, 5])
+        self.assertIs(self.task_list[2], self.tasks[3])
+        self.assertNotIn(self.tasks[2], self.task_list)
+
+    def test_add_keeps_order(self):
+        """Новые задачи добавляются в конец, существующие не перемещаются"""
+        extra = Task(title='Extra', task_id=10)
+        self.task_list.add(extra)
+        self.task_list.add(self.tasks[0])
+        self.assertEqual(self.task_list.ids(), [1, 2, 3, 4, 5, 10])
+        self.assertIn(extra, self.task_list)
+
+
+class TestSecondaryIndexes(unittest.TestCase):
+    """Тесты инвертированных индексов фильтрации"""
+
+    def setUp(self):
+        self.tasks = [
+            Task(title='A', category='Работа', priority='Высокий', task_id=1),
+            Task(title='B', category='Работа', priority='Низкий', task_id=2),
+            Task(title='C', category='Дом', priority='Высокий', task_id=3),
+        ]
+        self.tasks[0].set_status(TaskStatus.COMPLETED)
+        self.indexes = SecondaryIndexes()
+        self.indexes.rebuild(self.tasks)
+
+    def test_query_intersects_fields(self):
+        """Фильтр пересекает множества по всем заданным полям"""
+        self.assertIsNone(self.indexes.query({}))
+        self.assertEqual(self.indexes.query({'category': 'Работа'}), {1, 2})
+        self.assertEqual(self.indexes.query({'category': 'Работа', 'priority': 'Высокий'}), {1})
+        self.assertEqual(self.indexes.query({'status': TaskStatus.NOT_STARTED, 'priority': 'Высокий'}), {3})
+        self.assertEqual(self.indexes.query({'category': 'Другое'}), set())
+
+    def test_remove_and_add_on_change(self):
+        """Изменение поля переносит задачу между множествами"""
+        task = self.tasks[2]
+        self.indexes.remove(task)
+        task.update(category='Работа')
+        self.indexes.add(task)
+        self.assertEqual(self.indexes.query({'category': 'Работа'}), {1, 2, 3})
+        self.assertEqual(self.indexes.query({'category': 'Дом'}), set())
+
+
+
+class TestSortedList(unittest.TestCase):
+    """Тесты отсортированного списка с корзинами"""
+
+    def test_matches_sorted_across_buckets(self):
+        """Вставки и удаления дают тот же порядок, что и sorted()"""
+        values = [(i * 7919) % 3001 for i in range(3001)]
+        sorted_list = SortedList()
+        for value in values:
+            sorted_list.add(value)
+        for value in values[::3]:
+            sorted_list.remove(value)
+        expected = sorted(values)
+        for value in values[::3]:
+            expected.remove(value)
+
+        self.assertEqual(list(sorted_list), expected)
+        self.assertEqual(list(reversed(sorted_list)), expected[::-1])
+        self.assertEqual(len(sorted_list), len(expected))
+        self.assertEqual(sorted_list[1500], expected[1500])
+        self.assertEqual(sorted_list.index(expected[-1]), len(expected) - 1)
+        with self.assertRaises(ValueError):
+            sorted_list.remove(values[0])
+
+    def test_slices_across_buckets(self):
+        """Срезы по позициям совпадают со срезами списка"""
+        values = list(range(0, 5000, 3))
+        sorted_list = SortedList(values)
+        for start, stop in ((0, 10), (500, 1200), (1600, 2000), (-5, None), (10, 5)):
+            self.assertEqual(sorted_list[start:stop], values[start:stop])
+        self.assertEqual(sorted_list[1:20:4], values[1:20:4])
+
+
+class TestLiveView(unittest.TestCase):
+    """Тесты живого представления отфильтрованных задач"""
+
+    def setUp(self):
+        self.tasks = {
+            1: Task(title='b', category='Работа', task_id=1),
+            2: Task(title='a', category='Работа', task_id=2),
+            3: Task(title='c', category='Дом', task_id=3),
+        }
+        self.view = LiveView(self.tasks.get)
+        self.view.rebuild([self.tasks[1], self.tasks[2]], {'category': 'Работа'})
+
+    def test_sort_is_kept_on_changes(self):
+        """Измененная задача переставляется, остальные остаются на местах"""
+        self.view.set_sort('title')
+        self.assertEqual(self.view.ids(), [2, 1])
+
+        task = self.tasks[2]
+        self.view.discard(task.id)
+        task.update(title='z')
+        self.view.offer(task)
+        self.assertEqual(self.view.ids(), [1, 2])
+        self.assertEqual(self.view.index_of(2), 1)
+
+        self.view.set_sort('title', reverse=True)
+        self.assertEqual([t.title for t in self.view], ['z', 'b'])
+        self.assertIs(self.view[0], task)
+
+    def test_offer_respects_filters(self):
+        """Задачи, не подходящие под фильтры, в представление не попадают"""
+        self.assertFalse(self.view.offer(self.tasks[3]))
+        self.tasks[3].update(category='Работа')
+        self.assertTrue(self.view.offer(self.tasks[3]))
+        self.assertEqual(self.view.ids(), [1, 2, 3])
+
+    def test_reverse_is_mirror(self):
+        """Обратный порядок - зеркало прямого, и при равных ключах тоже"""
+        tasks = list(self.tasks.values())
+        self.view.rebuild(tasks, {})
+        self.view.set_sort('priority')
+        forward = list(self.view)
+        self.view.set_sort('priority', reverse=True)
+        self.assertEqual(list(self.view), forward[::-1])
+        self.assertEqual(self.view.index_of(forward[0].id), len(forward) - 1)
+
+    def test_window_slices(self):
+        """Срез представления - окно строк в порядке отображения"""
+        tasks = [Task(title=f'Задача {i:04d}', task_id=i) for i in range(1, 1501)]
+        by_id = {task.id: task for task in tasks}
+        view = LiveView(by_id.get)
+        view.rebuild(tasks, {})
+        view.set_sort('title')
+        self.assertEqual(view[700:705], tasks[700:705])
+        view.set_sort('title', reverse=True)
+        self.assertEqual(view[0:3], tasks[::-1][0:3])
+        self.assertEqual(view[1498:1600], tasks[1::-1])
+        self.assertEqual(view[5:5], [])
+
+
+class TestOrderIndex(unittest.TestCase):
+    """Тесты упорядоченного индекса сортировки"""
+
+    def setUp(self):
+        priorities = ['Низкий', 'Высокий', 'Средний', 'Высокий', 'Низкий']
+        self.tasks = [
+            Task(title=f'Task {i}', priority=priority, task_id=i)
+            for i, priority in enumerate(priorities, 1)
+        ]
+        self.index = OrderIndex('priority')
+        self.index.rebuild(self.tasks)
+
+    def test_walk_matches_sorted(self):
+        """Прямой обход совпадает с sorted(), обратный - его зеркало"""
+        expected = [t.id for t in sorted(self.tasks, key=self.index.key)]
+        self.assertEqual(self.index.ids(), expected)
+        self.assertEqual(self.index.ids(reverse=True), expected[::-1])
+
+    def test_member_filter_and_changes(self):
+        """Отбор по id и перестановка измененной задачи"""
+        task = self.tasks[0]
+        self.index.remove(task)
+        task.update(priority='Высокий')
+        self.index.add(task)
+        self.assertEqual(self.index.ids(reverse=True), [4, 2, 1, 3, 5])
+        self.assertEqual(self.index.ids(lambda task_id: task_id % 2 == 1), [5, 3, 1])
+
+
+class TestTaskColumns(unittest.TestCase):
+    """Тесты колоночного хранилища и векторных масок"""
+
+    def setUp(self):
+        today = date.today()
+        categories = ['Работа', 'Дом', None]
+        priorities = ['Высокий', 'Средний', 'Низкий']
+        statuses = list(TaskStatus)
+        self.tasks = []
+        for i in range(1, 25):
+            task = Task(
+                title=f'Task {i}',
+                category=categories[i % 3],
+                priority=priorities[i % 2],
+                due_date=today + timedelta(days=i % 7 - 3) if i % 5 else None,
+                task_id=i
+            )
+            task.set_status(statuses[i % 4])
+            self.tasks.append(task)
+        self.columns = TaskColumns(self.tasks)
+
+    def test_masks_match_task_methods(self):
+        """Маски совпадают с is_overdue и is_due_soon по объектам"""
+        self.assertEqual(self.columns.overdue_ids(), [t.id for t in self.tasks if t.is_overdue()])
+        self.assertEqual(self.columns.due_soon_ids(), [t.id for t in self.tasks if t.is_due_soon()])
+        self.assertEqual(self.columns.no_deadline_ids(), [t.id for t in self.tasks if not t.due_date])
+
+    def test_remove_and_reuse_rows(self):
+        """Удаленная строка исключается из масок и занимается повторно"""
+        self.columns.remove(1)
+        self.assertNotIn(1, self.columns.ids(self.columns.live_mask()))
+        self.assertEqual(len(self.columns), 23)
+
+        task = Task(title='New', category='Дом', task_id=100)
+        self.columns.add(task)
+        self.assertEqual(len(self.columns.row_ids), 24)
+        self.assertIn(100, self.columns.no_deadline_ids())
+
+
+class TestDeadlineBuckets(unittest.TestCase):
+    """Тесты корзин сроков с кэшем до смены дня"""
+
+    def setUp(self):
+        self.today = date(2030, 6, 15)
+        self.tasks = [
+            Task(title='Просрочена', due_date=self.today - timedelta(days=1), task_id=1),
+            Task(title='Сегодня', due_date=self.today, task_id=2),
+            Task(title='Через неделю', due_date=self.today + timedelta(days=7), task_id=3),
+            Task(title='Без срока', task_id=4),
+            Task(title='Выполнена', due_date=self.today - timedelta(days=5), task_id=5),
+        ]
+        self.tasks[4].set_status(TaskStatus.COMPLETED)
+        self.columns = TaskColumns(self.tasks)
+        self.buckets = DeadlineBuckets(self.columns)
+
+    def test_single_pass_matches_task_methods(self):
+        """Классификация совпадает с is_overdue/is_due_soon на ту же дату"""
+        buckets = self.buckets.classify(self.today)
+        self.assertEqual(buckets[OVERDUE], {1})
+        self.assertEqual(buckets[DUE_SOON], {2})
+        self.assertEqual(buckets[ON_TRACK], {3, 5})
+        self.assertEqual(buckets[NO_DEADLINE], {4})
+        for task in self.tasks:
+            self.assertEqual(deadline_bucket(task, self.today), self.buckets.bucket_of(task.id, self.today))
+            self.assertEqual(task.is_overdue(self.today), task.id in buckets[OVERDUE])
+            self.assertEqual(task.is_due_soon(self.today), task.id in buckets[DUE_SOON])
+
+    def test_cached_until_day_changes(self):
+        """Изменения переносят одну задачу, полный пересчет - только при смене дня"""
+        self.buckets.classify(self.today)
+        task = self.tasks[0]
+        self.columns.remove(task.id)
+        self.buckets.discard(task.id)
+        task.set_status(TaskStatus.COMPLETED)
+        self.columns.add(task)
+        self.buckets.update(task)
+
+        self.assertEqual(self.buckets.classify(self.today)[OVERDUE], set())
+        self.assertEqual(self.buckets.rebuilds, 1)
+
+        tomorrow = self.buckets.classify(self.today + timedelta(days=1))
+        self.assertEqual(tomorrow[OVERDUE], {2})
+        self.assertEqual(self.buckets.rebuilds, 2)
+
+    def test_other_dates_do_not_rebuild_current(self):
+        """Чередование явной даты и сегодняшней не пересчитывает корзины каждый раз"""
+        today = date.today()
+        for _ in range(3):
+            self.buckets.classify()
+            self.buckets.classify(today + timedelta(days=30))
+        self.assertEqual(self.buckets.rebuilds, 2)
+        self.assertEqual(self.buckets.today, today)
+        self.assertEqual(
+            self.buckets.bucket_of(2, self.today), deadline_bucket(self.tasks[1], self.today)
+        )
+
+        # Изменение задачи сбрасывает кэш других дат, но не текущие корзины
+        self.buckets.update(self.tasks[2])
+        self.buckets.classify(today + timedelta(days=30))
+        self.buckets.classify()
+        self.assertEqual(self.buckets.rebuilds, 4)
+
+
+class TestSearchIndex(unittest.TestCase):
+    """Тесты полнотекстового индекса"""
+
+    def setUp(self):
+        self.tasks = [
+            Task(title='Купить молоко', description='И хлеб к ужину', task_id=1),
+            Task(title='Отчет', description='Собрать задачи для отчета по молоку', task_id=2),
+            Task(title='Задачи на неделю', description='', task_id=3),
+            Task(title='Ёлка', description='Нарядить к празднику', task_id=4),
+        ]
+        self.index = SearchIndex(self.tasks)
+
+    def ids(self, query):
+        return [task_id for task_id, _ in self.index.search(query)]
+
+    def test_word_forms_and_case(self):
+        """Поиск не зависит от регистра, е/ё и формы слова"""
+        self.assertEqual(stem('задачами'), stem('задача'))
+        self.assertEqual(self.ids('ЗАДАЧА'), [3, 2])
+        self.assertEqual(self.ids('елки'), [4])
+
+    def test_prefix_and_all_words(self):
+        """Термины запроса сопоставляются по началу слова; нужны все слова"""
+        self.assertEqual(self.ids('отч'), [2])
+        self.assertEqual(self.ids('молоко отчет'), [2])
+        self.assertEqual(self.ids('молоко хлеб'), [1])
+        self.assertEqual(self.ids('сыр'), [])
+
+    def test_matching_ids_agrees_with_search(self):
+        """matching_ids - те же задачи, что и search, и matches_query"""
+        for query in ('отч', 'молоко', 'молоко хлеб', 'задачи', 'сыр', 'к хлеб'):
+            expected = set(self.ids(query))
+            self.assertEqual(self.index.matching_ids(query), expected)
+            self.assertEqual({task.id for task in self.tasks if matches_query(task, query)}, expected)
+        self.assertEqual(self.index.matching_ids('молоко', allowed={2, 3}), {2})
+
+    def test_query_without_words(self):
+        """Запрос без слов не ограничивает задачи ни в matching_ids, ни в matches_query"""
+        for query in ('?', '  ', '!!'):
+            self.assertEqual(self.index.matching_ids(query), {1, 2, 3, 4})
+            self.assertTrue(all(matches_query(task, query) for task in self.tasks))
+        self.assertEqual(self.index.matching_ids('?', allowed={2, 3}), {2, 3})
+
+    def test_short_last_term_is_ignored(self):
+        """Последний короткий термин еще набирается и не сужает результат"""
+        self.assertEqual(self.index.matching_ids('м'), {1, 2, 3, 4})
+        self.assertEqual(self.ids('купить х'), [1])
+        self.assertEqual(self.ids('х купить'), [])
+        self.assertTrue(matches_query(self.tasks[0], 'купить х'))
+        self.assertFalse(matches_query(self.tasks[0], 'х купить'))
+
+    def test_narrows(self):
+        """Дописанный запрос только сужает результат"""
+        self.assertTrue(narrows('мол', None))
+        self.assertTrue(narrows('моло', 'мол'))
+        self.assertTrue(narrows('молоко хл', 'молоко'))
+        self.assertTrue(narrows('купить х', 'х'))
+        self.assertFalse(narrows('мо', 'мол'))
+        self.assertFalse(narrows('сыр', 'молоко'))
+        self.assertFalse(narrows('х купить', 'х купить мо'))
+        for query, previous in (('моло', 'мол'), ('молоко хл', 'молоко'), ('купить х', 'х')):
+            self.assertLessEqual(
+                self.index.matching_ids(query), self.index.matching_ids(previous), (query, previous)
+            )
+
+    def test_title_ranks_higher(self):
+        """Совпадение в названии весит больше, чем в описании"""
+        self.assertEqual(self.ids('молоко'), [1, 2])
+
+    def test_incremental_updates(self):
+        """remove() до изменения и add() после обновляют индекс"""
+        task = self.tasks[0]
+        self.index.remove(task)
+        task.update(title='Купить сыр')
+        self.index.add(task)
+        self.assertEqual(self.ids('сыр'), [1])
+        self.assertEqual(self.ids('молоко'), [2])
+
+        self.index.remove(self.tasks[3])
+        self.assertEqual(self.ids('елка'), [])
+        self.assertNotIn('елк', self.index.postings)
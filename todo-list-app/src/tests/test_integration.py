@@ -3,6 +3,7 @@
 """
 import unittest
 import tempfile
+import glob
 import os
 import sys
 from datetime import date
@@ -20,6 +21,9 @@ class TestIntegrationScenarios(unittest.TestCase):
     
     def tearDown(self):
         os.unlink(self.temp_file.name)
+        # Резервные копии снимка (tasks.json.1, ...)
+        for backup in glob.glob(self.temp_file.name + '.*'):
+            os.unlink(backup)
     
     def test_complete_user_workflow(self):
         """Полный сценарий работы пользователя"""
@@ -10,6 +10,8 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from models.task import Task, TaskStatus
 from models.category import Category
 from models.priority import Priority
+from models.id_allocator import IdAllocator, needs_id_migration, LEGACY_ID_THRESHOLD
+from models.change_set import ChangeSet
 
 class TestTaskModel(unittest.TestCase):
     """Тесты модели Task"""
@@ -104,6 +106,97 @@ class TestTaskModel(unittest.TestCase):
         self.assertEqual(restored_task.status, original_task.status)
         self.assertEqual(restored_task.category, original_task.category)
 
+    def test_compact_representation(self):
+        """Компактное представление не меняет публичных атрибутов и формата"""
+        task = Task(title='Compact', category='Свое', priority='Низкий', task_id=7)
+        self.assertFalse(hasattr(task, '__dict__'))
+        self.assertEqual(task.category, 'Свое')
+        self.assertEqual(task.priority, 'Низкий')
+        self.assertIsInstance(task.creation_date, datetime)
+
+        data = {
+            'id': 7, 'title': 'Compact', 'description': '', 'category': None,
+            'priority': 'Средний', 'due_date': '2030-01-02', 'status': 'В процессе',
+            'creation_date': '2025-03-04T05:06:07.123456',
+            'modification_date': '2025-03-04T05:06:08'
+        }
+        restored = Task.from_dict(data)
+        self.assertEqual(restored.to_dict(), data)
+        self.assertEqual(restored.creation_date, datetime(2025, 3, 4, 5, 6, 7, 123456))
+
+        lazy = Task.from_dict(data, lazy=True)
+        self.assertEqual(lazy.to_dict(), data)
+        self.assertEqual(lazy.due_date, date(2030, 1, 2))
+        self.assertEqual(lazy.creation_date, restored.creation_date)
+        self.assertEqual(lazy.to_dict(), data)
+
+        restored.update(category='Работа', priority='Высокий')
+        self.assertEqual((restored.category, restored.priority), ('Работа', 'Высокий'))
+        self.assertGreater(restored.modification_date, datetime(2025, 3, 4, 5, 6, 8))
+
+    def test_dirty_tracking(self):
+        """Измененные поля запоминаются до mark_clean()"""
+        task = Task(title='Task', category='Работа')
+        self.assertFalse(task.is_dirty)
+
+        self.assertEqual(task.update(title='Task', category='Дом'), {'category'})
+        task.set_status(TaskStatus.COMPLETED)
+        self.assertEqual(task.dirty_fields, {'category', 'status'})
+
+        task.mark_clean()
+        modified = task.modification_date
+        self.assertEqual(task.update(title='Task'), set())
+        task.set_status(TaskStatus.COMPLETED)
+        self.assertFalse(task.is_dirty)
+        self.assertEqual(task.modification_date, modified)
+
+        task.update(title='Renamed', description='Text')
+        task.mark_clean({'title'})
+        self.assertEqual(task.dirty_fields, {'description'})
+
+
+class TestChangeSet(unittest.TestCase):
+    """Тесты набора изменений"""
+
+    def test_created_updated_deleted(self):
+        """Созданные, измененные и удаленные задачи различаются"""
+        created = Task(title='New', task_id=1)
+        updated = Task(title='Old', task_id=2)
+        changes = ChangeSet()
+        changes.add_created(created)
+        created.update(title='Renamed')
+        changes.add_updated(created)
+        updated.update(priority='Высокий')
+        changes.add_updated(updated)
+        changes.add_deleted(3)
+
+        self.assertEqual(changes.created_ids(), {1})
+        self.assertEqual(changes.updated_ids(), {2})
+        self.assertEqual(changes.deleted_ids(), {3})
+        self.assertEqual(changes.changed_fields(1), set())
+        self.assertEqual(changes.changed_fields(2), {'priority'})
+        self.assertEqual(dict(changes), {1: created, 2: updated, 3: None})
+
+    def test_merge_older_keeps_newer(self):
+        """Возвращенные изменения не перезаписывают более новые"""
+        task = Task(title='Task', task_id=1)
+        older = ChangeSet()
+        task.update(title='First')
+        older.add_updated(task)
+        older.add_created(Task(title='Other', task_id=2))
+
+        newer = ChangeSet()
+        task.mark_clean()
+        task.update(description='Second')
+        newer.add_updated(task)
+        newer.add_deleted(2)
+
+        newer.merge_older(older)
+        self.assertEqual(newer.changed_fields(1), {'title', 'description'})
+        self.assertEqual(newer.deleted_ids(), {2})
+        self.assertEqual(newer.created_ids(), set())
+
+
 class TestCategory(unittest.TestCase):
     """Тесты категорий"""
     
@@ -138,4 +231,28 @@ class TestPriority(unittest.TestCase):
         """Проверка числовых значений для сортировки"""
         self.assertEqual(Priority.HIGH.numeric_value, 3)
         self.assertEqual(Priority.MEDIUM.numeric_value, 2)
-        self.assertEqual(Priority.LOW.numeric_value, 1)
\ No newline at end of file
+        self.assertEqual(Priority.LOW.numeric_value, 1)
+
+class TestIdAllocator(unittest.TestCase):
+    """Тесты выдачи идентификаторов"""
+
+    def test_dense_monotonic_ids(self):
+        """id выдаются подряд и не повторяются"""
+        allocator = IdAllocator()
+        self.assertEqual([allocator.allocate() for _ in range(3)], [1, 2, 3])
+        allocator.observe([10, 4])
+        self.assertEqual(allocator.allocate(), 11)
+
+    def test_legacy_ids_detected(self):
+        """Миграция нужна для id от 2^32 и для нецелых id"""
+        self.assertFalse(needs_id_migration([1, 2, LEGACY_ID_THRESHOLD - 1]))
+        self.assertTrue(needs_id_migration([1, LEGACY_ID_THRESHOLD]))
+        self.assertTrue(needs_id_migration([2822744167760]))
+        self.assertTrue(needs_id_migration(['7']))
+        self.assertFalse(needs_id_migration([]))
+
+    def test_standalone_task_ids_do_not_collide(self):
+        """Задачи вне контроллера получают уникальные временные id"""
+        first, second = Task(title='A'), Task(title='B')
+        self.assertNotEqual(first.id, second.id)
+        self.assertLess(first.id, 0)
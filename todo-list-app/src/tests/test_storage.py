@@ -3,6 +3,7 @@
 """
 import unittest
 import tempfile
+import glob
 import os
 import sys
 from datetime import date
@@ -11,7 +12,9 @@ import json
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from utils.validators import validate_task_data, validate_date_format
 from controllers.task_controller import TaskController
-from models.task import TaskStatus
+from models.task import Task, TaskStatus
+from storage.durability import DurabilityPolicy
+from storage.binary_storage import BinarySnapshot, BinaryTaskStorage, binary_to_json, json_to_binary
 
 class TestValidators(unittest.TestCase):
     """Тесты валидаторов"""
@@ -68,6 +71,8 @@ class TestDataPersistence(unittest.TestCase):
     def tearDown(self):
         if os.path.exists(self.temp_file.name):
             os.unlink(self.temp_file.name)
+        for backup in glob.glob(self.temp_file.name + '.*'):
+            os.unlink(backup)
     
     def test_save_and_load_tasks(self):
         """Сохранение и загрузка задач"""
@@ -151,4 +156,498 @@ class TestDataPersistence(unittest.TestCase):
             f.write('[]')
         
         controller = TaskController(storage_path=self.temp_file.name)
-        self.assertEqual(len(controller.tasks), 0)
\ No newline at end of file
+        self.assertEqual(len(controller.tasks), 0)
+
+class TestJournalStorage(unittest.TestCase):
+    """Тесты журнального хранилища"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'tasks.json')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_mutations_append_to_journal(self):
+        """Каждая мутация дописывает запись в журнал, снимок не переписывается"""
+        controller = TaskController(storage_path=self.path, storage_mode='journal')
+        task = controller.create_task({'title': 'Task 1'})
+        controller.change_task_status(task.id, TaskStatus.COMPLETED)
+
+        self.assertFalse(os.path.exists(self.path))
+        with open(self.path + '.journal', 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(json.loads(lines[1])['task']['status'], 'Выполнена')
+        controller.final_save()
+
+    def test_replay_journal_on_load(self):
+        """Загрузка проигрывает журнал поверх снимка"""
+        controller = TaskController(storage_path=self.path, storage_mode='journal')
+        task1 = controller.create_task({'title': 'Task 1'})
+        task2 = controller.create_task({'title': 'Task 2'})
+        controller.update_task(task1.id, {'title': 'Task 1 updated'})
+        controller.delete_task(task2.id)
+        controller.final_save()
+
+        loaded = TaskController(storage_path=self.path, storage_mode='journal')
+        self.assertEqual([t.title for t in loaded.tasks], ['Task 1 updated'])
+        loaded.final_save()
+
+    def test_deleted_ids_not_reissued(self):
+        """id задачи, созданной и удаленной в одной транзакции, не выдается снова"""
+        controller = TaskController(storage_path=self.path, storage_mode='journal')
+        controller.create_task({'title': 'Task 1'})
+        with controller.transaction():
+            task = controller.create_task({'title': 'Task 2'})
+            controller.delete_task(task.id)
+        controller.final_save()
+
+        loaded = TaskController(storage_path=self.path, storage_mode='journal')
+        self.assertGreater(loaded.create_task({'title': 'Task 3'}).id, task.id)
+        loaded.final_save()
+
+    def test_compaction_into_snapshot(self):
+        """Журнал уплотняется в снимок после превышения порога"""
+        controller = TaskController(
+            storage_path=self.path, storage_mode='journal', compact_threshold=1
+        )
+        controller.create_task({'title': 'Task 1'})
+        controller.create_task({'title': 'Task 2'})
+        controller.storage.compact()
+        controller.final_save()
+
+        self.assertTrue(os.path.exists(self.path))
+        self.assertFalse(os.path.exists(self.path + '.journal.compacting'))
+        with open(self.path, 'r', encoding='utf-8') as f:
+            self.assertEqual(len(json.load(f)['tasks']), 2)
+
+        loaded = TaskController(storage_path=self.path, storage_mode='journal')
+        self.assertEqual([t.title for t in loaded.tasks], ['Task 1', 'Task 2'])
+        loaded.final_save()
+
+    def test_damaged_tail_is_skipped(self):
+        """Оборванная последняя запись журнала пропускается"""
+        controller = TaskController(storage_path=self.path, storage_mode='journal')
+        controller.create_task({'title': 'Task 1'})
+        controller.final_save()
+        with open(self.path + '.journal', 'a', encoding='utf-8') as f:
+            f.write('{"op":"put","task":{"id"')
+
+        loaded = TaskController(storage_path=self.path, storage_mode='journal')
+        self.assertEqual(len(loaded.tasks), 1)
+        loaded.final_save()
+
+
+class TestSqliteStorage(unittest.TestCase):
+    """Тесты хранилища SQLite"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'tasks.db')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_mode_selected_by_suffix(self):
+        """Режим SQLite выбирается по расширению файла"""
+        controller = TaskController(storage_path=self.path)
+        self.assertTrue(controller.storage.supports_queries)
+        controller.final_save()
+
+    def test_save_and_load(self):
+        """Сохранение и загрузка задач через SQLite"""
+        controller = TaskController(storage_path=self.path)
+        task1 = controller.create_task({'title': 'Task 1', 'category': 'Работа'})
+        task2 = controller.create_task({'title': 'Task 2'})
+        controller.change_task_status(task1.id, TaskStatus.COMPLETED)
+        controller.delete_task(task2.id)
+        controller.final_save()
+
+        loaded = TaskController(storage_path=self.path)
+        self.assertEqual(len(loaded.tasks), 1)
+        self.assertEqual(loaded.tasks[0].title, 'Task 1')
+        self.assertEqual(loaded.tasks[0].status, TaskStatus.COMPLETED)
+        self.assertEqual(loaded.tasks[0].category, 'Работа')
+        loaded.final_save()
+
+    def test_filter_and_sort_queries(self):
+        """Фильтрация и сортировка выполняются запросами к базе"""
+        controller = TaskController(storage_path=self.path)
+        controller.create_task({'title': 'b', 'priority': 'Низкий', 'category': 'Работа'})
+        controller.create_task({'title': 'a', 'priority': 'Высокий', 'category': 'Работа'})
+        controller.create_task({'title': 'c', 'priority': 'Средний', 'category': 'Дом'})
+
+        work = controller.apply_filters({'category': 'Работа'})
+        self.assertEqual([t.title for t in work], ['b', 'a'])
+
+        by_title = controller.sort_tasks('title')
+        self.assertEqual([t.title for t in by_title], ['a', 'b'])
+
+        controller.apply_filters({})
+        by_priority = controller.sort_tasks('priority', reverse=True)
+        self.assertEqual([t.title for t in by_priority], ['a', 'c', 'b'])
+
+        controller.change_task_status(controller.tasks[0].id, TaskStatus.COMPLETED)
+        by_status = controller.sort_tasks('status')
+        self.assertEqual([t.title for t in by_status], ['a', 'c', 'b'])
+        by_category = controller.sort_tasks('category')
+        self.assertEqual([t.title for t in by_category], ['c', 'b', 'a'])
+        controller.final_save()
+
+    def test_import_from_json(self):
+        """Однократный импорт из файла tasks.json"""
+        json_path = os.path.join(self.temp_dir.name, 'tasks.json')
+        source = TaskController(storage_path=json_path)
+        source.create_task({'title': 'Imported', 'priority': 'Высокий'})
+
+        controller = TaskController(storage_path=self.path, import_from=json_path)
+        self.assertEqual(len(controller.tasks), 1)
+        self.assertEqual(controller.tasks[0].title, 'Imported')
+        self.assertEqual(controller.tasks[0].priority, 'Высокий')
+        controller.final_save()
+
+
+class TestBinaryStorage(unittest.TestCase):
+    """Тесты двоичного снимка"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'tasks.tdb')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _fill(self, controller):
+        task1 = controller.create_task({
+            'title': 'Задача 1', 'description': 'Описание', 'category': 'Работа',
+            'priority': 'Высокий', 'due_date': date.today()
+        })
+        controller.create_task({'title': 'Task 2'})
+        controller.change_task_status(task1.id, TaskStatus.IN_PROGRESS)
+        return controller
+
+    def test_save_and_load(self):
+        """Сохранение и загрузка задач через двоичный снимок"""
+        controller = self._fill(TaskController(storage_path=self.path))
+        self.assertIsInstance(controller.storage, BinaryTaskStorage)
+
+        loaded = TaskController(storage_path=self.path)
+        self.assertEqual(
+            [t.to_dict() for t in loaded.tasks], [t.to_dict() for t in controller.tasks]
+        )
+        self.assertEqual(loaded.create_task({'title': 'Task 3'}).id, 3)
+
+    def test_random_access_to_records(self):
+        """Отдельная запись читается без разбора всего файла"""
+        controller = self._fill(TaskController(storage_path=self.path))
+        with BinarySnapshot(self.path) as snapshot:
+            self.assertEqual(len(snapshot), 2)
+            self.assertEqual(snapshot.record(1), controller.tasks[1].to_dict())
+            self.assertEqual(snapshot.task(0).to_dict(), controller.tasks[0].to_dict())
+
+    def test_conversion_round_trip(self):
+        """tasks.json -> двоичный снимок -> tasks.json без потерь"""
+        json_path = os.path.join(self.temp_dir.name, 'tasks.json')
+        controller = self._fill(TaskController(storage_path=json_path))
+        controller.final_save()
+
+        self.assertEqual(json_to_binary(json_path, self.path), 2)
+        back_path = os.path.join(self.temp_dir.name, 'back.json')
+        binary_to_json(self.path, back_path)
+
+        with open(json_path, 'r', encoding='utf-8') as f:
+            original = json.load(f)
+        with open(back_path, 'r', encoding='utf-8') as f:
+            self.assertEqual(json.load(f), original)
+
+    def test_damaged_snapshot_falls_back_to_backup(self):
+        """Поврежденный снимок заменяется резервной копией"""
+        controller = self._fill(TaskController(storage_path=self.path))
+        with open(self.path, 'r+b') as f:
+            f.truncate(40)
+
+        # Резервная копия - снимок до последней смены статуса
+        loaded = TaskController(storage_path=self.path)
+        self.assertEqual([t.title for t in loaded.tasks], ['Задача 1', 'Task 2'])
+        self.assertEqual(loaded.tasks[0].status, TaskStatus.NOT_STARTED)
+
+
+class TestShardedStorage(unittest.TestCase):
+    """Тесты хранилища, разбитого на шарды"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'tasks.manifest')
+        self.shard_dir = os.path.join(self.temp_dir.name, 'tasks.shards')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _controller(self, **options):
+        return TaskController(storage_path=self.path, shard_by='id', shard_size=2, **options)
+
+    def test_save_and_load(self):
+        """Задачи раскладываются по шардам и загружаются обратно"""
+        controller = self._controller()
+        for i in range(5):
+            controller.create_task({'title': f'Task {i}', 'category': 'Работа' if i % 2 else None})
+        controller.delete_task(3)
+        controller.final_save()
+
+        self.assertEqual(
+            sorted(name for name in os.listdir(self.shard_dir) if name.endswith('.json')),
+            ['000000.json', '000001.json', '000002.json']
+        )
+        loaded = self._controller()
+        self.assertEqual(
+            [t.to_dict() for t in loaded.tasks], [t.to_dict() for t in controller.tasks]
+        )
+        self.assertEqual(loaded.create_task({'title': 'Task 5'}).id, 6)
+
+    def test_only_dirty_shards_are_rewritten(self):
+        """Изменение задачи перезаписывает только ее шард"""
+        controller = self._controller()
+        for i in range(5):
+            controller.create_task({'title': f'Task {i}'})
+        shards = sorted(name for name in os.listdir(self.shard_dir) if name.endswith('.json'))
+        inodes = {name: os.stat(os.path.join(self.shard_dir, name)).st_ino for name in shards}
+
+        controller.update_task(2, {'title': 'Changed'})
+        rewritten = [
+            name for name in shards
+            if os.stat(os.path.join(self.shard_dir, name)).st_ino != inodes[name]
+        ]
+        self.assertEqual(rewritten, ['000001.json'])
+        self.assertEqual(controller.storage.dirty_shards(), set())
+
+    def test_load_filters_skip_shards(self):
+        """Шарды без подходящих задач не загружаются и не теряются при записи"""
+        controller = self._controller()
+        for i in range(4):
+            controller.create_task({'title': f'Task {i}'})
+        for task_id in (2, 3):
+            controller.change_task_status(task_id, TaskStatus.COMPLETED)
+        controller.final_save()
+
+        active = self._controller(load_filters={'status': TaskStatus.NOT_STARTED})
+        self.assertEqual(active.storage.skipped, ['000001'])
+        self.assertEqual(active.tasks.ids(), [1, 4])
+        active.create_task({'title': 'Task 4'})
+        active.delete_task(4)
+        active.final_save()
+
+        loaded = self._controller()
+        self.assertEqual(loaded.tasks.ids(), [1, 2, 3, 5])
+        self.assertEqual(loaded.tasks.get(2).status, TaskStatus.COMPLETED)
+
+    def test_replace_all_keeps_skipped_shards(self):
+        """Полная перезапись после загрузки с фильтром не теряет пропущенные шарды"""
+        controller = self._controller()
+        for i in range(4):
+            controller.create_task({'title': f'Task {i}'})
+        for task_id in (3, 4):
+            controller.change_task_status(task_id, TaskStatus.COMPLETED)
+        controller.final_save()
+
+        active = self._controller(load_filters={'status': TaskStatus.NOT_STARTED})
+        self.assertEqual(active.storage.skipped, ['000002'])
+        active.storage.replace_all(active.tasks.copy())
+        self.assertEqual(active.storage.skipped, [])
+
+        loaded = self._controller()
+        self.assertEqual(loaded.tasks.ids(), [1, 2, 3, 4])
+        self.assertEqual(loaded.tasks.get(4).status, TaskStatus.COMPLETED)
+
+
+class TestWriteBehind(unittest.TestCase):
+    """Тесты отложенной фоновой записи"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'tasks.json')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_burst_is_coalesced_into_one_write(self):
+        """Серия мутаций объединяется в одну запись"""
+        controller = TaskController(storage_path=self.path, write_behind=True, write_delay=0.2)
+        for i in range(5):
+            controller.create_task({'title': f'Task {i}'})
+        self.assertFalse(os.path.exists(self.path))
+
+        controller.flush()
+        stats = controller.get_persistence_stats()
+        self.assertEqual(stats['writes'], 1)
+        self.assertEqual(stats['coalesced'], 4)
+        self.assertGreaterEqual(stats['last_flush_ms'], 0.0)
+        with open(self.path, 'r', encoding='utf-8') as f:
+            self.assertEqual(len(json.load(f)['tasks']), 5)
+        controller.final_save()
+
+    def test_final_save_flushes_and_stops_writer(self):
+        """final_save дописывает изменения и останавливает поток записи"""
+        controller = TaskController(storage_path=self.path, write_behind=True, write_delay=10)
+        controller.create_task({'title': 'Task'})
+        writer_thread = controller.writer._thread
+        controller.final_save()
+
+        self.assertFalse(writer_thread.is_alive())
+        loaded = TaskController(storage_path=self.path)
+        self.assertEqual(len(loaded.tasks), 1)
+
+    def test_write_behind_with_journal(self):
+        """Отложенная запись работает с журнальным хранилищем"""
+        controller = TaskController(
+            storage_path=self.path, storage_mode='journal', write_behind=True, write_delay=0.05
+        )
+        task = controller.create_task({'title': 'Task'})
+        controller.change_task_status(task.id, TaskStatus.IN_PROGRESS)
+        controller.final_save()
+
+        loaded = TaskController(storage_path=self.path, storage_mode='journal')
+        self.assertEqual(loaded.tasks[0].status, TaskStatus.IN_PROGRESS)
+        loaded.final_save()
+
+
+class TestAtomicSnapshots(unittest.TestCase):
+    """Тесты атомарной записи снимков и политики fsync"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'tasks.json')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_snapshots_rotate(self):
+        """Предыдущие версии снимка сохраняются и ротируются"""
+        controller = TaskController(storage_path=self.path, backups=2)
+        for i in range(4):
+            controller.create_task({'title': f'Task {i}'})
+
+        self.assertEqual(
+            sorted(os.listdir(self.temp_dir.name)),
+            ['tasks.json', 'tasks.json.1', 'tasks.json.2']
+        )
+        with open(self.path + '.2', 'r', encoding='utf-8') as f:
+            self.assertEqual(len(json.load(f)['tasks']), 2)
+
+    def test_open_close_keeps_backups(self):
+        """Открытие и закрытие без изменений не переписывают снимок и его копии"""
+        for i in range(3):
+            controller = TaskController(storage_path=self.path)
+            controller.create_task({'title': f'Task {i}'})
+            controller.final_save()
+
+        def contents():
+            names = ['tasks.json', 'tasks.json.1', 'tasks.json.2']
+            result = []
+            for name in names:
+                with open(os.path.join(self.temp_dir.name, name), 'rb') as f:
+                    result.append(f.read())
+            return result
+
+        before = contents()
+        self.assertEqual(len(set(before)), 3)
+        for _ in range(3):
+            TaskController(storage_path=self.path, write_behind=True).final_save()
+        self.assertEqual(contents(), before)
+        self.assertFalse(os.path.exists(self.path + '.3'))
+
+        # Перезапись теми же байтами тоже не сдвигает копии
+        controller = TaskController(storage_path=self.path)
+        controller.storage.replace_all(controller.tasks.copy())
+        self.assertEqual(contents(), before)
+
+    def test_truncated_snapshot_falls_back_to_backup(self):
+        """Оборванный снимок не приводит к потере всех задач"""
+        controller = TaskController(storage_path=self.path)
+        controller.create_task({'title': 'Task 1'})
+        controller.create_task({'title': 'Task 2'})
+        with open(self.path, 'r+', encoding='utf-8') as f:
+            f.truncate(20)
+
+        loaded = TaskController(storage_path=self.path)
+        self.assertEqual([t.title for t in loaded.tasks], ['Task 1'])
+
+    def test_fsync_policies(self):
+        """Политики always, batched и never"""
+        always = TaskController(storage_path=self.path, fsync='always')
+        always.create_task({'title': 'Task 1'})
+        always.create_task({'title': 'Task 2'})
+        self.assertEqual(always.storage.durability.fsync_count, 2)
+
+        never = TaskController(storage_path=self.path, fsync='never')
+        never.create_task({'title': 'Task 3'})
+        self.assertEqual(never.storage.durability.fsync_count, 0)
+
+        batched = DurabilityPolicy('batched', batch_size=3, batch_interval=3600)
+        with open(self.path, 'wb') as f:
+            synced = [batched.sync(f) for _ in range(6)]
+        self.assertEqual(synced, [False, False, True, False, False, True])
+
+    def test_unknown_fsync_policy(self):
+        """Неизвестная политика fsync отклоняется"""
+        with self.assertRaises(ValueError):
+            TaskController(storage_path=self.path, fsync='sometimes')
+
+
+class TestDenseIds(unittest.TestCase):
+    """Тесты плотных постоянных идентификаторов"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_legacy_file_is_migrated(self):
+        """Файл со старыми id переводится на id 1..n"""
+        path = os.path.join(self.temp_dir.name, 'tasks.json')
+        controller = TaskController(storage_path=path)
+        controller.create_task({'title': 'A'})
+        controller.create_task({'title': 'B'})
+        records = [dict(task.to_dict(), id=2822744167760 + i) for i, task in enumerate(controller.tasks)]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(records, f)
+
+        migrated = TaskController(storage_path=path)
+        self.assertEqual(migrated.tasks.ids(), [1, 2])
+        self.assertEqual(migrated.create_task({'title': 'C'}).id, 3)
+
+        with open(path, 'r', encoding='utf-8') as f:
+            document = json.load(f)
+        self.assertEqual(document['next_id'], 4)
+        self.assertEqual([r['id'] for r in document['tasks']], [1, 2, 3])
+
+    def test_mixed_legacy_ids_are_remapped(self):
+        """Одного id от 2^32 достаточно, чтобы перенумеровать все задачи"""
+        path = os.path.join(self.temp_dir.name, 'tasks.json')
+        records = [
+            dict(Task(title='A').to_dict(), id=5),
+            dict(Task(title='B').to_dict(), id=1 << 32),
+        ]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(records, f)
+
+        migrated = TaskController(storage_path=path)
+        self.assertEqual([(t.id, t.title) for t in migrated.tasks], [(1, 'A'), (2, 'B')])
+        self.assertEqual(migrated.id_allocator.next_id, 3)
+
+    def test_ids_are_not_reused_after_reload(self):
+        """id удаленной задачи не выдается повторно после перезапуска"""
+        for mode, filename in [('json', 'tasks.json'), ('journal', 'tasks.json'), ('sqlite', 'tasks.db')]:
+            with self.subTest(mode=mode):
+                path = os.path.join(self.temp_dir.name, mode, filename)
+                controller = TaskController(storage_path=path, storage_mode=mode)
+                first = controller.create_task({'title': 'A'})
+                second = controller.create_task({'title': 'B'})
+                self.assertEqual((first.id, second.id), (1, 2))
+                controller.delete_task(second.id)
+                controller.final_save()
+
+                reloaded = TaskController(storage_path=path, storage_mode=mode)
+                self.assertEqual(reloaded.create_task({'title': 'C'}).id, 3)
+                reloaded.final_save()
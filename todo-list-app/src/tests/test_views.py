@@ -0,0 +1,232 @@
+"""
+Тесты логики представлений, не требующей окна Tk
+"""
+import unittest
+import sys
+import os
+import glob
+import tempfile
+from datetime import date
+from unittest import mock
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from models.task import Task, TaskStatus
+from controllers.task_controller import TaskController
+from views.row_diff import stable_ids
+from views.row_cache import RowCache
+from views.virtual_list import VirtualTaskList
+
+
+class TestStableIds(unittest.TestCase):
+    """Тесты выбора строк, остающихся на месте"""
+
+    def test_single_move(self):
+        """Перемещение одной задачи затрагивает только ее строку"""
+        old = list(range(1, 21))
+        new = old[:5] + old[6:15] + [old[5]] + old[15:]
+        self.assertEqual(set(old) - stable_ids(old, new), {6})
+
+    def test_unchanged_and_new_rows(self):
+        """Новые и ушедшие строки не мешают оставлять остальные на месте"""
+        self.assertEqual(stable_ids([1, 2, 3, 4], [1, 9, 3, 4, 8]), {1, 3, 4})
+        self.assertEqual(stable_ids([], [1, 2]), set())
+
+    def test_reversed_keeps_one_row(self):
+        """Обратный порядок: на месте остается одна строка"""
+        self.assertEqual(len(stable_ids([1, 2, 3, 4], [4, 3, 2, 1])), 1)
+
+
+class TestRowCache(unittest.TestCase):
+    """Тесты кэша строк таблицы"""
+
+    def setUp(self):
+        self.day = date(2025, 3, 10)
+        self.overdue = set()
+        self.cache = RowCache(lambda: self.overdue, today=lambda: self.day, day_check_interval=0)
+        self.task = Task(title='Отчет', due_date=date(2025, 3, 11), task_id=1)
+
+    def test_hit_until_task_changes(self):
+        """Неизменившаяся задача отдает тот же объект строки"""
+        row = self.cache.row(self.task)
+        self.assertEqual(row, ((1, 'Отчет', '', 'Средний', 'Не начата', '11.03.2025'), ('Не начата',)))
+        self.assertIs(self.cache.row(self.task), row)
+        self.assertEqual(self.cache.stats(), {'hits': 1, 'misses': 1, 'size': 1})
+
+        self.task.set_status(TaskStatus.COMPLETED)
+        self.task.version += 1
+        self.assertEqual(self.cache.row(self.task)[0][1], '✓ Отчет')
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_edits_within_one_clock_tick(self):
+        """Две правки подряд с одной датой изменения не отдают старую строку"""
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.json')
+        temp_file.close()
+        self.addCleanup(os.unlink, temp_file.name)
+        self.addCleanup(lambda: [os.unlink(path) for path in glob.glob(temp_file.name + '.*')])
+        controller = TaskController(storage_path=temp_file.name)
+        task = controller.create_task({'title': 'Отчет'})
+
+        with mock.patch('models.task._now', return_value=task.modified_micros):
+            controller.update_task(task.id, {'title': 'Отчет за май'})
+            self.assertEqual(self.cache.row(task)[0][1], 'Отчет за май')
+            controller.update_task(task.id, {'title': 'Отчет за июнь'})
+            self.assertEqual(self.cache.row(task)[0][1], 'Отчет за июнь')
+            controller.change_task_status(task.id, TaskStatus.COMPLETED)
+            self.assertEqual(self.cache.row(task)[0][1], '✓ Отчет за июнь')
+        controller.final_save()
+
+    def test_day_rollover_invalidates(self):
+        """Смена дня пересчитывает пометку просрочки"""
+        self.cache.row(self.task)
+        self.day = date(2025, 3, 12)
+        self.overdue = {1}
+        self.assertEqual(self.cache.row(self.task)[0][1], '⚠ Отчет')
+        self.assertEqual(self.cache.stats(), {'hits': 0, 'misses': 2, 'size': 1})
+
+
+class FakeTree:
+    """Минимальная замена ttk.Treeview для логики виртуального списка"""
+
+    def __init__(self, height):
+        self.height = height
+        self.rows = {}
+        self.selected = ()
+        self.focused = ''
+        self._next = 0
+
+    def cget(self, option):
+        return self.height
+
+    def bind(self, *args, **kwargs):
+        pass
+
+    def configure(self, **kwargs):
+        pass
+
+    def insert(self, parent, index):
+        self._next += 1
+        item = f'I{self._next}'
+        self.rows[item] = None
+        return item
+
+    def delete(self, *items):
+        for item in items:
+            del self.rows[item]
+
+    def item(self, item, values, tags):
+        self.rows[item] = values
+
+    def selection(self):
+        return self.selected
+
+    def selection_set(self, item):
+        self.selected = (item,)
+
+    def selection_remove(self, *items):
+        self.selected = ()
+
+    def focus(self, item=None):
+        if item is None:
+            return self.focused
+        self.focused = item
+
+    def yview_moveto(self, fraction):
+        pass
+
+    def event_generate(self, sequence):
+        pass
+
+
+class FakeScrollbar:
+    def __init__(self):
+        self.position = None
+
+    def configure(self, **kwargs):
+        pass
+
+    def set(self, first, last):
+        self.position = (first, last)
+
+
+class TestVirtualTaskList(unittest.TestCase):
+    """Тесты окна виртуального списка без Tk"""
+
+    def setUp(self):
+        self.tasks = [Task(title=f'Task {i}', task_id=i) for i in range(1, 51)]
+        self.tree = FakeTree(height=10)
+        self.scrollbar = FakeScrollbar()
+        self.list = VirtualTaskList(
+            self.tree, self.scrollbar, lambda task: ((task.id, task.title), ()), overscan=2
+        )
+        self.list.show(self.tasks)
+
+    def shown_ids(self):
+        return [self.tree.rows[item][0] for item in self.list._items]
+
+    def select(self, task_id):
+        item = self.list._items[self.shown_ids().index(task_id)]
+        self.tree.selection_set(item)
+        self.tree.focus(item)
+        self.list._on_select(None)
+
+    def test_offset_is_clamped(self):
+        """Смещение не выходит за начало и конец представления"""
+        self.assertEqual(self.shown_ids(), list(range(1, 13)))
+        self.list.scroll_to(-5)
+        self.assertEqual(self.list.offset, 0)
+        self.list.scroll_to(1000)
+        self.assertEqual(self.list.offset, 40)
+        self.assertEqual(self.shown_ids(), list(range(41, 51)))
+        self.assertEqual(self.scrollbar.position, (0.8, 1.0))
+
+        # Представление сократилось: окно прижимается к его концу
+        self.list.show(self.tasks[:15])
+        self.assertEqual(self.list.offset, 5)
+        self.assertEqual(self.shown_ids(), list(range(6, 16)))
+        self.list.show(self.tasks[:3])
+        self.assertEqual(self.list.offset, 0)
+        self.assertEqual(self.shown_ids(), [1, 2, 3])
+        self.assertEqual(self.scrollbar.position, (0.0, 1.0))
+
+    def test_scrollbar_commands(self):
+        """yview: moveto - доля представления, scroll - строки или страницы"""
+        self.list.yview("moveto", "0.5")
+        self.assertEqual(self.list.offset, 25)
+        self.list.yview("scroll", "1", "units")
+        self.assertEqual(self.list.offset, 26)
+        self.list.yview("scroll", "-1", "pages")
+        self.assertEqual(self.list.offset, 16)
+        self.list.yview("moveto", "1.0")
+        self.assertEqual(self.list.offset, 40)
+        self.list.yview()
+        self.assertEqual(self.list.offset, 40)
+
+    def test_selection_survives_leaving_window(self):
+        """Выбор хранится по id задачи и возвращается вместе с ней в окно"""
+        self.select(3)
+        self.list.scroll_to(20)
+        self.assertEqual(self.tree.selection(), ())
+        self.list.scroll_to(0)
+        self.assertEqual(self.tree.rows[self.tree.selection()[0]][0], 3)
+
+    def test_keys_page_at_both_ends(self):
+        """Клавиши перемещения прокручивают окно и останавливаются на краях"""
+        self.select(1)
+        self.list._on_key("<Prior>", None)
+        self.list._on_key("<Up>", -1)
+        self.assertEqual((self.list.offset, self.list._selected_id), (0, 1))
+
+        self.list._on_key("<Next>", None)
+        self.assertEqual((self.list.offset, self.list._selected_id), (1, 11))
+
+        self.list.scroll_to(40)
+        self.select(50)
+        self.list._on_key("<Next>", None)
+        self.list._on_key("<Down>", 1)
+        self.assertEqual((self.list.offset, self.list._selected_id), (40, 50))
+        self.list._on_key("<Prior>", None)
+        self.assertEqual((self.list.offset, self.list._selected_id), (39, 40))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -21,6 +21,16 @@ PRIORITY_COLORS = {
 MAIN_WINDOW_SIZE = "900x700"
 DIALOG_SIZE = "400x300"
 
+# Пауза после последнего нажатия клавиши перед поиском (мс)
+SEARCH_DEBOUNCE_MS = 150
+
+# Больше стольких задач в списке - виртуальная прокрутка вместо строки на задачу
+VIRTUAL_LIST_THRESHOLD = 2000
+# Запас строк виртуального списка под нижним краем окна
+VIRTUAL_OVERSCAN = 5
+# Больше стольких скрытых (поиском или фильтром) строк таблица не хранит
+HIDDEN_ROWS_LIMIT = 2000
+
 # Форматы дат
 DATE_FORMAT = "%d.%m.%Y"
 DATETIME_FORMAT = "%d.%m.%Y %H:%M"
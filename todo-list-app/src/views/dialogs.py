@@ -390,7 +390,7 @@ class FilterDialog(BaseDialog):
 
     def apply_filters(self):
         """Применить выбранные фильтры"""
-        filters = {}
+        filters = self._search_filter()
 
         if self.status_var.get():
             status = next((s for s in TaskStatus if s.value == self.status_var.get()), None)
@@ -408,9 +408,14 @@ class FilterDialog(BaseDialog):
 
     def reset_filters(self):
         """Сбросить все фильтры"""
-        self.controller.apply_filters({})
+        self.controller.apply_filters(self._search_filter())
         self.dialog.destroy()
 
+    def _search_filter(self):
+        """Строка поиска главного окна задается не в этом диалоге и сохраняется"""
+        query = self.controller.current_filters.get('query')
+        return {'query': query} if query else {}
+
     def on_cancel(self):
         """Обработка закрытия"""
         self.dialog.destroy()
\ No newline at end of file
@@ -10,10 +10,15 @@ import datetime
 # АБСОЛЮТНЫЕ ИМПОРТЫ
 from models.task import Task, TaskStatus
 from controllers.task_controller import TaskController
-from utils.constants import STATUS_COLORS, DATE_FORMAT
+from controllers.events import TaskEvent, UPDATED, STATUS_CHANGED
+from indexes.deadline_buckets import OVERDUE, DUE_SOON
+from utils.constants import DATE_FORMAT, SEARCH_DEBOUNCE_MS, VIRTUAL_LIST_THRESHOLD, HIDDEN_ROWS_LIMIT
 
 # ОТНОСИТЕЛЬНЫЕ ИМПОРТЫ ВНУТРИ ПАКЕТА
 from .dialogs import AddTaskDialog, EditTaskDialog, FilterDialog
+from .virtual_list import VirtualTaskList
+from .row_diff import stable_ids
+from .row_cache import Row, RowCache, configure_status_tags
 
 
 class MainWindow:
@@ -23,9 +28,22 @@ class MainWindow:
         self.root = root
         self.controller = controller
         self.current_sort = {'column': 'creation_date', 'reverse': False}
+        # Строки таблицы: id задачи -> элемент Treeview (в том числе скрытые поиском)
+        self._rows: Dict[int, str] = {}
+        # id задач в порядке отображения -> позиция строки
+        self._shown: Dict[int, int] = {}
+        # id задачи -> строка, показанная сейчас
+        self._row_state: Dict[int, Row] = {}
+        # Корзины сроков считаются контроллером одним проходом, а не is_overdue() на строку
+        self.row_cache = RowCache(lambda: self.controller.classify_deadlines()[OVERDUE])
+        self._search_job: Optional[str] = None
+        # События контроллера, ждущие обновления окна в after_idle
+        self._events: List[TaskEvent] = []
+        self._events_job: Optional[str] = None
         self.setup_ui()
         self.refresh_task_list()
         self.setup_bindings()
+        self.controller.events.subscribe(self.on_task_event)
 
     def setup_ui(self):
         """Настройка пользовательского интерфейса согласно мокапам"""
@@ -111,6 +129,12 @@ class MainWindow:
         )
         self.sort_btn.pack(side=tk.LEFT, padx=5)
 
+        # Поиск по мере ввода
+        self.search_var = tk.StringVar()
+        self.search_entry = ttk.Entry(control_frame, textvariable=self.search_var, width=25)
+        self.search_entry.pack(side=tk.LEFT, padx=(15, 5))
+        self.search_var.trace_add("write", self.on_search_changed)
+
         # Статистика
         stats_frame = ttk.Frame(control_frame)
         stats_frame.pack(side=tk.RIGHT)
@@ -155,12 +179,18 @@ class MainWindow:
         self.tree.column("status", width=120, anchor=tk.CENTER)
         self.tree.column("due_date", width=120, anchor=tk.CENTER)
 
+        # Цвета для статусов
+        configure_status_tags(self.tree)
+
         # Scrollbar
-        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self.scrollbar.set)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
+        # Большие списки: строки только для видимого окна
+        self.virtual_list = VirtualTaskList(self.tree, self.scrollbar, self.row_cache.row)
+
         # Контекстное меню
         self.setup_context_menu()
 
@@ -213,59 +243,152 @@ class MainWindow:
         self.root.bind("<Control-f>", lambda e: self.show_filter_dialog())
         self.root.bind("<Delete>", lambda e: self.delete_selected_task())
         self.root.bind("<F5>", lambda e: self.refresh_task_list())
+        self.search_entry.bind("<Escape>", lambda e: self.search_var.set(""))
 
     def refresh_task_list(self):
-        """Обновление списка задач"""
-        # Очистка текущего списка
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        """Сверка таблицы с текущим представлением по id задач
 
-        # Получение и отображение задач
+        Строки не пересоздаются: новые задачи вставляются, ушедшие из
+        представления отсоединяются (удаленные задачи - удаляются), из
+        оставшихся перемещаются только те, что нарушают порядок, а значения
+        перезаписываются только у строк, задача которых изменилась.
+        """
         tasks = self.controller.get_filtered_tasks()
-
-        for task in tasks:
-            due_date_str = task.due_date.strftime(DATE_FORMAT) if task.due_date else ""
-
-            item_id = self.tree.insert(
-                "", tk.END,
-                values=(
-                    task.id,  # Добавляем ID в первую колонку
-                    task.title,
-                    task.category if task.category else "",
-                    task.priority,
-                    task.status.value,
-                    due_date_str
-                ),
-                tags=(task.status.value,)
-            )
-
-            # Визуальное оформление по статусу
-            if task.status == TaskStatus.COMPLETED:
-                self.tree.set(item_id, "title", f"✓ {task.title}")
-            elif task.is_overdue():
-                self.tree.set(item_id, "title", f"⚠ {task.title}")
-
-            # Цвета для статусов
-            self.tree.tag_configure(
-                task.status.value,
-                background=STATUS_COLORS.get(task.status.value, "#FFFFFF")
-            )
+        if len(tasks) > VIRTUAL_LIST_THRESHOLD:
+            self._clear_rows()
+            self.virtual_list.show(tasks)
+            self.update_statistics()
+            return
+        self.virtual_list.hide()
+
+        ids = tasks.ids()
+        visible = set(ids)
+
+        # Скрытые строки хранятся для повторного показа, но не без предела
+        stale = [task_id for task_id in self._rows if task_id not in visible]
+        deleted = [task_id for task_id in stale if self.controller.find_task(task_id) is None]
+        if len(stale) - len(deleted) > HIDDEN_ROWS_LIMIT:
+            deleted = stale
+        if deleted:
+            self.tree.delete(*[self._rows.pop(task_id) for task_id in deleted])
+            for task_id in deleted:
+                self._row_state.pop(task_id, None)
+                self.row_cache.discard(task_id)
+
+        retained = [task_id for task_id in self._shown if task_id in visible]
+        stable = stable_ids(retained, ids)
+        detached = [
+            self._rows[task_id] for task_id in self._shown
+            if task_id in self._rows and task_id not in stable
+        ]
+        if detached:
+            self.tree.detach(*detached)
+
+        for index, task in enumerate(tasks):
+            item_id = self._rows.get(task.id)
+            if item_id is None:
+                self._insert_row(task, index)
+                continue
+            if task.id not in stable:
+                self.tree.move(item_id, "", index)
+            self._update_row(task, item_id)
+        self._shown = {task_id: index for index, task_id in enumerate(ids)}
 
         # Обновление статистики
         self.update_statistics()
 
+    def _insert_row(self, task: Task, index) -> str:
+        """Строка таблицы для задачи"""
+        row = self.row_cache.row(task)
+        values, tags = row
+        item_id = self.tree.insert("", index, values=values, tags=tags)
+        self._rows[task.id] = item_id
+        self._row_state[task.id] = row
+        return item_id
+
+    def _update_row(self, task: Task, item_id: str) -> None:
+        """Перезапись значений строки, если они изменились после ее отрисовки"""
+        row = self.row_cache.row(task)
+        shown = self._row_state.get(task.id)
+        if row is shown or row == shown:
+            return
+        values, tags = row
+        self.tree.item(item_id, values=values, tags=tags)
+        self._row_state[task.id] = row
+
+    def _clear_rows(self) -> None:
+        """Удаление всех строк обычной таблицы (включая скрытые)"""
+        if self._rows:
+            self.tree.delete(*self._rows.values())
+        self._rows = {}
+        self._row_state = {}
+        self._shown = {}
+
+    def on_search_changed(self, *args):
+        """Ввод в строке поиска: поиск откладывается до паузы в наборе"""
+        if self._search_job is not None:
+            self.root.after_cancel(self._search_job)
+        self._search_job = self.root.after(SEARCH_DEBOUNCE_MS, self.apply_search)
+
+    def apply_search(self):
+        """Фильтрация по строке поиска с точечным обновлением таблицы"""
+        self._search_job = None
+        # Таблица обновится по событию FILTERS_CHANGED
+        self.controller.set_search(self.search_var.get())
+
+    def on_task_event(self, event: TaskEvent):
+        """Событие контроллера: серия событий - одно обновление в after_idle"""
+        self._events.append(event)
+        if self._events_job is None:
+            self._events_job = self.root.after_idle(self.apply_events)
+
+    def apply_events(self):
+        """Минимальное обновление таблицы по накопленным событиям
+
+        Если задачи только изменились и остались на своих позициях,
+        перезаписываются их строки; иначе таблица сверяется с
+        представлением (refresh_task_list).
+        """
+        events, self._events = self._events, []
+        self._events_job = None
+        if not events:
+            return
+        if all(event.kind in (UPDATED, STATUS_CHANGED) for event in events):
+            if self._update_rows_in_place({event.task_id for event in events}):
+                self.update_statistics()
+                return
+        self.refresh_task_list()
+
+    def _update_rows_in_place(self, task_ids) -> bool:
+        """Перезапись строк измененных задач; False - нужна полная сверка"""
+        if self.virtual_list.active:
+            return False
+        view = self.controller.get_filtered_tasks()
+        for task_id in task_ids:
+            in_view = view.has_id(task_id)
+            if in_view != (task_id in self._shown):
+                return False
+            if in_view and view.index_of(task_id) != self._shown[task_id]:
+                return False
+        for task_id in task_ids:
+            if task_id in self._shown:
+                self._update_row(self.controller.find_task(task_id), self._rows[task_id])
+        return True
+
     def update_statistics(self):
         """Обновление статистики в статус баре"""
-        total_tasks = len(self.controller.get_tasks())
-        filtered_tasks = len(self.controller.get_filtered_tasks())
-        completed_tasks = len([t for t in self.controller.get_tasks() if t.status == TaskStatus.COMPLETED])
+        # Счетчики поддерживаются контроллером - задачи не перебираются
+        stats = self.controller.get_statistics()
 
         self.task_count_label.config(
-            text=f"Задачи: {filtered_tasks}/{total_tasks} (Выполнено: {completed_tasks})"
+            text=f"Задачи: {stats['filtered']}/{stats['total']} (Выполнено: {stats['completed']})"
         )
 
         # Обновление статистики в панели управления
-        stats_text = f"Всего: {total_tasks} | Выполнено: {completed_tasks} | Активные: {total_tasks - completed_tasks}"
+        stats_text = (
+            f"Всего: {stats['total']} | Выполнено: {stats['completed']} | "
+            f"Активные: {stats['active']} | Просрочено: {stats['overdue']}"
+        )
         self.stats_label.config(text=stats_text)
 
     def show_context_menu(self, event):
@@ -278,8 +401,8 @@ class MainWindow:
     def show_add_dialog(self):
         """Показать диалог добавления задачи"""
         dialog = AddTaskDialog(self.root, self.controller)
+        # Таблица обновляется по событиям контроллера
         self.root.wait_window(dialog.dialog)
-        self.refresh_task_list()
 
     def edit_selected_task(self):
         """Редактирование выбранной задачи"""
@@ -295,7 +418,6 @@ class MainWindow:
         if task:
             dialog = EditTaskDialog(self.root, self.controller, task)
             self.root.wait_window(dialog.dialog)
-            self.refresh_task_list()
 
     def complete_selected_task(self):
         """Отметить выбранную задачу как выполненную"""
@@ -309,7 +431,6 @@ class MainWindow:
 
         try:
             self.controller.change_task_status(task_id, TaskStatus.COMPLETED)
-            self.refresh_task_list()
             
             # Получаем задачу для сообщения
             task = self.controller.find_task(task_id)
@@ -330,7 +451,6 @@ class MainWindow:
 
         try:
             self.controller.change_task_status(task_id, new_status)
-            self.refresh_task_list()
             
             task = self.controller.find_task(task_id)
             if task:
@@ -357,7 +477,6 @@ class MainWindow:
             if result:
                 try:
                     self.controller.delete_task(task_id)
-                    self.refresh_task_list()
                     messagebox.showinfo("Успех", "Задача удалена")
                 except Exception as e:
                     messagebox.showerror("Ошибка", f"Не удалось удалить задачу: {e}")
@@ -374,6 +493,7 @@ class MainWindow:
 
         task = self.controller.find_task(task_id)
         if task:
+            deadline = self.controller.get_deadline_bucket(task.id)
             details = f"""
 Задача: {task.title}
 
@@ -386,8 +506,8 @@ class MainWindow:
 Дата создания: {task.creation_date.strftime(DATE_FORMAT)}
 Срок выполнения: {task.due_date.strftime(DATE_FORMAT) if task.due_date else "Не установлен"}
 
-{'⚠ ЗАДАЧА ПРОСРОЧЕНА!' if task.is_overdue() else ''}
-{'⏰ Срок истекает скоро!' if task.is_due_soon() else ''}
+{'⚠ ЗАДАЧА ПРОСРОЧЕНА!' if deadline == OVERDUE else ''}
+{'⏰ Срок истекает скоро!' if deadline == DUE_SOON else ''}
 """.strip()
 
             messagebox.showinfo(f"Детали задачи", details)
@@ -396,7 +516,6 @@ class MainWindow:
         """Показать диалог фильтрации"""
         dialog = FilterDialog(self.root, self.controller)
         self.root.wait_window(dialog.dialog)
-        self.refresh_task_list()
 
     def show_sort_menu(self):
         """Показать меню сортировки"""
@@ -413,9 +532,8 @@ class MainWindow:
     def apply_sort(self, column: str, reverse: bool = False):
         """Применить сортировку"""
         self.current_sort = {'column': column, 'reverse': reverse}
-        sorted_tasks = self.controller.sort_tasks(column, reverse)
-        self.controller.filtered_tasks = sorted_tasks
-        self.refresh_task_list()
+        # Порядок сохраняется представлением и при последующих изменениях задач
+        self.controller.set_sort(column, reverse)
 
     def sort_by_column(self, column: str):
         """Сортировка по колонке таблицы"""
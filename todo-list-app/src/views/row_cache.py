@@ -0,0 +1,112 @@
+"""
+Кэш представления строк таблицы задач
+"""
+import time
+from datetime import date
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from models.task import Task, TaskStatus
+from utils.constants import STATUS_COLORS, DATE_FORMAT
+
+# Значения строки и ее теги - готовые аргументы Treeview.insert/item
+Row = Tuple[tuple, tuple]
+
+# Больше стольких строк кэш очищается целиком
+DEFAULT_CACHE_LIMIT = 100_000
+
+# Как часто (секунды) проверяется смена дня
+DAY_CHECK_INTERVAL = 1.0
+
+
+def task_row_values(task: Task, overdue_ids) -> Row:
+    """Значения и теги строки таблицы для задачи"""
+    due_date_str = task.due_date.strftime(DATE_FORMAT) if task.due_date else ""
+
+    title = task.title
+    # Визуальное оформление по статусу
+    if task.status == TaskStatus.COMPLETED:
+        title = f"✓ {task.title}"
+    elif task.id in overdue_ids:
+        title = f"⚠ {task.title}"
+
+    values = (
+        task.id,  # Добавляем ID в первую колонку
+        title,
+        task.category if task.category else "",
+        task.priority,
+        task.status.value,
+        due_date_str
+    )
+    return values, (task.status.value,)
+
+
+def configure_status_tags(tree) -> None:
+    """Цвета тегов статусов - один раз для таблицы, а не на каждую строку"""
+    for status in TaskStatus:
+        tree.tag_configure(status.value, background=STATUS_COLORS.get(status.value, "#FFFFFF"))
+
+
+class RowCache:
+    """Готовые строки таблицы по id задачи
+
+    Строка пересчитывается, только если у задачи сменился номер
+    изменения (Task.version); смена дня (проверяется не чаще раза в day_check_interval
+    секунд) сбрасывает весь кэш, потому что от текущей даты зависит
+    пометка просрочки. Для неизменившейся задачи возвращается тот же
+    объект строки, поэтому сравнение с уже показанным значением обычно
+    сводится к проверке is.
+    """
+
+    def __init__(
+        self,
+        overdue_ids: Callable[[], Set[int]],
+        today: Callable[[], date] = date.today,
+        limit: int = DEFAULT_CACHE_LIMIT,
+        day_check_interval: float = DAY_CHECK_INTERVAL
+    ):
+        self.overdue_ids = overdue_ids
+        self.today = today
+        self.limit = limit
+        self.day_check_interval = day_check_interval
+        self._rows: Dict[int, Tuple[int, Row]] = {}
+        self._day: Optional[date] = None
+        self._next_day_check = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    def row(self, task: Task) -> Row:
+        """Строка задачи из кэша или вновь отформатированная"""
+        now = time.monotonic()
+        if now >= self._next_day_check:
+            self._next_day_check = now + self.day_check_interval
+            day = self.today()
+            if day != self._day:
+                self._rows.clear()
+                self._day = day
+
+        version = task.version
+        cached = self._rows.get(task.id)
+        if cached is not None and cached[0] == version:
+            self.hits += 1
+            return cached[1]
+
+        self.misses += 1
+        if len(self._rows) >= self.limit:
+            self._rows.clear()
+        row = task_row_values(task, self.overdue_ids())
+        self._rows[task.id] = (version, row)
+        return row
+
+    def discard(self, task_id: int) -> None:
+        """Забыть строку задачи (например, удаленной)"""
+        self._rows.pop(task_id, None)
+
+    def clear(self) -> None:
+        self._rows.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Счетчики попаданий и промахов и размер кэша"""
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._rows)}
+
+    def __len__(self) -> int:
+        return len(self._rows)
@@ -0,0 +1,40 @@
+"""
+Сверка порядка строк таблицы с новым порядком задач
+"""
+from bisect import bisect_left
+from typing import List, Sequence, Set
+
+
+def stable_ids(old_order: Sequence[int], new_order: Sequence[int]) -> Set[int]:
+    """id строк, которые можно не перемещать при переходе к new_order
+
+    Это наибольшая подпоследовательность new_order, идущая в том же
+    порядке, что и в old_order; остальные строки, присутствующие в обоих
+    порядках, перемещаются. Поэтому смена позиции одной задачи стоит
+    одного перемещения, а не перестановки всех строк.
+    """
+    position = {task_id: index for index, task_id in enumerate(old_order)}
+    retained = [task_id for task_id in new_order if task_id in position]
+
+    # Наибольшая возрастающая по старым позициям подпоследовательность
+    tails: List[int] = []
+    tail_index: List[int] = []
+    previous = [-1] * len(retained)
+    for index, task_id in enumerate(retained):
+        old = position[task_id]
+        length = bisect_left(tails, old)
+        if length:
+            previous[index] = tail_index[length - 1]
+        if length == len(tails):
+            tails.append(old)
+            tail_index.append(index)
+        else:
+            tails[length] = old
+            tail_index[length] = index
+
+    stable: Set[int] = set()
+    index = tail_index[-1] if tail_index else -1
+    while index >= 0:
+        stable.add(retained[index])
+        index = previous[index]
+    return stable
@@ -0,0 +1,184 @@
+"""
+Виртуальная прокрутка списка задач
+Treeview держит строки только для видимого окна, а не для всех задач
+"""
+import tkinter as tk
+from tkinter import ttk
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from models.task import Task
+from utils.constants import VIRTUAL_OVERSCAN
+
+# Высота строки Treeview по умолчанию (пиксели), если тема ее не задает
+DEFAULT_ROW_HEIGHT = 20
+
+
+class VirtualTaskList:
+    """Пул строк Treeview поверх отфильтрованного и отсортированного представления
+
+    Строк в таблице столько, сколько помещается в окне, плюс небольшой
+    запас снизу (частично видимая строка, увеличение окна). Прокрутка
+    меняет смещение в представлении и перезаписывает значения тех же
+    строк (только изменившиеся), поэтому ее стоимость не зависит от
+    числа задач. Полоса прокрутки показывает смещение как долю от
+    размера представления.
+    """
+
+    def __init__(
+        self,
+        tree: ttk.Treeview,
+        scrollbar: ttk.Scrollbar,
+        row_values: Callable[[Task], Tuple[tuple, tuple]],
+        overscan: int = VIRTUAL_OVERSCAN
+    ):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.row_values = row_values
+        self.overscan = overscan
+        self.active = False
+        self.source: Sequence[Task] = ()
+        self.offset = 0
+        self.visible_rows = int(tree.cget("height"))
+        # Строки пула, id задач и значения, показанные в них сейчас
+        self._items: List[str] = []
+        self._shown: List[int] = []
+        self._written: List[Optional[Tuple[tuple, tuple]]] = []
+        self._selected_id: Optional[int] = None
+
+        tree.bind("<MouseWheel>", self._on_wheel, add="+")
+        tree.bind("<Button-4>", self._on_wheel, add="+")
+        tree.bind("<Button-5>", self._on_wheel, add="+")
+        tree.bind("<Configure>", self._on_resize, add="+")
+        tree.bind("<<TreeviewSelect>>", self._on_select, add="+")
+        for key, step in (("<Up>", -1), ("<Down>", 1), ("<Prior>", None), ("<Next>", None)):
+            tree.bind(key, lambda event, key=key, step=step: self._on_key(key, step), add="+")
+
+    def show(self, source: Sequence[Task]) -> None:
+        """Переключение таблицы в виртуальный режим и отрисовка окна source"""
+        if not self.active:
+            self.active = True
+            self.offset = 0
+            self._selected_id = None
+            self.tree.configure(yscrollcommand="")
+            self.scrollbar.configure(command=self.yview)
+        self.source = source
+        self.render()
+
+    def hide(self) -> None:
+        """Возврат к обычной таблице: строки пула удаляются"""
+        if not self.active:
+            return
+        self.active = False
+        if self._items:
+            self.tree.delete(*self._items)
+        self._items = []
+        self._shown = []
+        self._written = []
+        self.source = ()
+        self.tree.configure(yscrollcommand=self.scrollbar.set)
+        self.scrollbar.configure(command=self.tree.yview)
+
+    def render(self) -> None:
+        """Заполнение строк пула задачами окна [offset, offset + строк)"""
+        total = len(self.source)
+        self.offset = max(0, min(self.offset, total - self.visible_rows))
+        tasks = self.source[self.offset:self.offset + self.visible_rows + self.overscan]
+
+        # Размер пула меняется только при изменении окна или конце списка
+        while len(self._items) < len(tasks):
+            self._items.append(self.tree.insert("", tk.END))
+            self._written.append(None)
+        if len(self._items) > len(tasks):
+            self.tree.delete(*self._items[len(tasks):])
+            del self._items[len(tasks):]
+            del self._written[len(tasks):]
+
+        selected = None
+        for slot, task in enumerate(tasks):
+            item = self._items[slot]
+            row = self.row_values(task)
+            # Строка, уже показывающая те же значения, не перезаписывается
+            if row != self._written[slot]:
+                values, tags = row
+                self.tree.item(item, values=values, tags=tags)
+                self._written[slot] = row
+            if task.id == self._selected_id:
+                selected = item
+        self._shown = [task.id for task in tasks]
+
+        if selected is not None:
+            self.tree.selection_set(selected)
+            self.tree.focus(selected)
+        elif self.tree.selection():
+            # Выбранная задача ушла из окна, но остается выбранной
+            self.tree.selection_remove(*self.tree.selection())
+        # Собственная прокрутка Treeview не используется
+        self.tree.yview_moveto(0)
+        self._update_scrollbar(total)
+
+    def scroll_to(self, offset: int) -> None:
+        """Смещение окна и перерисовка, если оно изменилось"""
+        offset = max(0, min(offset, len(self.source) - self.visible_rows))
+        if offset != self.offset:
+            self.offset = offset
+            self.render()
+
+    def yview(self, *args: Any) -> None:
+        """Команда полосы прокрутки: moveto доля | scroll n units|pages"""
+        if not args:
+            return
+        if args[0] == "moveto":
+            self.scroll_to(round(float(args[1]) * len(self.source)))
+        elif args[0] == "scroll":
+            step = self.visible_rows if args[2] == "pages" else 1
+            self.scroll_to(self.offset + int(args[1]) * step)
+
+    def _update_scrollbar(self, total: int) -> None:
+        if total <= self.visible_rows:
+            self.scrollbar.set(0.0, 1.0)
+            return
+        self.scrollbar.set(self.offset / total, min(1.0, (self.offset + self.visible_rows) / total))
+
+    def _on_wheel(self, event):
+        if not self.active:
+            return None
+        if event.num == 4 or getattr(event, "delta", 0) > 0:
+            self.scroll_to(self.offset - 3)
+        else:
+            self.scroll_to(self.offset + 3)
+        return "break"
+
+    def _on_resize(self, event) -> None:
+        style = ttk.Style(self.tree)
+        row_height = int(style.lookup("Treeview", "rowheight") or DEFAULT_ROW_HEIGHT)
+        rows = max(1, event.height // row_height - 1)  # без строки заголовков
+        if rows != self.visible_rows:
+            self.visible_rows = rows
+            if self.active:
+                self.render()
+
+    def _on_select(self, event) -> None:
+        if not self.active:
+            return
+        selected = self.tree.selection()
+        if selected and selected[0] in self._items:
+            self._selected_id = self._shown[self._items.index(selected[0])]
+
+    def _on_key(self, key: str, step: Optional[int]):
+        """Клавиши перемещения выбора с прокруткой окна на его краях"""
+        if not self.active or not self.source:
+            return None
+        if step is None:
+            step = self.visible_rows if key == "<Next>" else -self.visible_rows
+        focus = self.tree.focus()
+        row = self._items.index(focus) if focus in self._items else 0
+        position = max(0, min(self.offset + row + step, len(self.source) - 1))
+
+        if position < self.offset:
+            self.offset = position
+        elif position >= self.offset + self.visible_rows:
+            self.offset = position - self.visible_rows + 1
+        self._selected_id = self.source[position].id
+        self.render()
+        self.tree.event_generate("<<TreeviewSelect>>")
+        return "break"